@@ -0,0 +1,114 @@
+import os
+import sqlite3
+import threading
+import time
+
+import ascmhl_jobs
+
+# --- PERSISTENT HASH CACHE ---
+# Hashes are keyed on file identity: the same device, inode, size and modification time
+# means the same bytes as far as the file system can tell.
+DEFAULT_MAX_ENTRIES = 5_000_000  # rows kept, least recently used rows are evicted beyond this
+FLUSH_EVERY = 2000  # pending writes before they are committed
+
+
+def default_cache_path():
+    return os.path.join(ascmhl_jobs.app_data_dir(), "hash_cache.sqlite")
+
+
+class HashCache:
+    """SQLite cache of file hashes keyed by (device, inode, size, mtime_ns, algorithm). Thread safe."""
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bytes_skipped = 0
+        self._lock = threading.Lock()
+        self._pending_rows = []
+        self._pending_touches = []
+        self._closed = False
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " device INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER, algorithm TEXT,"
+            " digest TEXT, last_used INTEGER,"
+            " PRIMARY KEY (device, inode, size, mtime_ns, algorithm))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes (last_used)")
+        self._db.commit()
+
+    @staticmethod
+    def _key(stat):
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def lookup(self, stat, hash_formats):
+        """Cached digests for the formats known for this file. Counts one hit if all are known."""
+        key = self._key(stat)
+        with self._lock:
+            if self._closed:
+                return {}
+            rows = self._db.execute(
+                "SELECT algorithm, digest FROM hashes WHERE device=? AND inode=? AND size=? AND mtime_ns=?", key
+            ).fetchall()
+            found = {algorithm: digest for algorithm, digest in rows if algorithm in hash_formats}
+            if len(found) == len(hash_formats):
+                self.hits += 1
+                self.bytes_skipped += stat.st_size
+                now = int(time.time())
+                self._pending_touches.extend((now,) + key + (a,) for a in found)
+            else:
+                self.misses += 1
+            self._flush_if_needed()
+        return found
+
+    def store(self, stat, hashes):
+        now = int(time.time())
+        key = self._key(stat)
+        with self._lock:
+            if self._closed:
+                return  # a cancelled job's last reads can finish after close
+            self._pending_rows.extend(key + (algorithm, digest, now) for algorithm, digest in hashes.items())
+            self._flush_if_needed()
+
+    def _flush_if_needed(self, force=False):
+        if not force and len(self._pending_rows) + len(self._pending_touches) < FLUSH_EVERY:
+            return
+        if self._pending_rows:
+            self._db.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)", self._pending_rows)
+        if self._pending_touches:
+            self._db.executemany(
+                "UPDATE hashes SET last_used=? WHERE device=? AND inode=? AND size=? AND mtime_ns=? AND algorithm=?",
+                self._pending_touches,
+            )
+        self._db.commit()
+        self._pending_rows = []
+        self._pending_touches = []
+
+    def evict(self):
+        """Drop the least recently used rows beyond max_entries. Returns the number removed."""
+        with self._lock:
+            self._flush_if_needed(force=True)
+            count = self._db.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+            excess = count - self.max_entries
+            if excess <= 0:
+                return 0
+            self._db.execute(
+                "DELETE FROM hashes WHERE rowid IN (SELECT rowid FROM hashes ORDER BY last_used LIMIT ?)", (excess,)
+            )
+            self._db.commit()
+            return excess
+
+    def close(self):
+        evicted = self.evict()
+        with self._lock:
+            self._closed = True
+            self._db.close()
+        return evicted
+
+    def summary(self):
+        return (f"🗃️ Hash cache: {self.hits} hits, {self.misses} misses, "
+                f"{self.bytes_skipped / (1024 * 1024):.1f} MB not re-read")
@@ -0,0 +1,377 @@
+"""Run ascmhl jobs without the GUI: create, verify, compare or offload a list of folders or a job file.
+
+    python ascmhl_cli.py FOLDER [FOLDER ...] [options]
+    python ascmhl_cli.py --jobs jobs.json [--parallel 2] [--results results.json]
+
+    python ascmhl_cli.py --watch /media/ingest --preset camera [--max-pending 8]
+    python ascmhl_cli.py --benchmark [FOLDER ...]
+
+A job file is a JSON list of {"folder": ..., "settings": {...}} objects (the GUI's queue.json has
+this layout), or an object with such a "jobs" list and optional "defaults" settings. Settings a
+job leaves out come from the command line options. Log lines go to stderr prefixed with the job
+number, the JSON results to stdout or --results. Exit code: 0 when every job succeeded, 1 when a
+job failed, 130 when interrupted.
+
+With --watch the runner keeps going as a daemon: every folder that appears in a watched folder is
+queued once it stops changing (see ascmhl_watch), and each job's result is written as one JSON line
+when it finishes. Folders wait while --max-pending jobs are queued or running.
+
+--priority background runs the jobs at the lowest CPU and I/O priority, next to a live offload, and
+--bandwidth-limit caps the in-process engines' reads. kill -USR1 pauses or resumes the running jobs.
+
+--report writes the client report of each new generation (ascmhl_report: paginated HTML, CSV and a
+PDF summary of every file's size, dates and hashes) into its own folder below DIR.
+
+Every job's timings, throughput and memory are appended to telemetry.jsonl in the app data folder
+(see ascmhl_telemetry); --prometheus also writes them as a node_exporter textfile. Files and bytes
+are taken from the native engine's own walk; --prescan counts them before each job instead, which
+records them for every engine and mode and adds the throughput curve, at the cost of a second walk.
+
+--benchmark measures the hash speed of this machine and the read speed of each folder's drive,
+stores them for the GUI's 'Pick Algorithm' and prints the fastest algorithm of every policy.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+
+import ascmhl_hashbench
+import ascmhl_jobs
+import ascmhl_run
+import ascmhl_telemetry
+import ascmhl_throttle
+import ascmhl_watch
+
+RESULT_TAIL_LINES = 20  # last output lines of a failed job kept in its result
+ENGINES = {"cli": "External CLI", "native": "Native Parallel"}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("folders", nargs="*", help="media folders, one job each")
+    parser.add_argument("--jobs", help="JSON job file, see above")
+    parser.add_argument("--parallel", type=int, default=1,
+                        help="jobs run at the same time, at most one per physical device (default: 1)")
+    parser.add_argument("--results", help="write the JSON results here instead of stdout")
+    parser.add_argument("--quiet", action="store_true", help="no log lines, only the results")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="benchmark the hash algorithms and the folders' drives instead of running jobs")
+    parser.add_argument("--prometheus", metavar="FILE",
+                        help="write job metrics to this Prometheus textfile (default: the GUI's Logs tab setting)")
+    parser.add_argument("--no-telemetry", action="store_true", help="do not record job telemetry")
+    parser.add_argument("--prescan", action="store_true",
+                        help="walk each folder before its job for exact telemetry counts (default: no extra walk)")
+    parser.add_argument("--report", metavar="DIR",
+                        help="after each successful create or offload, write its client report to DIR/<folder name>")
+    watch = parser.add_argument_group("watch folders")
+    watch.add_argument("--watch", action="append", default=[], metavar="FOLDER",
+                       help="queue every new folder inside FOLDER once it stops changing; repeat for more")
+    watch.add_argument("--watch-volumes", action="store_true", help="also watch where removable volumes are mounted")
+    watch.add_argument("--preset", help="settings of a preset saved in the GUI instead of the job settings below")
+    watch.add_argument("--max-pending", type=int, default=8, help="queued and running jobs before folders wait (default: 8)")
+    watch.add_argument("--settle", type=float, default=ascmhl_watch.WATCH_SETTLE_SECONDS,
+                       help="seconds a folder must stay unchanged (default: %(default)s)")
+    watch.add_argument("--poll", action="store_true", help="poll instead of inotify, e.g. for network shares")
+    job = parser.add_argument_group("job settings")
+    job.add_argument("--hash-format", action="append", dest="hash_formats",
+                     choices=["md5", "sha1", "sha256", "xxh64", "xxh3", "c4"],
+                     help="repeat for extra formats computed in the same pass (default: xxh64)")
+    job.add_argument("--engine", choices=sorted(ENGINES), default="cli",
+                     help="cli: run 'ascmhl create', native: hash in this process (default: cli)")
+    job.add_argument("--verify", action="store_true", help="verify the folders against their history instead")
+    job.add_argument("--compare-with", help="compare the folder with this folder or history instead")
+    job.add_argument("--rehash", action="store_true",
+                     help="with --compare-with, hash both sides from the disk instead of trusting their histories")
+    job.add_argument("--offload", action="append", dest="destinations", default=[], metavar="DESTINATION",
+                     help="copy the folder here and create its history; repeat for several destinations")
+    job.add_argument("--verify-copies", action="store_true", help="re-read offloaded copies before writing their history")
+    job.add_argument("--detect-renaming", action="store_true")
+    job.add_argument("--no-directory-hashes", action="store_true")
+    job.add_argument("--workers", type=int, default=0, help="hashing threads of the native engine (default: auto)")
+    job.add_argument("--per-device", type=int, default=0, help="concurrent reads per device (default: auto)")
+    job.add_argument("--io", dest="io_strategy", default="auto",
+                     choices=["auto", "buffered", "fadvise", "mmap", "direct"], help="native engine reads")
+    job.add_argument("--hash-cache", choices=["off", "rehash", "trust"], default="off")
+    job.add_argument("--priority", choices=ascmhl_throttle.PRIORITIES, default="normal",
+                     help="CPU and I/O priority of the jobs (default: normal)")
+    job.add_argument("--bandwidth-limit", type=float, default=0, metavar="MB/S",
+                     help="cap the reads of the native engine, verify, compare and offload (default: no cap)")
+    job.add_argument("--resume", action="store_true",
+                     help="resume from the journal of an interrupted job; always runs the native engine")
+    job.add_argument("--identity", help="Info tab export (XML or JSON) with the author and location")
+    args = parser.parse_args(argv)
+    if not args.folders and not args.jobs and not args.watch and not args.watch_volumes and not args.benchmark:
+        parser.error("give folders, --jobs or --watch")
+    return args
+
+
+def settings_from_args(args):
+    if args.preset:
+        presets = ascmhl_jobs.load_presets()
+        if args.preset not in presets:
+            raise SystemExit(f"No preset named '{args.preset}', saved presets: {', '.join(sorted(presets)) or 'none'}")
+        return presets[args.preset]
+    settings = ascmhl_jobs.default_settings(
+        hash_formats=args.hash_formats or ["xxh64"],
+        engine=ENGINES[args.engine],
+        detect_renaming=args.detect_renaming,
+        no_directory_hashes=args.no_directory_hashes,
+        io_strategy=args.io_strategy,
+        workers=args.workers,
+        per_device=args.per_device,
+        destinations=args.destinations,
+        verify_copies=args.verify_copies,
+        hash_cache=args.hash_cache,
+        priority=args.priority,
+        bandwidth_limit=args.bandwidth_limit,
+    )
+    if args.identity:
+        settings["identity"] = ascmhl_jobs.read_identity(args.identity)
+    if args.verify:
+        settings.update(mode="verify", destinations=[])
+    if args.compare_with:
+        settings.update(mode="compare", compare_with=args.compare_with, destinations=[], rehash=args.rehash)
+    if args.resume:
+        settings = ascmhl_jobs.resume_settings(settings)
+    return settings
+
+
+def load_jobs(args):
+    """QueuedJobs for the folders and the job file, settings from the command line filled in."""
+    base = settings_from_args(args)
+    jobs = [ascmhl_jobs.QueuedJob(os.path.abspath(folder), dict(base)) for folder in args.folders]
+    if args.jobs:
+        with open(args.jobs, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if isinstance(data, dict):
+            base = dict(base, **data.get("defaults", {}))
+            data = data.get("jobs", [])
+        for entry in data:
+            if entry.get("status") == ascmhl_jobs.DONE:
+                continue  # finished jobs of a saved GUI queue
+            settings = dict(base, **entry.get("settings", {}))
+            jobs.append(ascmhl_jobs.QueuedJob(os.path.abspath(entry["folder"]), settings))
+    return jobs
+
+
+class HeadlessRunner:
+    """Runs QueuedJobs on threads, at most max_parallel at a time and one per device, like the Queue tab."""
+
+    def __init__(self, jobs, max_parallel=1, quiet=False, on_result=None, report_dir=None, prescan=False):
+        self.jobs = []
+        self.max_parallel = max(1, max_parallel)
+        self.quiet = quiet
+        self.prescan = prescan  # scan each folder before its job, see ascmhl_run.run_job
+        self.report_dir = report_dir  # client reports of new generations go below this folder
+        self.on_result = on_result  # called with each result; finished jobs are then dropped
+        self.cancel = threading.Event()
+        self.paused = False
+        self.throttles = {}  # running job id -> ascmhl_throttle.JobThrottle
+        self.results = {}
+        self.numbers = {}
+        self._condition = threading.Condition()
+        self._print_lock = threading.Lock()
+        for job in jobs:
+            self.add(job)
+
+    def add(self, job):
+        with self._condition:
+            self.numbers[job.id] = len(self.numbers) + 1
+            self.jobs.append(job)
+            self._condition.notify_all()
+
+    def pending(self):
+        with self._condition:
+            return sum(1 for job in self.jobs if job.status in (ascmhl_jobs.QUEUED, ascmhl_jobs.RUNNING))
+
+    def toggle_pause(self):
+        """Pause or resume every running job, and the jobs started while paused."""
+        with self._condition:
+            self.paused = not self.paused
+            throttles = list(self.throttles.values())
+        for throttle in throttles:
+            throttle.pause() if self.paused else throttle.resume()
+        self.log("queue", "⏸️ Paused" if self.paused else "▶️ Resumed")
+
+    def log(self, number, line):
+        if self.quiet:
+            return
+        with self._print_lock:
+            print(f"[{number}] {line}", file=sys.stderr, flush=True)
+
+    def _run(self, number, job):
+        tail = deque(maxlen=RESULT_TAIL_LINES)
+
+        def output(line):
+            tail.append(line)
+            self.log(number, line)
+
+        started = time.time()
+        report = None
+        try:
+            error = ascmhl_run.check_engine_available(job.settings)
+            if error:
+                output(error)
+                returncode = -1
+            else:
+                note = ascmhl_jobs.resume_engine_note(job.settings)
+                if note:
+                    output(note)
+                throttle = ascmhl_throttle.JobThrottle.from_settings(job.settings, self.cancel)
+                with self._condition:
+                    self.throttles[job.id] = throttle
+                    if self.paused:
+                        throttle.pause()
+                returncode = ascmhl_run.run_job(job.folder, job.settings, output=output, cancel=self.cancel,
+                                                throttle=throttle, prescan=self.prescan)
+            if returncode == 0 and self.report_dir and not job.settings.get("mode"):
+                import ascmhl_report
+                report = os.path.join(self.report_dir, os.path.basename(job.folder.rstrip(os.sep)) or "root")
+                if ascmhl_report.write_report(job.folder, report, output=output, cancel=self.cancel) != 0:
+                    report = None
+        except Exception as e:
+            output(f"❌ Error: {str(e)}")
+            returncode = -1
+        with self._condition:
+            self.throttles.pop(job.id, None)
+        finished = time.time()
+        with self._condition:
+            job.returncode = returncode
+            job.status = (ascmhl_jobs.ABORTED if self.cancel.is_set()
+                          else ascmhl_jobs.DONE if returncode == 0 else ascmhl_jobs.FAILED)
+            self.results[job.id] = {
+                "folder": job.folder,
+                "mode": job.settings.get("mode") or ("offload" if job.settings.get("destinations") else "create"),
+                "engine": job.settings["engine"],
+                "hash_formats": job.settings["hash_formats"],
+                "status": job.status,
+                "returncode": returncode,
+                "started": started,
+                "duration_s": round(finished - started, 3),
+                "output_tail": list(tail) if returncode != 0 else [],
+                "report": report,
+                "job": number,
+            }
+            if self.on_result is not None:
+                self.on_result(self.results.pop(job.id))
+                self.jobs.remove(job)
+            self._condition.notify_all()
+
+    def run(self, until_cancelled=False):
+        """Run the jobs until none is left, or with until_cancelled until cancel is set. Returns the results."""
+        with self._condition:
+            while True:
+                if not self.cancel.is_set():
+                    for job in ascmhl_jobs.runnable_jobs(self.jobs, self.max_parallel):
+                        job.status = ascmhl_jobs.RUNNING
+                        self.log(self.numbers[job.id], f"▶️ {job.folder}")
+                        threading.Thread(target=self._run, args=(self.numbers[job.id], job), daemon=True,
+                                         name="ascmhl-job").start()
+                running = any(job.status == ascmhl_jobs.RUNNING for job in self.jobs)
+                if not running and (self.cancel.is_set() or not until_cancelled):
+                    break
+                self._condition.wait(1.0)
+        return [self.results.get(job.id, {"folder": job.folder, "status": job.status, "returncode": None,
+                                          "job": self.numbers[job.id]}) for job in self.jobs]
+
+
+def watch(args, runner):
+    """Queue the settled folders of the watched roots until interrupted, writing one JSON line per job."""
+    settings = settings_from_args(args)
+    results = open(args.results, "a", encoding="utf-8") if args.results else sys.stdout
+    write_lock = threading.Lock()
+
+    def write_result(result):
+        with write_lock:
+            results.write(json.dumps(result) + "\n")
+            results.flush()
+
+    def accept(folder):
+        if runner.pending() >= args.max_pending:
+            return False
+        runner.add(ascmhl_jobs.QueuedJob(folder, dict(settings)))
+        return True
+
+    roots = args.watch + (ascmhl_watch.default_mount_roots() if args.watch_volumes else [])
+    watcher = ascmhl_watch.FolderWatcher(roots, accept, output=lambda line: runner.log("watch", line),
+                                         settle_seconds=args.settle, poll=args.poll)
+    runner.on_result = write_result
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: (runner.cancel.set(), watcher.stop()))
+    thread = threading.Thread(target=watcher.run, daemon=True, name="ascmhl-watch")
+    thread.start()
+    try:
+        runner.run(until_cancelled=True)
+    finally:
+        thread.join()
+        if results is not sys.stdout:
+            results.close()
+    return 130
+
+
+def benchmark(args):
+    """Benchmark this machine and the folders' drives, then print the recommendation of every policy."""
+    log = (lambda line: None) if args.quiet else (lambda line: print(line, file=sys.stderr, flush=True))
+    settings = settings_from_args(args)
+    cores = ascmhl_hashbench.usable_cores(settings)
+    results = ascmhl_hashbench.run_benchmark(output=log)
+    hash_rates = ascmhl_hashbench.cached_hash_rates(results)
+    report = {"machine": ascmhl_hashbench.machine_key(), "hash_bytes_per_s": hash_rates, "cores": cores, "folders": []}
+    for folder in [os.path.abspath(folder) for folder in args.folders] or [None]:
+        read_rate = None
+        if folder is not None:
+            results = ascmhl_hashbench.run_benchmark(folder, output=log, measure_hashes=False)
+            read_rate = ascmhl_hashbench.cached_read_rate(folder, results)
+        recommendations = {}
+        for policy in ascmhl_hashbench.POLICIES:
+            recommendation = ascmhl_hashbench.recommend(hash_rates, read_rate, policy, settings["hash_formats"][0], cores)
+            recommendations[policy] = recommendation and {"hash_format": recommendation[0], "reason": recommendation[1]}
+        report["folders"].append({"folder": folder, "read_bytes_per_s": read_rate, "recommended": recommendations})
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.benchmark:
+        return benchmark(args)
+    if args.prometheus:
+        ascmhl_telemetry.config_overrides["prometheus_file"] = os.path.abspath(args.prometheus)
+    if args.no_telemetry:
+        ascmhl_telemetry.config_overrides["enabled"] = False
+    jobs = load_jobs(args)
+    runner = HeadlessRunner(jobs, args.parallel, args.quiet,
+                            report_dir=os.path.abspath(args.report) if args.report else None, prescan=args.prescan)
+    if hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda *_: runner.toggle_pause())
+    if args.watch or args.watch_volumes:
+        return watch(args, runner)
+    # Ctrl+C and kill stop the running jobs cleanly; their journals stay for --resume
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: runner.cancel.set())
+    started = time.time()
+    results = runner.run()
+    report = {
+        "started": started,
+        "duration_s": round(time.time() - started, 3),
+        "succeeded": sum(1 for result in results if result["returncode"] == 0),
+        "failed": sum(1 for result in results if result["returncode"] not in (0, None)),
+        "jobs": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.results:
+        with open(args.results, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    if runner.cancel.is_set():
+        return 130
+    return 0 if report["succeeded"] == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+import heapq
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, groupby
+
+import ascmhl_engine
+import ascmhl_index
+import ascmhl_scan
+from ascmhl_verify import FORMAT_PREFERENCE
+
+# --- FOLDER AND HISTORY COMPARISON ---
+# Both sides are turned into streams of (path, size, {hash_format: digest}) sorted by path and
+# merged like two sorted files. A side with an ascmhl history is read from its newest generations,
+# so no file is read from the disk unless the sides have no hash format in common. Entries are
+# sorted in runs of COMPARE_RUN_SIZE that are spilled to temporary files, so memory stays bounded
+# however many files a volume holds.
+COMPARE_RUN_SIZE = 100000  # entries sorted in memory before a run is spilled to disk
+COMPARE_WINDOW = 4  # files hashed ahead of the comparison, per worker
+DEFAULT_HASH_FORMAT = "xxh64"  # when neither side has a history
+
+
+class _SortedRuns:
+    """Entries added in any order, read back sorted by key with at most COMPARE_RUN_SIZE of them in memory.
+
+    Full runs are sorted and spilled to JSON lines files in folder, then merged.
+    """
+
+    def __init__(self, key, folder):
+        self.key = key
+        self.folder = folder
+        self.run = []
+        self.runs = []
+
+    def add(self, entry):
+        self.run.append(entry)
+        if len(self.run) >= COMPARE_RUN_SIZE:
+            self.run.sort(key=self.key)
+            self.runs.append(self._spill(self.run))
+            self.run = []
+
+    def sorted(self):
+        run, self.run = sorted(self.run, key=self.key), []
+        if not self.runs:
+            return iter(run)
+        self.runs.append(self._spill(run))
+        return heapq.merge(*(_read_run(path) for path in self.runs), key=self.key)
+
+    def _spill(self, run):
+        fd, path = tempfile.mkstemp(suffix=".jsonl", dir=self.folder)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            for entry in run:
+                file.write(json.dumps(entry) + "\n")
+        return path
+
+
+def _read_run(path):
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            yield tuple(json.loads(line))
+
+
+def _merged_by_path(entries):
+    """Consecutive entries of one path merged into one, a path is listed once per hash format in a generation."""
+    for path, group in groupby(entries, key=lambda entry: entry[0]):
+        size, hashes = None, {}
+        for _, entry_size, entry_hashes in group:
+            size = entry_size if entry_size is not None else size
+            hashes.update(entry_hashes)
+        yield path, size, hashes
+
+
+def has_history(root):
+    folder = os.path.join(root, "ascmhl")
+    return os.path.isdir(folder) and any(name.endswith(".mhl") for name in os.listdir(folder))
+
+
+def history_entries(root, cancel=None):
+    """(path relative to root, size, hashes) of the newest generation of every history below root."""
+    newest = {}
+    for history, file in ascmhl_index.generation_files(root, cancel):
+        newest[history] = file  # names sort by generation number
+    for history, file in newest.items():
+        prefix = os.path.relpath(history, root).replace("\\", "/")
+        prefix = "" if prefix == "." else prefix + "/"
+        for path, size, hashes in ascmhl_index.iter_generation(file):
+            if path is None:
+                continue
+            yield prefix + path, size, {algorithm: digest for algorithm, digest, action in hashes if action != "failed"}
+
+
+def folder_entries(root, cancel=None):
+    """(path relative to root, size, no hashes) of every file below root that ascmhl create would hash."""
+    for relative, stat in ascmhl_scan.iter_files(root, cancel):
+        yield relative, stat.st_size, {}
+
+
+class _Side:
+    def __init__(self, path, rehash):
+        path = os.path.abspath(path)
+        if os.path.basename(path) == "ascmhl":
+            path = os.path.dirname(path)
+        self.root = path
+        self.kind = "history" if not rehash and has_history(path) else "folder"
+
+    def entries(self, folder, cancel):
+        source = history_entries if self.kind == "history" else folder_entries
+        runs = _SortedRuns(lambda entry: entry[0], folder)
+        for entry in source(self.root, cancel):
+            runs.add(entry)
+        return _merged_by_path(runs.sorted())
+
+
+class _Comparison:
+    def __init__(self, a, b, hash_format, detect_renaming, workers, output, cancel, folder, throttle=None):
+        self.a, self.b = a, b
+        self.throttle = throttle
+        self.hash_format = hash_format
+        self.detect_renaming = detect_renaming
+        self.output = output
+        self.cancel = cancel
+        self.workers = max(1, workers or ascmhl_engine.DEFAULT_WORKERS)
+        self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix="ascmhl-compare")
+        self.pending = deque()  # (resolve, futures) in stream order
+        self.lock = threading.Lock()
+        self.matched = self.files_hashed = self.bytes_hashed = 0
+        self.missing, self.extra, self.renamed, self.mismatched, self.errors = 0, 0, 0, 0, 0
+        # Rename candidates as (size, digest, path)
+        self.unmatched = {a: _SortedRuns(None, folder), b: _SortedRuns(None, folder)}
+
+    # -- hashing from the disk --
+    def _hash(self, side, path, hash_format):
+        hashes, bytes_read = ascmhl_engine.hash_file_single_pass(os.path.join(side.root, path), [hash_format],
+                                                                 throttle=self.throttle)
+        with self.lock:
+            self.files_hashed += 1
+            self.bytes_hashed += bytes_read
+        return hashes[hash_format]
+
+    def _digest(self, side, entry, hash_format):
+        """A future or a finished value for the digest of an entry in hash_format."""
+        digest = entry[2].get(hash_format)
+        if digest is not None:
+            return digest
+        return self.pool.submit(self._hash, side, entry[0], hash_format)
+
+    def _defer(self, resolve, *values):
+        self.pending.append((resolve, values))
+        while len(self.pending) > self.workers * COMPARE_WINDOW:
+            self._resolve_one()
+
+    def _resolve_one(self):
+        resolve, values = self.pending.popleft()
+        results = []
+        for value in values:
+            if hasattr(value, "result"):
+                try:
+                    value = value.result()
+                except OSError as e:
+                    value = e
+            results.append(value)
+        resolve(*results)
+
+    def drain(self):
+        while self.pending:
+            self._resolve_one()
+
+    # -- comparing --
+    def _format_for(self, entry_a, entry_b):
+        """A format both sides recorded, else the one the side with a history recorded, else hash_format."""
+        common = [f for f in FORMAT_PREFERENCE if f in entry_a[2] and f in entry_b[2]]
+        if common:
+            return common[0]
+        for f in FORMAT_PREFERENCE:
+            if f in entry_a[2] or f in entry_b[2]:
+                return f
+        return self.hash_format
+
+    def both(self, entry_a, entry_b):
+        path = entry_a[0]
+        if entry_a[1] is not None and entry_b[1] is not None and entry_a[1] != entry_b[1]:
+            self.mismatched += 1
+            self.output(f"  mismatch  {path}: {entry_a[1]} bytes in A, {entry_b[1]} bytes in B")
+            return
+        hash_format = self._format_for(entry_a, entry_b)
+
+        def resolve(digest_a, digest_b):
+            for side, digest in (("A", digest_a), ("B", digest_b)):
+                if isinstance(digest, OSError):
+                    self.errors += 1
+                    self.output(f"  error     {path}: could not read it in {side}: {str(digest)}")
+                    return
+            if digest_a != digest_b:
+                self.mismatched += 1
+                self.output(f"  mismatch  {path}: {hash_format} {digest_a} in A, {digest_b} in B")
+            else:
+                self.matched += 1
+
+        self._defer(resolve, self._digest(self.a, entry_a, hash_format), self._digest(self.b, entry_b, hash_format))
+
+    def only(self, side, entry):
+        if not self.detect_renaming:
+            self._report_unmatched(side, entry[0])
+            return
+
+        def resolve(digest):
+            if isinstance(digest, OSError):
+                self._report_unmatched(side, entry[0])
+                return
+            self.unmatched[side].add((-1 if entry[1] is None else entry[1], digest, entry[0]))
+
+        self._defer(resolve, self._digest(side, entry, self.hash_format))
+
+    def _report_unmatched(self, side, path):
+        if side is self.a:
+            self.missing += 1
+            self.output(f"  missing   {path}")
+        else:
+            self.extra += 1
+            self.output(f"  extra     {path}")
+
+    def match_renamed(self):
+        """Pair files only in A with files only in B that have the same size and hash."""
+        missing, extra = (groupby(self.unmatched[side].sorted(), key=lambda entry: entry[:2]) for side in (self.a, self.b))
+        group_a, group_b = next(missing, None), next(extra, None)
+        while group_a is not None or group_b is not None:
+            if group_b is None or (group_a is not None and group_a[0] < group_b[0]):
+                for entry in group_a[1]:
+                    self._report_unmatched(self.a, entry[2])
+                group_a = next(missing, None)
+            elif group_a is None or group_b[0] < group_a[0]:
+                for entry in group_b[1]:
+                    self._report_unmatched(self.b, entry[2])
+                group_b = next(extra, None)
+            else:
+                paths_a, paths_b = [e[2] for e in group_a[1]], [e[2] for e in group_b[1]]
+                for path_a, path_b in zip(paths_a, paths_b):
+                    self.renamed += 1
+                    self.output(f"  renamed   {path_a} -> {path_b}")
+                for path in paths_a[len(paths_b):]:
+                    self._report_unmatched(self.a, path)
+                for path in paths_b[len(paths_a):]:
+                    self._report_unmatched(self.b, path)
+                group_a, group_b = next(missing, None), next(extra, None)
+
+    def run(self, stream_a, stream_b):
+        entry_a, entry_b = next(stream_a, None), next(stream_b, None)
+        while entry_a is not None or entry_b is not None:
+            if self.cancel.is_set():
+                raise ascmhl_engine.JobCancelled()
+            if entry_b is None or (entry_a is not None and entry_a[0] < entry_b[0]):
+                self.only(self.a, entry_a)
+                entry_a = next(stream_a, None)
+            elif entry_a is None or entry_b[0] < entry_a[0]:
+                self.only(self.b, entry_b)
+                entry_b = next(stream_b, None)
+            else:
+                self.both(entry_a, entry_b)
+                entry_a, entry_b = next(stream_a, None), next(stream_b, None)
+        self.drain()
+
+
+def _peek(stream):
+    """(first entry or None, the stream with the first entry put back)."""
+    first = next(stream, None)
+    return first, stream if first is None else chain([first], stream)
+
+
+def compare_trees(a, b, hash_format=None, detect_renaming=False, rehash=False, workers=None, output=print, cancel=None,
+                  throttle=None):
+    """Compare two folders or ascmhl histories. Returns an ascmhl-style exit code.
+
+    A side with an ascmhl history is compared by its newest generations unless rehash is set.
+    Reports files missing from B, extra in B, renamed (with detect_renaming) and mismatched.
+    hash_format is used where no recorded hash can be compared; by default the format of the
+    first history entry, else xxh64. Returns 0 when the sides hold the same files, 10 when files
+    are missing or extra, 11 when files differ or could not be read, -1 when cancelled.
+    """
+    cancel = cancel or threading.Event()
+    side_a, side_b = _Side(a, rehash), _Side(b, rehash)
+    started = time.perf_counter()
+    output(f"⚖️ Comparing {side_a.kind} A: {side_a.root}")
+    output(f"⚖️      with {side_b.kind} B: {side_b.root}")
+    if "history" in (side_a.kind, side_b.kind):
+        output("ℹ️ Histories are compared by their recorded hashes, their files are not read from the disk; "
+               "check Re-read (--rehash) to hash the media itself")
+    comparison = None
+    try:
+        with tempfile.TemporaryDirectory(prefix="ascmhl-compare-") as folder:
+            first_a, stream_a = _peek(side_a.entries(folder, cancel))
+            first_b, stream_b = _peek(side_b.entries(folder, cancel))
+            if hash_format is None:
+                recorded = [f for entry in (first_a, first_b) if entry for f in FORMAT_PREFERENCE if f in entry[2]]
+                hash_format = recorded[0] if recorded else DEFAULT_HASH_FORMAT
+            comparison = _Comparison(side_a, side_b, hash_format, detect_renaming, workers, output, cancel,
+                                     folder, throttle)
+            try:
+                comparison.run(stream_a, stream_b)
+                if detect_renaming:
+                    comparison.match_renamed()
+            finally:
+                comparison.pool.shutdown(wait=True, cancel_futures=True)
+    except (ascmhl_engine.JobCancelled, ascmhl_scan.ScanCancelled):
+        pass
+    except OSError as e:
+        output(f"❌ Comparison failed: {str(e)}")
+        return -1
+    if cancel.is_set() or comparison is None:
+        output("⚠️ Comparison cancelled.")
+        return -1
+    elapsed = time.perf_counter() - started
+    output(f"⚖️ Compared in {ascmhl_scan.format_duration(elapsed)}: {comparison.matched} identical, "
+           f"{comparison.mismatched} mismatched, {comparison.missing} missing, {comparison.extra} extra, "
+           f"{comparison.renamed} renamed, {comparison.errors} unreadable; {comparison.files_hashed} files, "
+           f"{ascmhl_scan.format_bytes(comparison.bytes_hashed)} read from the disk")
+    if comparison.mismatched or comparison.errors:
+        return 11
+    if comparison.missing or comparison.extra:
+        return 10
+    return 0
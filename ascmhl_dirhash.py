@@ -0,0 +1,150 @@
+import os
+import threading
+from collections import Counter
+
+from ascmhl.hasher import DirectoryHashContext
+from ascmhl.history import MHLHistory
+
+# --- INCREMENTAL DIRECTORY HASHES ---
+# Directory hashes are aggregated bottom-up while the file hashes come in. A folder is finished as
+# soon as its listing is known and its last child has a hash, and its result is handed to its
+# parent straight away, so no separate pass over the tree is needed. A folder whose children all
+# have the hashes recorded in the previous generation keeps that generation's directory hashes;
+# only the folders above a changed file are hashed again.
+
+
+class _Folder:
+    def __init__(self, children):
+        self.children = children  # [(name, is_dir)] in ascmhl's order
+        self.hashes = {}  # name -> {hash_format: (content, structure or None)}
+
+
+class PreviousGeneration:
+    """The media hashes of the latest generation of a history and its nested histories, by absolute path."""
+
+    def __init__(self, history):
+        self.media_hashes = {}
+        self.child_counts = Counter()
+        for child in MHLHistory.walk_child_histories(history):  # includes history itself
+            if not child.hash_lists:
+                continue
+            root = child.get_root_path()
+            hash_list = child.hash_lists[-1]
+            if hash_list.process_info.root_media_hash is not None:
+                self.media_hashes[os.path.normpath(root)] = hash_list.process_info.root_media_hash
+            for media_hash in hash_list.media_hashes:
+                path = os.path.normpath(os.path.join(root, media_hash.path))
+                if path not in self.media_hashes:  # one entry per path, even with several formats
+                    self.child_counts[os.path.dirname(path)] += 1
+                    self.media_hashes[path] = media_hash
+
+    def hashes(self, path, hash_format):
+        """(content, structure) recorded for path, structure is None for files. None if not recorded."""
+        media_hash = self.media_hashes.get(path)
+        if media_hash is None:
+            return None
+        for entry in media_hash.hash_entries:
+            if entry.hash_format == hash_format and entry.action != "failed":
+                return entry.hash_string, entry.structure_hash_string if media_hash.is_directory else None
+        return None
+
+
+class DirectoryHashTree:
+    """Bottom-up directory hashes of one tree, finished while the files are being hashed. Thread safe.
+
+    The walk reports every folder listing with add_folder(), the hashing threads report every
+    file with file_hashed(). Results are read with hashes_for().
+    """
+
+    def __init__(self, hash_formats, previous=None):
+        self.hash_formats = sorted(hash_formats)
+        self.previous = previous
+        self.folders_hashed = 0
+        self.folders_reused = 0
+        self._lock = threading.Lock()
+        self._folders = {}  # listed folders with children still being hashed
+        self._finished = {}  # path -> hashes of children whose folder is not listed yet
+        self._results = {}  # folder path -> {hash_format: (content, structure)}
+
+    def add_folder(self, folder, children):
+        with self._lock:
+            state = _Folder(children)
+            for name, _ in children:
+                hashes = self._finished.pop(os.path.join(folder, name), None)
+                if hashes is not None:
+                    state.hashes[name] = hashes
+            self._folders[folder] = state
+            self._finish_ready(folder)
+
+    def file_hashed(self, path, hashes):
+        """Report the content hashes of a file as {hash_format: digest}."""
+        with self._lock:
+            self._child_finished(path, {f: (hashes[f], None) for f in self.hash_formats if f in hashes})
+
+    def hashes_for(self, folder, hash_format, child_count):
+        """(content, structure) of a finished folder, or None if it is unknown or had other children."""
+        with self._lock:
+            result = self._results.get(folder, {}).get(hash_format)
+        if result is None or result[2] != child_count:
+            return None
+        return result[:2]
+
+    # -- aggregation, all called with self._lock held --
+    def _child_finished(self, path, hashes):
+        folder, name = os.path.split(path)
+        state = self._folders.get(folder)
+        if state is None:
+            self._finished[path] = hashes
+            return
+        state.hashes[name] = hashes
+        self._finish_ready(folder)
+
+    def _finish_ready(self, folder):
+        # Finishing a folder may finish its parent, and so on up to the root
+        while True:
+            state = self._folders.get(folder)
+            if state is None or len(state.hashes) < len(state.children):
+                return
+            del self._folders[folder]
+            result = {}
+            for hash_format in self.hash_formats:
+                if all(hash_format in state.hashes[name] for name, _ in state.children):
+                    result[hash_format] = self._folder_hashes(folder, state, hash_format) + (len(state.children),)
+            self._results[folder] = result
+            hashes = {f: r[:2] for f, r in result.items()}
+            parent, name = os.path.split(folder)
+            if parent not in self._folders:
+                self._finished[folder] = hashes
+                return
+            self._folders[parent].hashes[name] = hashes
+            folder = parent
+
+    def _folder_hashes(self, folder, state, hash_format):
+        recorded = self._unchanged(folder, state, hash_format)
+        if recorded is not None:
+            self.folders_reused += 1
+            return recorded
+        # The same computation as ascmhl's create, see commands.create_for_folder_subcommand
+        context = DirectoryHashContext(hash_format)
+        for name, is_dir in state.children:
+            content, structure = state.hashes[name][hash_format]
+            path = os.path.join(folder, name)
+            if is_dir:
+                context.append_directory_hashes(path, content, structure)
+            else:
+                context.append_file_hash(path, content)
+        self.folders_hashed += 1
+        return context.final_content_hash_str(), context.final_structure_hash_str()
+
+    def _unchanged(self, folder, state, hash_format):
+        """The previous generation's hashes of folder if none of its children changed, else None."""
+        if self.previous is None or self.previous.child_counts[os.path.normpath(folder)] != len(state.children):
+            return None
+        recorded = self.previous.hashes(os.path.normpath(folder), hash_format)
+        if recorded is None or recorded[1] is None:
+            return None
+        for name, _ in state.children:
+            before = self.previous.hashes(os.path.normpath(os.path.join(folder, name)), hash_format)
+            if before is None or before != state.hashes[name][hash_format]:
+                return None
+        return recorded
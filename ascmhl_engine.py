@@ -0,0 +1,486 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import click
+from ascmhl import commands, logger
+from ascmhl.__version__ import ascmhl_folder_name, ascmhl_supported_hashformats
+from ascmhl.hasher import DirectoryHashContext, new_hasher_for_hash_type
+from ascmhl.history import MHLHistory
+
+import ascmhl_dirhash
+import ascmhl_io
+import ascmhl_journal
+
+# --- NATIVE PARALLEL HASHING ENGINE ---
+# Runs ascmhl's own "create" implementation in-process, but with file hashing moved onto a
+# thread pool that reads ahead of the (sequential) generation logic. hashlib and xxhash release
+# the GIL while hashing and file reads release it while waiting on the disk, so threads scale.
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_PER_DEVICE = 4  # concurrent reads per physical device (st_dev)
+PREFETCH_PER_WORKER = 4  # hashed-but-not-yet-recorded files allowed per worker
+
+# --- SMALL-FILE PATH ---
+# Image sequences put hundreds of thousands of frames in a few folders. There the cost is per file,
+# not per byte: folders are listed once with os.scandir instead of a stat per name, files are handed
+# to the pool in batches and opened with much higher concurrency, and the per-file verbose lines
+# are collapsed into one progress event per folder.
+SMALL_FILE_WORKERS = 64
+SMALL_FILE_PER_DEVICE = 32
+SMALL_FILE_BATCH = 64  # files hashed by one pool task
+
+# Per-file lines of "ascmhl create -v" that the small-file path collapses
+VERBOSE_FILE_LINE_RE = re.compile(r'^\s*(?:created original hash for|created new \(verif\.\) hash for|verified)\s')
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def hash_file_single_pass(path, hash_formats, buffer_size=None, strategy="auto", stat=None, throttle=None):
+    """Hash a file for all hash_formats from the same read buffer. Returns (hash lookup, bytes read).
+
+    strategy and buffer_size select how the file is read, see ascmhl_io. throttle is an
+    ascmhl_throttle.JobThrottle or None.
+    """
+    hashers = [(f, new_hasher_for_hash_type(f)) for f in hash_formats]
+    updates = [hasher.update for _, hasher in hashers]
+
+    def consume(chunk):
+        for update in updates:
+            update(chunk)
+
+    bytes_read = ascmhl_io.read_file(path, consume, strategy, buffer_size, stat, throttle)
+    return {f: hasher.string_digest() for f, hasher in hashers}, bytes_read
+
+
+_original_walk = commands.post_order_lexicographic
+_original_hash = commands.multiple_format_hash_file
+_original_info = logger.info
+_original_error = logger.error
+_original_load_history = MHLHistory.load_from_path
+_current = threading.local()
+
+
+def _active_job():
+    return getattr(_current, "job", None)
+
+
+def _walk(top, ignore_pathspec=None):
+    job = _active_job()
+    if job is None:
+        return _original_walk(top, ignore_pathspec)
+    return job.walk(top, ignore_pathspec)
+
+
+def _hash(file_path, hash_formats):
+    job = _active_job()
+    if job is None:
+        return _original_hash(file_path, hash_formats)
+    return job.hash_file(file_path, hash_formats)
+
+
+def _info(msg, *args):
+    job = _active_job()
+    if job is None:
+        return _original_info(msg, *args)
+    job.output(msg % args if args else msg)
+
+
+def _error(msg, *args):
+    job = _active_job()
+    if job is None:
+        return _original_error(msg, *args)
+    job.output(msg % args if args else msg)
+
+
+def _load_history(root_path):
+    history = _original_load_history(root_path)
+    job = _active_job()
+    if job is not None:
+        # Nested histories are loaded first, the root history of the job is the last one
+        job.loaded_history = history
+    return history
+
+
+class _DirectoryHashContext(DirectoryHashContext):
+    """ascmhl's DirectoryHashContext, answered from the job's DirectoryHashTree when it has the folder."""
+
+    def __init__(self, hash_format):
+        super().__init__(hash_format)
+        job = _active_job()
+        self._tree = job.directory_tree if job is not None else None
+        self._children = []
+        self._result = None
+
+    def append_file_hash(self, path, content_hash_string):
+        if self._tree is None:
+            return super().append_file_hash(path, content_hash_string)
+        self._children.append((path, content_hash_string, None))
+
+    def append_directory_hashes(self, path, content_hash_string, structure_hash_string):
+        if self._tree is None:
+            return super().append_directory_hashes(path, content_hash_string, structure_hash_string)
+        self._children.append((path, content_hash_string, structure_hash_string))
+
+    def _finish(self):
+        if self._tree is None:
+            return
+        if self._children:
+            folder = os.path.dirname(self._children[0][0])
+            self._result = self._tree.hashes_for(folder, self.hash_format, len(self._children))
+        if self._result is None:
+            # Not aggregated (an empty folder or a format added during the walk), hash it here
+            for path, content_hash_string, structure_hash_string in self._children:
+                if structure_hash_string is None:
+                    super().append_file_hash(path, content_hash_string)
+                else:
+                    super().append_directory_hashes(path, content_hash_string, structure_hash_string)
+        self._tree = None
+
+    def final_content_hash_str(self):
+        self._finish()
+        return self._result[0] if self._result is not None else super().final_content_hash_str()
+
+    def final_structure_hash_str(self):
+        self._finish()
+        return self._result[1] if self._result is not None else super().final_structure_hash_str()
+
+
+# The hooks only change behavior on threads that are running a native job
+commands.post_order_lexicographic = _walk
+commands.multiple_format_hash_file = _hash
+commands.DirectoryHashContext = _DirectoryHashContext
+MHLHistory.load_from_path = staticmethod(_load_history)
+logger.info = _info
+logger.error = _error
+
+
+def scandir_walk(top, ignore_pathspec=None):
+    """ascmhl's post_order_lexicographic, listing every folder with a single os.scandir.
+
+    The entry types come with the listing, so no file needs its own isdir() or islink() call.
+    """
+    with os.scandir(top) as listing:
+        entries = sorted(listing, key=lambda e: e.name)
+    children = []
+    folders = []
+    for entry in entries:
+        is_directory = entry.is_dir()
+        file_path = os.path.join(top, entry.name) + ("/" if is_directory else "")
+        if ignore_pathspec and ignore_pathspec.match_file(file_path):
+            if os.path.basename(os.path.normpath(file_path)) != ascmhl_folder_name:
+                logger.verbose(f"ignoring filepath {file_path.rstrip('/')}")
+            continue
+        children.append((entry.name, is_directory))
+        if is_directory and not entry.is_symlink():
+            folders.append(entry.path)
+    for folder in folders:
+        yield from scandir_walk(folder, ignore_pathspec)
+    yield top, children
+
+
+class DirectoryProgress:
+    """Collapses per-file verbose lines into one progress event per folder.
+
+    The event line is "📁 <files> files, <bytes> bytes: <folder>", which
+    ascmhl_scan.ProgressTracker counts as a whole.
+    """
+
+    def __init__(self, root, output):
+        self.root = root
+        self.output = output
+        self.folder = None
+        self.files = 0
+        self.bytes = 0
+
+    def add_file(self, path, size):
+        folder = os.path.dirname(path)
+        if folder != self.folder:
+            self.flush()
+            self.folder = folder
+        self.files += 1
+        self.bytes += size
+
+    def line(self, line):
+        if VERBOSE_FILE_LINE_RE.match(line):
+            return
+        # Anything else (directory hashes, errors) follows the files it is about
+        self.flush()
+        self.output(line)
+
+    def flush(self):
+        if self.files:
+            relative = os.path.relpath(self.folder, self.root).replace("\\", "/")
+            self.output(f"📁 {self.files} files, {self.bytes} bytes: {relative}")
+        self.files = self.bytes = 0
+
+
+class ParallelHashJob:
+    """Hashes files on a thread pool in the same order ascmhl's create walk will ask for them."""
+
+    def __init__(self, hash_formats, workers=None, per_device=None, output=print, cancel=None,
+                 cache=None, trust_cache=False, journal=None, io_strategy="auto", small_files=False,
+                 directory_hashes=True, throttle=None):
+        self.hash_formats = list(hash_formats)
+        self.throttle = throttle
+        self.io_strategy = io_strategy
+        self.small_files = small_files
+        self.directory_progress = None
+        self.directory_hashes = directory_hashes
+        self.directory_tree = None
+        self.loaded_history = None
+        self.cache = cache
+        self.trust_cache = trust_cache
+        self.journal = journal
+        self.files_resumed = 0
+        self.workers = max(1, workers or (SMALL_FILE_WORKERS if small_files else DEFAULT_WORKERS))
+        self.per_device = max(1, per_device or (SMALL_FILE_PER_DEVICE if small_files else DEFAULT_PER_DEVICE))
+        self.output = output
+        self.cancel = cancel or threading.Event()
+        self._stopped = threading.Event()  # set by shutdown, leaves the caller's cancel event alone
+        self.window = self.workers * PREFETCH_PER_WORKER
+        self.files_hashed = 0
+        self.bytes_hashed = 0
+        self.bytes_read = 0
+        self._futures = OrderedDict()
+        self._prefetch_done = False
+        self._condition = threading.Condition()
+        self._device_slots = {}
+        self._executor = None
+
+    def walk(self, top, ignore_pathspec):
+        # Walk the same tree with the same ignore spec on a second thread to feed the pool
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ascmhl-hash")
+        if self.directory_hashes:
+            previous = None
+            if self.loaded_history is not None and self.loaded_history.hash_lists:
+                previous = ascmhl_dirhash.PreviousGeneration(self.loaded_history)
+            self.directory_tree = ascmhl_dirhash.DirectoryHashTree(self.hash_formats, previous)
+        threading.Thread(target=self._prefetch, args=(top, ignore_pathspec), daemon=True).start()
+        if not self.small_files:
+            return _original_walk(top, ignore_pathspec)
+        self.directory_progress = DirectoryProgress(top, self.output)
+        self.output = self.directory_progress.line
+        return scandir_walk(top, ignore_pathspec)
+
+    def _prefetch(self, top, ignore_pathspec):
+        batch = []
+        try:
+            for folder_path, children in (scandir_walk if self.small_files else _original_walk)(top, ignore_pathspec):
+                if self.directory_tree is not None:
+                    self.directory_tree.add_folder(folder_path, children)
+                for name, is_dir in children:
+                    if is_dir:
+                        continue
+                    path = os.path.join(folder_path, name)
+                    if not self.small_files:
+                        with self._condition:
+                            if not self._wait_for_window():
+                                return
+                            self._futures[path] = self._executor.submit(self._hash_one, path)
+                            self._condition.notify_all()
+                        continue
+                    with self._condition:
+                        if len(self._futures) >= self.window and batch:
+                            batch = self._submit_batch(batch)  # the main walk may be waiting for these
+                        if not self._wait_for_window():
+                            return
+                        future = self._futures[path] = Future()
+                        self._condition.notify_all()
+                    batch.append((path, future))
+                    if len(batch) >= SMALL_FILE_BATCH:
+                        batch = self._submit_batch(batch)
+                if batch:
+                    batch = self._submit_batch(batch)
+        except Exception:
+            pass  # the main walk hits and reports the same error
+        finally:
+            if batch and self._stopping():
+                for _, future in batch:
+                    if future.set_running_or_notify_cancel():
+                        future.set_exception(JobCancelled())
+            elif batch:
+                self._submit_batch(batch)
+            with self._condition:
+                self._prefetch_done = True
+                self._condition.notify_all()
+
+    def _wait_for_window(self):
+        """Wait until the read-ahead window has room. Holds self._condition. False once stopping."""
+        while len(self._futures) >= self.window and not self._stopping():
+            self._condition.wait(0.5)
+        return not self._stopping()
+
+    def _submit_batch(self, batch):
+        self._executor.submit(self._hash_batch, batch)
+        return []
+
+    def _hash_batch(self, batch):
+        # One pool task per batch of small files instead of one per file
+        for path, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue  # skipped by the main walk
+            try:
+                future.set_result(self._hash_one(path))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _device_slot(self, device):
+        with self._condition:
+            slot = self._device_slots.get(device)
+            if slot is None:
+                slot = self._device_slots[device] = threading.BoundedSemaphore(self.per_device)
+            return slot
+
+    def _hash_one(self, path, hash_formats=None):
+        if self._stopping():
+            raise JobCancelled()
+        stat = os.stat(path)
+        formats = hash_formats or self.hash_formats
+        result = self.journal.known_hashes(path, stat, formats) if self.journal is not None else {}
+        resumed = bool(result)
+        if self.cache is not None and self.trust_cache and len(result) < len(formats):
+            result.update(self.cache.lookup(stat, [f for f in formats if f not in result]))
+        missing = [f for f in formats if f not in result]
+        bytes_read = 0
+        if missing:
+            with self._device_slot(stat.st_dev):
+                hashes, bytes_read = hash_file_single_pass(path, missing, strategy=self.io_strategy, stat=stat,
+                                                           throttle=self.throttle)
+            result.update(hashes)
+            if self.cache is not None:
+                self.cache.store(stat, hashes)
+        if self.journal is not None:
+            self.journal.record(path, stat, {f: d for f, d in result.items() if f in formats})
+        if self.directory_tree is not None and hash_formats is None:
+            self.directory_tree.file_hashed(path, result)
+        with self._condition:
+            self.bytes_read += bytes_read
+            self.files_resumed += resumed
+            # Catch-up reads for extra formats count as reads, not as another file
+            if hash_formats is None:
+                self.files_hashed += 1
+                self.bytes_hashed += stat.st_size
+        return result, stat.st_size
+
+    def _take_future(self, file_path):
+        with self._condition:
+            while (file_path not in self._futures and not self._prefetch_done
+                   and len(self._futures) < self.window and not self._stopping()):
+                self._condition.wait(0.5)
+            if file_path not in self._futures:
+                return None
+            # Anything queued before this path was skipped by the main walk
+            while True:
+                path, future = self._futures.popitem(last=False)
+                if path == file_path:
+                    break
+                future.cancel()
+            self._condition.notify_all()
+            return future
+
+    def hash_file(self, file_path, hash_formats):
+        if self._stopping():
+            raise JobCancelled()
+        future = self._take_future(file_path)
+        result, size = future.result() if future is not None else ({}, 0)
+        result = dict(result)
+        missing = [f for f in hash_formats if f not in result]
+        if missing:
+            # Formats recorded in an earlier generation get prefetched from now on
+            self.hash_formats.extend(f for f in missing if f not in self.hash_formats)
+            hashes, size = self._hash_one(file_path, missing)
+            result.update(hashes)
+        if self.directory_progress is not None:
+            self.directory_progress.add_file(file_path, size)
+        return {f: result[f] for f in hash_formats}
+
+    def _stopping(self):
+        return self.cancel.is_set() or self._stopped.is_set()
+
+    def shutdown(self):
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._executor is not None:
+            # Files already being read finish in the background, nothing new is started
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_generation(root_path, hash_formats, detect_renaming=False, no_directory_hashes=False,
+                      author_name=None, author_email=None, author_phone=None, author_role=None, location=None,
+                      workers=None, per_device=None, output=print, cancel=None, hash_cache="off", resume=False,
+                      io_strategy="auto", small_files=False, throttle=None):
+    """Create a new ascmhl generation for root_path in-process. Returns an ascmhl-style exit code.
+
+    workers and per_device default to DEFAULT_WORKERS and DEFAULT_PER_DEVICE when not given.
+    hash_cache is "off", "rehash" (hash everything, record in the cache) or "trust" (reuse
+    cached hashes of files whose device, inode, size and mtime are unchanged).
+    Completed hashes are journaled; with resume=True the journal of an aborted job is reused
+    so only the remaining files are read. The journal is deleted once the generation is written.
+    io_strategy is one of ascmhl_io.STRATEGIES. small_files=True selects the small-file path
+    (see SMALL_FILE_WORKERS), which reports progress as one "📁" line per folder.
+    throttle, an ascmhl_throttle.JobThrottle, pauses and caps the reads while the job runs.
+    """
+    unsupported = [f for f in hash_formats if f not in ascmhl_supported_hashformats]
+    if unsupported:
+        output(f"❌ Hash format not supported by ASC MHL: {', '.join(unsupported)}")
+        return 2
+    cancel = cancel or threading.Event()
+    cache = None
+    if hash_cache in ("rehash", "trust"):
+        import ascmhl_cache
+        try:
+            cache = ascmhl_cache.HashCache()
+        except Exception as e:
+            output(f"⚠️ Hash cache unavailable, hashing everything: {str(e)}")
+    journal = ascmhl_journal.ProgressJournal(root_path, hash_formats, resume=resume)
+    if resume:
+        output(f"⏯️ {len(journal.entries)} files already hashed in the journal")
+    job = ParallelHashJob(hash_formats, workers, per_device, output, cancel, cache, hash_cache == "trust", journal,
+                          io_strategy, small_files, not no_directory_hashes, throttle)
+    output(f"⚙️ Native engine: {job.workers} workers, {job.per_device} concurrent reads per device, "
+           f"{io_strategy} reads{', small-file path' if small_files else ''}")
+    _current.job = job
+    returncode = -1
+    try:
+        commands.create_for_folder_subcommand(
+            os.path.abspath(root_path), True, detect_renaming, list(hash_formats), no_directory_hashes,
+            author_name, author_email, author_phone, author_role, location, None, ignore_list=[],
+        )
+        returncode = 0
+        return returncode
+    except JobCancelled:
+        output("⚠️ Native engine cancelled.")
+        return returncode
+    except click.ClickException as e:
+        output(f"Error: {e.format_message()}")
+        returncode = e.exit_code
+        return returncode
+    finally:
+        _current.job = None
+        job.shutdown()
+        if job.directory_progress is not None:
+            job.directory_progress.flush()
+        if returncode == 0:
+            journal.discard()
+        else:
+            journal.close()
+        if job.files_resumed:
+            output(f"⏯️ Took {job.files_resumed} file hashes from the journal")
+        output(f"⚙️ Hashed {job.files_hashed} files, {job.bytes_hashed / (1024 * 1024):.1f} MB")
+        tree = job.directory_tree
+        if tree is not None and (tree.folders_hashed or tree.folders_reused):
+            output(f"🌳 Directory hashes: {tree.folders_hashed} computed while hashing, "
+                   f"{tree.folders_reused} kept from the previous generation")
+        passes = job.bytes_read / job.bytes_hashed if job.bytes_hashed else 0
+        output(f"📖 Source read: {job.bytes_read / (1024 * 1024):.1f} MB for {', '.join(job.hash_formats)} "
+               f"({passes:.2f} reads per byte)")
+        if cache is not None:
+            output(cache.summary())
+            evicted = cache.close()
+            if evicted:
+                output(f"🗃️ Evicted {evicted} least recently used cache entries")
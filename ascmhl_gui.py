@@ -1,17 +1,31 @@
 import sys
 import subprocess
 import threading
-import json
 import traceback
 import os
+import time
+import codecs
+import locale
+from collections import deque
+STARTUP_STARTED = time.perf_counter()  # before Qt is imported, see ASCMHLGui.report_startup
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QFileDialog,
-    QVBoxLayout, QHBoxLayout, QTextEdit, QComboBox, QTabWidget, QLineEdit, QFormLayout, QCheckBox, QProgressBar, QMessageBox
+    QVBoxLayout, QHBoxLayout, QTextEdit, QPlainTextEdit, QComboBox, QTabWidget, QLineEdit, QFormLayout, QCheckBox, QProgressBar, QMessageBox,
+    QSpinBox, QToolButton, QMenu, QTableWidget, QTableWidgetItem, QStackedWidget, QAbstractItemView, QHeaderView,
+    QInputDialog
 )
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt5.QtGui import QFont
-import webbrowser
-import site
+from PyQt5.QtCore import Qt, QTimer, QThread, QObject, QProcess, QUrl, pyqtSignal
+from PyQt5.QtGui import QFont, QDesktopServices, QPainter, QPen, QColor
+QT_IMPORTED = time.perf_counter()
+import ascmhl_scan
+import ascmhl_jobs
+import ascmhl_journal
+import ascmhl_run
+import ascmhl_watch
+import ascmhl_hashbench
+import ascmhl_telemetry
+import ascmhl_tools
+import ascmhl_throttle
 
 # --- GLOBAL EXCEPTION HANDLER FOR STABILITY ---
 def excepthook(type, value, tb):
@@ -20,62 +34,454 @@ def excepthook(type, value, tb):
     sys.exit(1)
 sys.excepthook = excepthook
 
-# --- QTHREAD FOR RESPONSIVE LONG TASKS ---
-class WorkerThread(QThread):
+# --- NATIVE ENGINE READ STRATEGIES (see ascmhl_io) ---
+IO_STRATEGY_LABELS = [
+    ("Auto", "auto"),
+    ("Buffered", "buffered"),
+    ("Buffered + hints", "fadvise"),
+    ("Memory-mapped", "mmap"),
+    ("Direct I/O", "direct"),
+]
+
+# --- BOUNDED OUTPUT TAIL WITH DISK SPILL ---
+OUTPUT_TAIL_LINES = 200  # lines of process output kept in memory and replayed on failure
+OUTPUT_SPILL_PREFIX = "ascmhl_"
+OUTPUT_SPILL_MAX_AGE = 7 * 24 * 3600  # seconds a kept full log stays in the temp folder
+
+
+def remove_old_spill_files(max_age=OUTPUT_SPILL_MAX_AGE):
+    """Delete full logs of earlier runs that are older than max_age from the temp folder."""
+    import tempfile
+    folder = tempfile.gettempdir()
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(folder))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith(OUTPUT_SPILL_PREFIX) and entry.name.endswith((".log", ".log.gz")):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+
+class OutputTail:
+    """Keeps the last lines of process output in memory.
+
+    Once more lines arrive than fit in the tail, the complete output is written to a plain
+    text temp file instead, so memory use stays flat for any run length. Files kept after a
+    failed run are removed by remove_old_spill_files once they are old.
+    """
+
+    def __init__(self, max_lines=OUTPUT_TAIL_LINES):
+        self.lines = deque(maxlen=max_lines)
+        self.total_lines = 0
+        self.spill_path = None
+        self._spill = None
+
+    def append(self, line):
+        if self._spill is None and len(self.lines) == self.lines.maxlen:
+            import tempfile
+            fd, self.spill_path = tempfile.mkstemp(prefix=OUTPUT_SPILL_PREFIX, suffix=".log")
+            self._spill = os.fdopen(fd, "w", encoding="utf-8", errors="replace")
+            self._spill.writelines(l + "\n" for l in self.lines)
+        if self._spill is not None:
+            self._spill.write(line + "\n")
+        self.lines.append(line)
+        self.total_lines += 1
+
+    def close(self, keep=True):
+        """Finish the spill file. With keep=False it is deleted, e.g. after a successful run."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+            if not keep:
+                os.remove(self.spill_path)
+                self.spill_path = None
+
+    def failure_report(self):
+        """Lines to show after a failed run: the tail, plus where the full log is."""
+        if self.spill_path is None:
+            return ["❌ Process failed. Full output below:"] + list(self.lines)
+        return (
+            [f"❌ Process failed. Last {len(self.lines)} of {self.total_lines} lines below:"]
+            + list(self.lines)
+            + [f"📄 Full output saved to: {self.spill_path}"]
+        )
+
+# --- EVENT-DRIVEN QPROCESS BACKEND ---
+class ProcessWorker(QObject):
+    """Runs a command with QProcess on the UI event loop, reading output in large chunks.
+
+    Exposes the same output/progress/finished signals and start/isRunning/terminate
+    methods as EngineWorker, so the GUI can use either backend.
+    """
     output = pyqtSignal(str)
     finished = pyqtSignal(int)
-    progress = pyqtSignal(int)  # New: for progress feedback
+    progress = pyqtSignal(int)
 
-    def __init__(self, cmd):
-        super().__init__()
+    def __init__(self, cmd, parent=None, journal=None, recorder=None, throttle=None):
+        super().__init__(parent)
         self.cmd = cmd
         self.process = None
+        self.throttle = throttle or ascmhl_throttle.JobThrottle()
+        self.tail = OutputTail()
+        self.journal = journal
+        self.recorder = recorder  # ascmhl_telemetry.JobRecorder
+        self.aborted = False
+        self._partial = ""
+        self._decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors="replace")
+
+    def start(self):
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        self.process.readyReadStandardOutput.connect(self._read_chunk)
+        self.process.finished.connect(self._handle_finished)
+        self.process.errorOccurred.connect(self._handle_error)
+        self.process.started.connect(self._attach_throttle)
+        self.process.start(self.cmd[0], self.cmd[1:])
+
+    def _attach_throttle(self):
+        warning = self.throttle.attach(self.process.processId())
+        if warning:
+            self.output.emit(warning)
+
+    def isRunning(self):
+        return self.process is not None and self.process.state() != QProcess.NotRunning
+
+    def terminate(self):
+        self.aborted = True
+        if self.isRunning():
+            ascmhl_jobs.kill_process_tree(self.process.processId())
+
+    def _read_chunk(self):
+        text = self._partial + self._decoder.decode(bytes(self.process.readAllStandardOutput()))
+        lines = text.split("\n")
+        self._partial = lines.pop()
+        self._emit_lines(lines, text)
+
+    def _emit_lines(self, lines, text):
+        for line in lines:
+            line = line.strip()
+            self.tail.append(line)
+            if self.journal is not None:
+                self.journal.feed(line)
+            if self.recorder is not None:
+                self.recorder.feed(line)
+            self.output.emit(line)
+        # Only the latest percentage in a chunk matters to the progress bar
+        percents = ascmhl_run.PROGRESS_RE.findall(text)
+        if percents:
+            self.progress.emit(int(percents[-1]))
+
+    def _handle_finished(self, exit_code, exit_status):
+        self.throttle.detach()
+        tail = self._partial + self._decoder.decode(b"", final=True)
+        self._partial = ""
+        if tail:
+            self._emit_lines([tail], tail)
+        returncode = exit_code if exit_status == QProcess.NormalExit and not self.aborted else -1
+        ascmhl_run.finish_journal(self.journal, returncode)
+        self.tail.close(keep=returncode != 0)
+        if returncode != 0 and not self.aborted:
+            for l in self.tail.failure_report():
+                self.output.emit(l)
+        if self.recorder is not None:
+            for l in ascmhl_telemetry.summary_lines(self.recorder.finish(returncode, self.aborted)):
+                self.output.emit(l)
+        self.finished.emit(returncode)
+
+    def _handle_error(self, error):
+        if error == QProcess.FailedToStart:
+            ascmhl_run.finish_journal(self.journal, -1)
+            if self.recorder is not None:
+                self.recorder.close()
+            self.output.emit("❌ ascmhl not found or not in PATH. Please check installation.")
+            self.finished.emit(-1)
+
+# --- QTHREAD FOR RESPONSIVE LONG TASKS ---
+class EngineWorker(QThread):
+    """Runs ascmhl_run.run_job on a QThread: every engine and mode except the QProcess backend."""
+    output = pyqtSignal(str)
+    finished = pyqtSignal(int)
+    progress = pyqtSignal(int)
+
+    def __init__(self, media_folder, settings, scan=None):
+        super().__init__()
+        self.media_folder = media_folder
+        self.settings = settings
+        self.scan = scan
+        self.cancel = threading.Event()
+        self.throttle = ascmhl_throttle.JobThrottle.from_settings(settings, self.cancel)
+        self.tail = OutputTail()
+        self.aborted = False
+
+    def _emit(self, line):
+        self.tail.append(line)
+        self.output.emit(line)
 
     def run(self):
         try:
-            self.process = subprocess.Popen(
-                self.cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True
-            )
-            full_output = []
-            for line in self.process.stdout:
-                line = line.strip()
-                full_output.append(line)
-                self.output.emit(line)
-                # Progress feedback: look for "Progress: XX%" in output
-                if "progress" in line.lower():
-                    import re
-                    match = re.search(r'(\d{1,3})\s*%', line)
-                    if match:
-                        percent = int(match.group(1))
-                        self.progress.emit(percent)
-            self.process.wait()
-            # Emit all output at the end if process failed
-            if self.process.returncode != 0:
-                self.output.emit("❌ Process failed. Full output below:")
-                for l in full_output:
+            returncode = self.run_job()
+            self.tail.close(keep=returncode != 0)
+            if returncode != 0 and not self.aborted:
+                for l in self.tail.failure_report():
                     self.output.emit(l)
-            self.finished.emit(self.process.returncode)
-        except FileNotFoundError as e:
-            self.output.emit("❌ ascmhl not found or not in PATH. Please check installation.")
-            self.finished.emit(-1)
+            self.finished.emit(returncode)
         except Exception as e:
-            import traceback
+            self.tail.close()
             self.output.emit(f"❌ Error: {str(e)}\n{traceback.format_exc()}")
             self.finished.emit(-1)
 
+    def run_job(self):
+        return ascmhl_run.run_job(self.media_folder, self.settings, output=self._emit, cancel=self.cancel,
+                                  progress=self.progress.emit, scan=self.scan, throttle=self.throttle, prescan=True)
+
+    def terminate(self):
+        # Stops cleanly between files, or kills the external ascmhl and its children
+        self.aborted = True
+        self.cancel.set()
+
+class IndexWorker(EngineWorker):
+    """Runs ascmhl_index.index_folder: adds the new generations of every history below the folder to the index."""
+
+    def __init__(self, folder, volume=None):
+        super().__init__(folder, {"volume": volume})
+
+    def run_job(self):
+        import ascmhl_index
+        return ascmhl_index.index_folder(self.media_folder, self.settings["volume"], output=self._emit, cancel=self.cancel)
+
+class ReportWorker(EngineWorker):
+    """Runs ascmhl_report.write_report: the client report of the folder's latest generation."""
+
+    def __init__(self, folder, output_dir):
+        super().__init__(folder, {"output_dir": output_dir})
+
+    def run_job(self):
+        import ascmhl_report
+        return ascmhl_report.write_report(self.media_folder, self.settings["output_dir"], output=self._emit,
+                                          cancel=self.cancel)
+
+class BenchmarkWorker(EngineWorker):
+    """Runs ascmhl_hashbench.run_benchmark: hash speed of this machine and read speed of the folder's device."""
+
+    def __init__(self, folder=None):
+        super().__init__(folder, {})
+
+    def run_job(self):
+        ascmhl_hashbench.run_benchmark(self.media_folder, output=self._emit, cancel=self.cancel)
+        return -1 if self.cancel.is_set() else 0
+
+# --- WATCH FOLDERS ---
+class WatchThread(QThread):
+    """Runs an ascmhl_watch.FolderWatcher. ready(folder) is emitted for every settled folder it accepts."""
+    output = pyqtSignal(str)
+    ready = pyqtSignal(str)
+
+    def __init__(self, roots, max_pending, parent=None):
+        super().__init__(parent)
+        self.max_pending = max_pending
+        self.pending = 0  # queued and running jobs, kept up to date by the Queue tab
+        self.watcher = ascmhl_watch.FolderWatcher(roots, self._accept, output=self.output.emit)
+
+    def _accept(self, folder):
+        # Called on the watcher thread; the count only grows here until the Queue tab updates it
+        if self.pending >= self.max_pending:
+            return False
+        self.pending += 1
+        self.ready.emit(folder)
+        return True
+
+    def run(self):
+        self.watcher.run()
+
+    def stop(self):
+        self.watcher.stop()
+
+# --- BACKGROUND FOLDER SCAN ---
+class ScanThread(QThread):
+    """Runs ascmhl_scan.scan_folder off the UI thread. cancel() stops it at the next folder."""
+    counting = pyqtSignal(int, int)
+    scanned = pyqtSignal(object)
+
+    def __init__(self, folder, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            scan = ascmhl_scan.scan_folder(self.folder, self._cancel, self.counting.emit)
+        except ascmhl_scan.ScanCancelled:
+            return
+        self.scanned.emit(scan)
+
+# --- BATCHED LOG VIEW ---
+LOG_FLUSH_INTERVAL_MS = 50  # how often queued log lines are written to the view
+LOG_FRAME_BUDGET_MS = 12  # max time a single flush may spend on the UI thread
+LOG_MAX_BLOCKS = 20000  # lines kept in the view, older lines are discarded
+
+
+class LogView(QPlainTextEdit):
+    """Read-only log that queues appended lines and renders them in batches on a timer.
+
+    append() is safe to call from any thread. Lines that pile up faster than they can be
+    shown are collapsed into a single "skipped" marker and counted in skipped_lines.
+    """
+    flush_requested = pyqtSignal()
+    skipped_changed = pyqtSignal(int)
+
+    def __init__(self, flush_interval_ms=LOG_FLUSH_INTERVAL_MS, frame_budget_ms=LOG_FRAME_BUDGET_MS,
+                 max_blocks=LOG_MAX_BLOCKS, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_blocks)
+        self.frame_budget_ms = frame_budget_ms
+        self.max_blocks = max_blocks
+        self.skipped_lines = 0
+        self._pending = deque()
+        self._flush_scheduled = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(flush_interval_ms)
+        self._timer.timeout.connect(self.flush)
+        # Queued across threads, so background threads never touch the timer directly
+        self.flush_requested.connect(self._timer.start)
+
+    def append(self, text):
+        self._pending.append(text)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.flush_requested.emit()
+
+    def flush(self):
+        self._flush_scheduled = False
+        pending = self._pending
+        backlog = len(pending) - self.max_blocks
+        if backlog > 0:
+            # These would scroll out of the view anyway, so never render them
+            for _ in range(backlog):
+                pending.popleft()
+            self.skipped_lines += backlog
+            self.appendPlainText(f"… {backlog} lines skipped …")
+            self.skipped_changed.emit(self.skipped_lines)
+
+        scrollbar = self.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum() - 2
+        deadline = time.perf_counter() + self.frame_budget_ms / 1000
+        batch = []
+        while pending and time.perf_counter() < deadline:
+            for _ in range(min(len(pending), 500)):
+                text = pending.popleft()
+                if Qt.mightBeRichText(text):
+                    if batch:
+                        self.appendPlainText("\n".join(batch))
+                        batch = []
+                    self.appendHtml(text)
+                else:
+                    batch.append(text)
+            if batch:
+                self.appendPlainText("\n".join(batch))
+                batch = []
+        if follow:
+            scrollbar.setValue(scrollbar.maximum())
+        if pending and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._timer.start()
+
+    def clear(self):
+        self._pending.clear()
+        self.skipped_lines = 0
+        self.skipped_changed.emit(0)
+        super().clear()
+
+class ThroughputChart(QWidget):
+    """Average MB/s of the recorded jobs, oldest on the left. Failed and aborted jobs are drawn in red."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []
+        self.setMinimumHeight(120)
+
+    def set_records(self, records):
+        self.records = [record for record in records if record.get("bytes_per_s")]
+        if self.records:
+            last = self.records[-1]
+            self.setToolTip(f"{len(self.records)} jobs, last: {last['folder']} at "
+                            f"{last['bytes_per_s'] / 1e6:.1f} MB/s")
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = self.rect().adjusted(40, 8, -8, -16)
+        painter.setPen(QPen(QColor("#888888")))
+        painter.drawRect(rect)
+        if not self.records:
+            painter.drawText(rect, Qt.AlignCenter, "No recorded jobs yet")
+            return
+        peak = max(record["bytes_per_s"] for record in self.records)
+        painter.drawText(0, rect.top(), 38, 14, Qt.AlignRight, f"{peak / 1e6:.0f}")
+        painter.drawText(0, rect.bottom() - 14, 38, 14, Qt.AlignRight, "MB/s")
+        step = rect.width() / max(1, len(self.records) - 1)
+        points = [(rect.left() + i * step, rect.bottom() - record["bytes_per_s"] / peak * rect.height())
+                  for i, record in enumerate(self.records)]
+        painter.setPen(QPen(QColor("#3a7bd5"), 2))
+        for (x1, y1), (x2, y2) in zip(points, points[1:]):
+            painter.drawLine(int(x1), int(y1), int(x2), int(y2))
+        for (x, y), record in zip(points, self.records):
+            painter.setPen(QPen(QColor("#3a7bd5" if record["status"] == "ok" else "#d53a3a"), 5))
+            painter.drawPoint(int(x), int(y))
+
+
 class ASCMHLGui(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("ASC MHL Creator GUI")
         self.resize(600, 380)
         self.init_ui()
+        # Grow past the default size only as far as the controls need
+        self.resize(self.size().expandedTo(self.minimumSizeHint()))
         self.setFixedSize(self.size())
         self.setAcceptDrops(True)  # Enable drag & drop for the window
+        self.startup_marks = [("qt imported", QT_IMPORTED), ("ui built", time.perf_counter())]
         self.show()
-        threading.Thread(target=self.check_and_install_ascmhl, daemon=True).start()
+        self.tool_check_done = threading.Event()
+        threading.Thread(target=self.run_tool_check, daemon=True).start()
+        threading.Thread(target=remove_old_spill_files, daemon=True).start()
+        # The first turn of the event loop is when the window takes input
+        QTimer.singleShot(0, self.report_startup)
+
+    def run_tool_check(self):
+        try:
+            self.check_and_install_ascmhl()
+        finally:
+            self.startup_marks.append(("ascmhl checked", time.perf_counter()))
+            self.tool_check_done.set()
+
+    def report_startup(self):
+        """Log the time to interactive. With --startup-report, print all startup marks as JSON and quit."""
+        self.startup_marks.append(("interactive", time.perf_counter()))
+        interactive_ms = (self.startup_marks[-1][1] - STARTUP_STARTED) * 1000
+        self.log.append(f"⏱️ Interactive in {interactive_ms:.0f} ms")
+        if "--startup-report" not in sys.argv:
+            return
+
+        def print_report():
+            if not self.tool_check_done.is_set():
+                QTimer.singleShot(20, print_report)
+                return
+            import json
+            marks = {name: round((at - STARTUP_STARTED) * 1000, 1) for name, at in self.startup_marks}
+            print(json.dumps({"startup_ms": marks}), flush=True)
+            QApplication.instance().quit()
+        print_report()
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -85,10 +491,18 @@ class ASCMHLGui(QWidget):
         self.init_main_tab()
         self.tabs.addTab(self.main_tab, "Create")
 
+        self.queue_tab = QWidget()
+        self.init_queue_tab()
+        self.tabs.addTab(self.queue_tab, "Queue")
+
         self.info_tab = QWidget()
         self.init_info_tab()
         self.tabs.addTab(self.info_tab, "Info")
 
+        self.index_tab = QWidget()
+        self.init_index_tab()
+        self.tabs.addTab(self.index_tab, "Index")
+
         self.log_tab = QWidget()
         self.init_log_tab()
         self.tabs.addTab(self.log_tab, "Logs")
@@ -149,8 +563,11 @@ SOFTWARE.""")
         self.setLayout(layout)
 
         self.media_folder = ""
-        self.output_folder = ""
+        self.output_folders = []  # offload destinations, empty to hash the media folder in place
         self.process = None
+        self.worker_thread = None
+        self.abort_requested = False
+        self.apply_hash_policy()
 
     def init_main_tab(self):
         layout = QVBoxLayout()
@@ -169,6 +586,30 @@ SOFTWARE.""")
         folder_layout.addWidget(self.folder_btn)
         layout.addLayout(folder_layout)
 
+        # Offload destinations
+        offload_layout = QHBoxLayout()
+        offload_layout.addWidget(QLabel("Offload To:"))
+        self.offload_label = QLabel("No destination, hash in place.")
+        self.offload_label.setStyleSheet("background: #f0f0f0;")
+        offload_layout.addWidget(self.offload_label, 1)
+        self.offload_add_btn = QPushButton("Add Destination")
+        self.offload_add_btn.setToolTip("Copy the media folder to one or more drives in a single read, then create the ASC MHL history on each copy.")
+        self.offload_add_btn.clicked.connect(self.add_output_folder)
+        offload_layout.addWidget(self.offload_add_btn)
+        self.offload_clear_btn = QPushButton("Clear")
+        self.offload_clear_btn.clicked.connect(self.clear_output_folders)
+        offload_layout.addWidget(self.offload_clear_btn)
+        self.verify_copies_checkbox = QCheckBox("Verify copies")
+        self.verify_copies_checkbox.setToolTip("Read every copy back and compare it with the source before its history is created.")
+        offload_layout.addWidget(self.verify_copies_checkbox)
+        layout.addLayout(offload_layout)
+
+        self.scan_label = QLabel("")
+        self.scan_label.setFont(QFont("Arial", 8))
+        layout.addWidget(self.scan_label)
+        self.scan_thread = None
+        self.folder_scan = None
+
         # Drag & drop support for folder label
         self.folder_label.installEventFilter(self)
 
@@ -180,9 +621,94 @@ SOFTWARE.""")
         self.hash_combo = QComboBox()
         self.hash_combo.addItems(["md5", "sha1", "sha256", "xxh64", "xxh3", "c4"])
         self.hash_combo.setCurrentText("xxh64")
+        self.hash_combo.currentTextChanged.connect(self.update_extra_hashes_label)
         hash_layout.addWidget(self.hash_combo)
+        # Extra algorithms are computed from the same read as the main one
+        self.extra_hash_btn = QToolButton()
+        self.extra_hash_btn.setPopupMode(QToolButton.InstantPopup)
+        self.extra_hash_btn.setToolTip("Also record these algorithms, computed in the same pass over each file.")
+        extra_hash_menu = QMenu(self.extra_hash_btn)
+        for alg in ["md5", "sha1", "sha256", "xxh64", "xxh3", "c4"]:
+            action = extra_hash_menu.addAction(alg)
+            action.setCheckable(True)
+            action.toggled.connect(self.update_extra_hashes_label)
+        self.extra_hash_btn.setMenu(extra_hash_menu)
+        hash_layout.addWidget(self.extra_hash_btn)
+        self.update_extra_hashes_label()
+        backend_label = QLabel("Backend:")
+        backend_label.setAlignment(Qt.AlignLeft)
+        hash_layout.addWidget(backend_label)
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItems(["QThread", "QProcess"])
+        self.backend_combo.setToolTip("QThread: line-by-line reads on a worker thread.\nQProcess: event-driven chunked reads.")
+        hash_layout.addWidget(self.backend_combo)
+        hash_layout.addWidget(QLabel("Reads:"))
+        self.io_combo = QComboBox()
+        for label, strategy in IO_STRATEGY_LABELS:
+            self.io_combo.addItem(label, strategy)
+        self.io_combo.setToolTip(
+            "How the native engine reads files.\n"
+            "Auto: picks per file from its size, file system and whether the disk is removable.\n"
+            "Buffered: large aligned reads.\n"
+            "Buffered + hints: sequential read-ahead, drops hashed data from the page cache.\n"
+            "Memory-mapped: maps files on fixed local disks instead of copying them; cards and network volumes are not mapped.\n"
+            "Direct I/O: bypasses the page cache (O_DIRECT / F_NOCACHE)."
+        )
+        hash_layout.addWidget(self.io_combo)
         layout.addLayout(hash_layout)
 
+        # Algorithm choice from the machine and device benchmark
+        policy_layout = QHBoxLayout()
+        policy_layout.addWidget(QLabel("Pick Algorithm:"))
+        self.hash_policy_combo = QComboBox()
+        self.hash_policy_combo.addItem("Manually", None)
+        for policy, label in ascmhl_hashbench.POLICY_LABELS.items():
+            self.hash_policy_combo.addItem(label, policy)
+        self.hash_policy_combo.setToolTip(
+            "Select the hash algorithm from the benchmark of this machine and the media folder's drive.\n"
+            "Fastest: any algorithm.\n"
+            "Fastest MHL v1 compatible: xxh64, sha1 or md5.\n"
+            "Fastest collision-resistant: sha256 or c4.\n"
+            "When the drive is slower than hashing, the current algorithm is kept if the policy allows it."
+        )
+        self.hash_policy_combo.currentIndexChanged.connect(self.apply_hash_policy)
+        policy_layout.addWidget(self.hash_policy_combo)
+        self.benchmark_btn = QPushButton("Benchmark")
+        self.benchmark_btn.setToolTip("Measure how fast this machine hashes each algorithm, and how fast the media folder's drive reads.")
+        self.benchmark_btn.clicked.connect(self.run_benchmark)
+        policy_layout.addWidget(self.benchmark_btn)
+        self.benchmark_label = QLabel("")
+        self.benchmark_label.setFont(QFont("Arial", 8))
+        policy_layout.addWidget(self.benchmark_label, 1)
+        layout.addLayout(policy_layout)
+        self.benchmark_worker = None
+
+        # Execution engine selection
+        engine_layout = QHBoxLayout()
+        engine_label = QLabel("Engine:")
+        engine_label.setAlignment(Qt.AlignLeft)
+        engine_layout.addWidget(engine_label)
+        self.engine_combo = QComboBox()
+        self.engine_combo.addItems(["External CLI", "Native Parallel"])
+        self.engine_combo.setToolTip("External CLI: run 'ascmhl create'.\nNative Parallel: hash on a thread pool inside the GUI using the ascmhl library.")
+        self.engine_combo.currentTextChanged.connect(self.update_engine_controls)
+        self.engine_combo.currentTextChanged.connect(self.apply_hash_policy)
+        engine_layout.addWidget(self.engine_combo)
+        engine_layout.addWidget(QLabel("Workers:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(0, 128)
+        self.workers_spin.setSpecialValueText("Auto")
+        self.workers_spin.setToolTip("Hashing threads for the native engine.")
+        engine_layout.addWidget(self.workers_spin)
+        engine_layout.addWidget(QLabel("Per device:"))
+        self.per_device_spin = QSpinBox()
+        self.per_device_spin.setRange(0, 64)
+        self.per_device_spin.setSpecialValueText("Auto")
+        self.per_device_spin.setToolTip("Concurrent file reads allowed on one physical device.\nUse 1-2 for spinning disks, more for RAID and NVMe.")
+        engine_layout.addWidget(self.per_device_spin)
+        layout.addLayout(engine_layout)
+        self.workers_spin.valueChanged.connect(self.apply_hash_policy)
+
         # Configuration section
         config_group = QVBoxLayout()
         config_label = QLabel("Configuration:")
@@ -193,19 +719,103 @@ SOFTWARE.""")
         config_group.addWidget(self.detect_renaming_checkbox)
         self.no_directory_hashes_checkbox = QCheckBox("Skip Directory Hashes (--no_directory_hashes)")
         self.no_directory_hashes_checkbox.setChecked(False)
+        self.no_directory_hashes_checkbox.setToolTip(
+            "Leaves directory hashes out of the generation.\n"
+            "The native engine builds them while files are hashed and keeps those of unchanged folders,\n"
+            "so skipping them saves almost no time there."
+        )
         self.no_directory_hashes_checkbox.stateChanged.connect(self.update_no_directory_hashes_label)
         config_group.addWidget(self.no_directory_hashes_checkbox)
+        cache_layout = QHBoxLayout()
+        cache_layout.addWidget(QLabel("Hash Cache (native engine):"))
+        self.hash_cache_combo = QComboBox()
+        self.hash_cache_combo.addItems(["Off", "Force full rehash", "Trust cache"])
+        self.hash_cache_combo.setToolTip(
+            "Force full rehash: hash every file and record the results in the cache.\n"
+            "Trust cache: reuse cached hashes for files whose size and modification time are unchanged."
+        )
+        cache_layout.addWidget(self.hash_cache_combo)
+        cache_layout.addStretch()
+        config_group.addLayout(cache_layout)
+        # Both apply to a running job as well, see apply_throttle_settings
+        throttle_layout = QHBoxLayout()
+        throttle_layout.addWidget(QLabel("Priority:"))
+        self.priority_combo = QComboBox()
+        for priority in ascmhl_throttle.PRIORITIES:
+            self.priority_combo.addItem(priority.capitalize(), priority)
+        self.priority_combo.setCurrentIndex(ascmhl_throttle.PRIORITIES.index("normal"))
+        self.priority_combo.setToolTip(
+            "CPU and disk priority of the job.\n"
+            "Background: lowest priority (nice 19, idle I/O), leaves the disk to a live offload.\n"
+            "Urgent: above normal, needs administrator rights.\n"
+            "A running job can always be lowered; raising it again may need administrator rights."
+        )
+        self.priority_combo.currentIndexChanged.connect(self.apply_throttle_settings)
+        throttle_layout.addWidget(self.priority_combo)
+        throttle_layout.addWidget(QLabel("Max read:"))
+        self.bandwidth_spin = QSpinBox()
+        self.bandwidth_spin.setRange(0, 100000)
+        self.bandwidth_spin.setSingleStep(50)
+        self.bandwidth_spin.setSuffix(" MB/s")
+        self.bandwidth_spin.setSpecialValueText("Unlimited")
+        self.bandwidth_spin.setToolTip("Cap the reads of the native engine, Verify, Compare and offloads.\n"
+                                       "The External CLI engine is only prioritized, not capped.")
+        self.bandwidth_spin.valueChanged.connect(self.apply_throttle_settings)
+        throttle_layout.addWidget(self.bandwidth_spin)
+        throttle_layout.addStretch()
+        config_group.addLayout(throttle_layout)
         layout.addLayout(config_group)
+        self.update_engine_controls()
 
         button_layout = QHBoxLayout()
         self.run_btn = QPushButton("Create MHL Generation")
         self.run_btn.clicked.connect(self.run_ascmhl)
+        self.verify_btn = QPushButton("Verify")
+        self.verify_btn.setToolTip("Re-hash the files of the latest ASC MHL generation in parallel and report mismatches and missing files.")
+        self.verify_btn.clicked.connect(lambda: self.run_ascmhl(verify=True))
+        self.compare_btn = QPushButton("Compare...")
+        self.compare_btn.setToolTip(
+            "Compare the media folder with another folder or ASC MHL history and list missing, extra and mismatched files.\n"
+            "Histories are compared by their recorded hashes; with 'Detect Renaming' moved files are paired up."
+        )
+        self.compare_btn.clicked.connect(self.compare_folder)
+        self.compare_rehash_checkbox = QCheckBox("Re-read")
+        self.compare_rehash_checkbox.setToolTip(
+            "Compare: hash the files of both sides from the disk, even where a history has recorded hashes.\n"
+            "Without it a history is trusted, so a copy damaged after its generation was written still matches."
+        )
+        self.report_btn = QPushButton("Report...")
+        self.report_btn.setToolTip(
+            "Write a client report of the latest ASC MHL generation: every file with size, dates and hashes\n"
+            "as paginated HTML and CSV, and a PDF summary."
+        )
+        self.report_btn.setEnabled(False)
+        self.report_btn.clicked.connect(self.write_report)
+        self.resume_btn = QPushButton("Resume")
+        self.resume_btn.setToolTip("Continue an aborted or interrupted job: files already hashed are not read again.\n"
+                                   "Always runs the native engine, the External CLI cannot skip hashed files.")
+        self.resume_btn.setEnabled(False)
+        self.resume_btn.clicked.connect(lambda: self.run_ascmhl(resume=True))
         self.abort_btn = QPushButton("Abort")
         self.abort_btn.setEnabled(False)
         self.abort_btn.clicked.connect(self.abort_ascmhl)
+        self.pause_btn = QPushButton("Pause")
+        self.pause_btn.setToolTip("Stop reading the disk until resumed. The job keeps its place.")
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.clicked.connect(self.toggle_pause)
         self.exit_btn = QPushButton("Exit")
         self.exit_btn.clicked.connect(self.close)
+        self.enqueue_btn = QPushButton("Add to Queue")
+        self.enqueue_btn.setToolTip("Queue this folder with the current settings. See the Queue tab.")
+        self.enqueue_btn.clicked.connect(lambda: self.enqueue_folders([self.media_folder]) if self.media_folder else None)
         button_layout.addWidget(self.run_btn)
+        button_layout.addWidget(self.verify_btn)
+        button_layout.addWidget(self.compare_btn)
+        button_layout.addWidget(self.compare_rehash_checkbox)
+        button_layout.addWidget(self.report_btn)
+        button_layout.addWidget(self.resume_btn)
+        button_layout.addWidget(self.enqueue_btn)
+        button_layout.addWidget(self.pause_btn)
         button_layout.addWidget(self.abort_btn)
         button_layout.addWidget(self.exit_btn)
         layout.addLayout(button_layout)
@@ -219,6 +829,99 @@ SOFTWARE.""")
 
         self.main_tab.setLayout(layout)
 
+    def selected_hash_formats(self):
+        formats = [self.hash_combo.currentText()]
+        for action in self.extra_hash_btn.menu().actions():
+            if action.isChecked() and action.text() not in formats:
+                formats.append(action.text())
+        return formats
+
+    def update_extra_hashes_label(self):
+        extras = self.selected_hash_formats()[1:]
+        self.extra_hash_btn.setText("+ " + ", ".join(extras) if extras else "+ Extra")
+
+    def apply_hash_policy(self):
+        """Show the benchmark's recommendation and, unless the algorithm is picked manually, select it."""
+        results = ascmhl_hashbench.load_results()
+        hash_rates = ascmhl_hashbench.cached_hash_rates(results)
+        if not hash_rates:
+            self.benchmark_label.setText("Not benchmarked on this machine yet.")
+            return
+        read_rate = ascmhl_hashbench.cached_read_rate(self.media_folder, results) if self.media_folder else None
+        policy = self.hash_policy_combo.currentData()
+        cores = ascmhl_hashbench.usable_cores({
+            "engine": self.engine_combo.currentText(), "workers": self.workers_spin.value(),
+            "destinations": self.output_folders,
+        })
+        recommendation = ascmhl_hashbench.recommend(hash_rates, read_rate, policy or "fastest",
+                                                    self.hash_combo.currentText(), cores)
+        if recommendation is None:
+            self.benchmark_label.setText("No benchmarked algorithm fits this policy.")
+            return
+        choice, explanation = recommendation
+        if policy is not None:
+            self.hash_combo.setCurrentText(choice)
+        elif choice != self.hash_combo.currentText():
+            explanation = "fastest is " + explanation
+        if self.media_folder and read_rate is None:
+            explanation += " (drive not benchmarked)"
+        self.benchmark_label.setText(explanation)
+
+    def run_benchmark(self):
+        folder = self.media_folder or None
+        self.log.append(f"\n⏱️ Benchmarking hash algorithms{' and the drive of ' + folder if folder else ''}\n")
+        self.benchmark_btn.setEnabled(False)
+        self.benchmark_label.setText("⏱️ Benchmarking...")
+        self.benchmark_worker = BenchmarkWorker(folder)
+        self.benchmark_worker.output.connect(self.log.append)
+        self.benchmark_worker.finished.connect(self.handle_benchmark_finished)
+        self.benchmark_worker.start()
+
+    def handle_benchmark_finished(self, returncode):
+        self.benchmark_btn.setEnabled(True)
+        self.benchmark_worker = None
+        self.apply_hash_policy()
+        self.log.append(f"⏱️ {self.benchmark_label.text()}")
+
+    def update_engine_controls(self):
+        native = self.engine_combo.currentText() == "Native Parallel"
+        self.backend_combo.setEnabled(not native)
+        self.workers_spin.setEnabled(native)
+        self.per_device_spin.setEnabled(native)
+        self.hash_cache_combo.setEnabled(native)
+        self.io_combo.setEnabled(native)
+
+    def set_job_controls_enabled(self, enabled):
+        self.exit_btn.setEnabled(enabled)
+        self.abort_btn.setEnabled(not enabled)
+        self.pause_btn.setEnabled(not enabled)
+        self.pause_btn.setText("Pause")
+        self.run_btn.setEnabled(enabled)
+        self.verify_btn.setEnabled(enabled)
+        self.compare_btn.setEnabled(enabled)
+        self.report_btn.setEnabled(enabled and bool(self.media_folder)
+                                   and os.path.isdir(os.path.join(self.media_folder, "ascmhl")))
+        self.resume_btn.setEnabled(enabled and bool(self.media_folder) and ascmhl_journal.has_journal(self.media_folder))
+        self.info_tab.setDisabled(not enabled)
+        self.detect_renaming_checkbox.setEnabled(enabled)
+        self.no_directory_hashes_checkbox.setEnabled(enabled)
+        self.hash_combo.setEnabled(enabled)
+        self.extra_hash_btn.setEnabled(enabled)
+        self.hash_policy_combo.setEnabled(enabled)
+        self.engine_combo.setEnabled(enabled)
+        self.folder_btn.setEnabled(enabled)
+        self.offload_add_btn.setEnabled(enabled)
+        self.offload_clear_btn.setEnabled(enabled)
+        self.verify_copies_checkbox.setEnabled(enabled)
+        if enabled:
+            self.update_engine_controls()
+        else:
+            self.backend_combo.setEnabled(False)
+            self.workers_spin.setEnabled(False)
+            self.per_device_spin.setEnabled(False)
+            self.hash_cache_combo.setEnabled(False)
+            self.io_combo.setEnabled(False)
+
     # Drag & drop event filter for folder label and main window
     def eventFilter(self, obj, event):
         if obj == self.folder_label:
@@ -231,8 +934,7 @@ SOFTWARE.""")
                 if urls:
                     path = urls[0].toLocalFile()
                     if os.path.isdir(path):
-                        self.media_folder = path
-                        self.folder_label.setText(path)
+                        self.set_media_folder(path)
                         return True
         return super().eventFilter(obj, event)
 
@@ -243,12 +945,436 @@ SOFTWARE.""")
             event.ignore()
 
     def dropEvent(self, event):
-        urls = event.mimeData().urls()
-        if urls:
-            path = urls[0].toLocalFile()
-            if os.path.isdir(path):
-                self.media_folder = path
-                self.folder_label.setText(path)
+        folders = [url.toLocalFile() for url in event.mimeData().urls()]
+        folders = [path for path in folders if os.path.isdir(path)]
+        # Several folders, or any drop on the Queue tab, become queued jobs
+        if len(folders) > 1 or (folders and self.tabs.currentWidget() is self.queue_tab):
+            self.enqueue_folders(folders)
+            self.tabs.setCurrentWidget(self.queue_tab)
+        elif folders:
+            self.set_media_folder(folders[0])
+
+    def init_queue_tab(self):
+        layout = QVBoxLayout()
+
+        self.queue_table = QTableWidget(0, 4)
+        self.queue_table.setHorizontalHeaderLabels(["Folder", "Device", "Status", "Progress"])
+        self.queue_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.queue_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.queue_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.queue_table.verticalHeader().setVisible(False)
+        self.queue_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.queue_table.currentCellChanged.connect(lambda row, *_: self.show_queue_job_log(row))
+        layout.addWidget(self.queue_table)
+
+        # One log per job, the selected job's log is shown
+        self.queue_logs = QStackedWidget()
+        self.queue_hint_label = QLabel("Drop several folders on the window to queue them.")
+        self.queue_logs.addWidget(self.queue_hint_label)
+        layout.addWidget(self.queue_logs)
+
+        queue_buttons = QHBoxLayout()
+        self.queue_start_btn = QPushButton("Start Queue")
+        self.queue_start_btn.clicked.connect(self.toggle_queue)
+        queue_buttons.addWidget(self.queue_start_btn)
+        self.queue_abort_btn = QPushButton("Abort Job")
+        self.queue_abort_btn.clicked.connect(self.abort_selected_job)
+        queue_buttons.addWidget(self.queue_abort_btn)
+        self.queue_pause_btn = QPushButton("Pause Job")
+        self.queue_pause_btn.setToolTip("Stop the selected job from reading the disk until resumed.")
+        self.queue_pause_btn.clicked.connect(self.pause_selected_job)
+        queue_buttons.addWidget(self.queue_pause_btn)
+        self.queue_resume_btn = QPushButton("Resume Job")
+        self.queue_resume_btn.setToolTip("Queue an aborted or failed job again; files already hashed are not read again.\n"
+                                         "Always runs the native engine, the External CLI cannot skip hashed files.")
+        self.queue_resume_btn.clicked.connect(self.resume_selected_job)
+        queue_buttons.addWidget(self.queue_resume_btn)
+        self.queue_remove_btn = QPushButton("Remove Job")
+        self.queue_remove_btn.clicked.connect(self.remove_selected_job)
+        queue_buttons.addWidget(self.queue_remove_btn)
+        self.queue_clear_btn = QPushButton("Clear Finished")
+        self.queue_clear_btn.clicked.connect(self.clear_finished_jobs)
+        queue_buttons.addWidget(self.queue_clear_btn)
+        queue_buttons.addWidget(QLabel("Max parallel:"))
+        self.queue_parallel_spin = QSpinBox()
+        self.queue_parallel_spin.setRange(1, 16)
+        self.queue_parallel_spin.setValue(4)
+        self.queue_parallel_spin.setToolTip("Jobs on different physical devices run at the same time, jobs sharing a device run one after another.")
+        self.queue_parallel_spin.valueChanged.connect(self.schedule_jobs)
+        queue_buttons.addWidget(self.queue_parallel_spin)
+        layout.addLayout(queue_buttons)
+
+        # Watch folders: new volumes and finished offloads are queued with a preset
+        watch_config = ascmhl_watch.load_watch_config()
+        self.watch_roots = list(watch_config["roots"])
+        watch_row = QHBoxLayout()
+        watch_row.addWidget(QLabel("Watch:"))
+        self.watch_label = QLabel()
+        self.watch_label.setWordWrap(True)
+        watch_row.addWidget(self.watch_label, 1)
+        self.watch_add_btn = QPushButton("Add Watch Folder...")
+        self.watch_add_btn.setToolTip("Every folder that appears inside it is queued once it has stopped changing.")
+        self.watch_add_btn.clicked.connect(self.add_watch_folder)
+        watch_row.addWidget(self.watch_add_btn)
+        self.watch_volumes_btn = QPushButton("Add Volumes")
+        self.watch_volumes_btn.setToolTip("Watch where removable volumes are mounted: " +
+                                          (", ".join(ascmhl_watch.default_mount_roots()) or "none found"))
+        self.watch_volumes_btn.clicked.connect(lambda: self.add_watch_folder(ascmhl_watch.default_mount_roots()))
+        watch_row.addWidget(self.watch_volumes_btn)
+        self.watch_clear_btn = QPushButton("Clear")
+        self.watch_clear_btn.clicked.connect(lambda: self.add_watch_folder([], replace=True))
+        watch_row.addWidget(self.watch_clear_btn)
+        layout.addLayout(watch_row)
+        watch_options = QHBoxLayout()
+        watch_options.addWidget(QLabel("Preset:"))
+        self.watch_preset_combo = QComboBox()
+        self.watch_preset_combo.setToolTip("Settings of the jobs queued by watch folders.")
+        watch_options.addWidget(self.watch_preset_combo)
+        self.save_preset_btn = QPushButton("Save Preset...")
+        self.save_preset_btn.setToolTip("Save the Create and Info tab settings under a name.")
+        self.save_preset_btn.clicked.connect(self.save_preset)
+        watch_options.addWidget(self.save_preset_btn)
+        watch_options.addWidget(QLabel("Max pending:"))
+        self.watch_pending_spin = QSpinBox()
+        self.watch_pending_spin.setRange(1, 256)
+        self.watch_pending_spin.setValue(watch_config["max_pending"])
+        self.watch_pending_spin.setToolTip("Settled folders wait while this many jobs are queued or running.")
+        watch_options.addWidget(self.watch_pending_spin)
+        self.watch_btn = QPushButton("Start Watching")
+        self.watch_btn.clicked.connect(self.toggle_watching)
+        watch_options.addWidget(self.watch_btn)
+        watch_options.addStretch()
+        layout.addLayout(watch_options)
+        self.watch_thread = None
+        self.update_presets(watch_config["preset"])
+        self.update_watch_label()
+        self.watch_pending_spin.valueChanged.connect(self.update_watch_settings)
+        self.watch_preset_combo.activated.connect(self.update_watch_settings)
+
+        self.queue_tab.setLayout(layout)
+
+        self.jobs = []
+        self.job_runtime = {}
+        self.retired_workers = []  # aborted workers that have not stopped yet
+        self.queue_running = False
+        self.queue_timer = QTimer(self)
+        self.queue_timer.timeout.connect(self.update_queue_progress)
+        for job in ascmhl_jobs.load_queue():
+            self.add_job_row(job)
+        if self.jobs:
+            self.queue_hint_label.setText(f"Restored {len(self.jobs)} jobs from the last session. Select a job to see its log.")
+
+    def add_watch_folder(self, folders=None, replace=False):
+        if folders is None:
+            folder = QFileDialog.getExistingDirectory(self, "Select Folder to Watch")
+            folders = [folder] if folder else []
+        self.watch_roots = [] if replace else self.watch_roots
+        self.watch_roots += [f for f in folders if f not in self.watch_roots]
+        self.update_watch_label()
+        self.save_watch_config()
+
+    def update_watch_label(self):
+        self.watch_label.setText("; ".join(self.watch_roots) if self.watch_roots else "No watch folders")
+        self.watch_btn.setEnabled(bool(self.watch_roots) or self.watch_thread is not None)
+
+    def update_presets(self, selected=None):
+        self.watch_preset_combo.clear()
+        self.watch_preset_combo.addItem("Current settings", None)
+        for name in sorted(ascmhl_jobs.load_presets()):
+            self.watch_preset_combo.addItem(name, name)
+        index = self.watch_preset_combo.findData(selected)
+        self.watch_preset_combo.setCurrentIndex(max(0, index))
+
+    def save_preset(self):
+        name, ok = QInputDialog.getText(self, "Save Preset", "Preset name:")
+        if ok and name.strip():
+            ascmhl_jobs.save_preset(name.strip(), self.current_job_settings())
+            self.update_presets(name.strip())
+            self.save_watch_config()
+            self.log.append(f"💾 Saved preset '{name.strip()}'")
+
+    def update_watch_settings(self):
+        if self.watch_thread is not None:
+            self.watch_thread.max_pending = self.watch_pending_spin.value()
+        self.save_watch_config()
+
+    def save_watch_config(self):
+        ascmhl_watch.save_watch_config({
+            "roots": self.watch_roots,
+            "preset": self.watch_preset_combo.currentData(),
+            "max_pending": self.watch_pending_spin.value(),
+        })
+
+    def toggle_watching(self):
+        if self.watch_thread is not None:
+            self.watch_thread.stop()
+            self.watch_thread.wait(5000)
+            self.watch_thread = None
+            self.watch_btn.setText("Start Watching")
+            self.update_watch_label()
+            return
+        self.save_watch_config()
+        self.watch_thread = WatchThread(list(self.watch_roots), self.watch_pending_spin.value(), self)
+        self.watch_thread.output.connect(self.log.append)
+        self.watch_thread.ready.connect(self.enqueue_watched_folder)
+        self.watch_btn.setText("Stop Watching")
+        self.schedule_jobs()
+        self.watch_thread.start()
+        if not self.queue_running:
+            self.toggle_queue()
+
+    def enqueue_watched_folder(self, folder):
+        name = self.watch_preset_combo.currentData()
+        settings = ascmhl_jobs.load_presets().get(name) if name else None
+        self.enqueue_folders([folder], settings)
+
+    def enqueue_folders(self, folders, settings=None):
+        settings = settings or self.current_job_settings()
+        for folder in folders:
+            self.add_job_row(ascmhl_jobs.QueuedJob(folder, settings))
+        self.save_queue()
+        self.schedule_jobs()
+
+    def add_job_row(self, job):
+        self.jobs.append(job)
+        row = self.queue_table.rowCount()
+        self.queue_table.insertRow(row)
+        self.queue_table.setItem(row, 0, QTableWidgetItem(job.folder))
+        self.queue_table.setItem(row, 1, QTableWidgetItem(job.device))
+        self.queue_table.setItem(row, 2, QTableWidgetItem(job.status))
+        bar = QProgressBar()
+        bar.setAlignment(Qt.AlignCenter)
+        bar.setValue(100 if job.status == ascmhl_jobs.DONE else 0)
+        self.queue_table.setCellWidget(row, 3, bar)
+        log = LogView(max_blocks=5000)
+        self.queue_logs.addWidget(log)
+        runtime = {"bar": bar, "log": log, "worker": None, "scan": None, "tracker": None, "scan_thread": None,
+                   "aborting": False}
+        self.job_runtime[job.id] = runtime
+
+    def job_row(self, job):
+        return self.jobs.index(job)
+
+    def set_job_status(self, job, status, returncode=None):
+        job.status = status
+        job.returncode = returncode
+        self.queue_table.item(self.job_row(job), 2).setText(
+            status if returncode in (None, 0) else f"{status} ({returncode})"
+        )
+        self.save_queue()
+        self.update_queue_pause_button()
+
+    def save_queue(self):
+        try:
+            ascmhl_jobs.save_queue(self.jobs)
+        except OSError as e:
+            self.log.append(f"⚠️ Could not save job queue: {str(e)}")
+
+    def show_queue_job_log(self, row):
+        if 0 <= row < len(self.jobs):
+            self.queue_logs.setCurrentWidget(self.job_runtime[self.jobs[row].id]["log"])
+        self.update_queue_pause_button()
+
+    def selected_throttle(self):
+        """The throttle of the selected job while it runs, else None."""
+        job = self.selected_job()
+        if job is None or job.status != ascmhl_jobs.RUNNING:
+            return None
+        worker = self.job_runtime[job.id]["worker"]
+        return worker.throttle if worker is not None else None
+
+    def update_queue_pause_button(self):
+        throttle = self.selected_throttle()
+        self.queue_pause_btn.setEnabled(throttle is not None)
+        self.queue_pause_btn.setText("Continue Job" if throttle is not None and throttle.paused else "Pause Job")
+
+    def pause_selected_job(self):
+        throttle = self.selected_throttle()
+        if throttle is None:
+            return
+        log = self.job_runtime[self.selected_job().id]["log"]
+        if throttle.paused:
+            throttle.resume()
+            log.append("▶️ Resumed.")
+        else:
+            throttle.pause()
+            log.append("⏸️ Paused, no files are read until resumed.")
+        self.update_queue_pause_button()
+
+    def selected_job(self):
+        row = self.queue_table.currentRow()
+        return self.jobs[row] if 0 <= row < len(self.jobs) else None
+
+    def toggle_queue(self):
+        self.queue_running = not self.queue_running
+        self.queue_start_btn.setText("Pause Queue" if self.queue_running else "Start Queue")
+        if self.queue_running:
+            self.queue_timer.start(500)
+            self.schedule_jobs()
+
+    def schedule_jobs(self):
+        if self.watch_thread is not None:
+            self.watch_thread.pending = sum(1 for j in self.jobs if j.status in (ascmhl_jobs.QUEUED, ascmhl_jobs.RUNNING))
+        if not self.queue_running:
+            return
+        for job in ascmhl_jobs.runnable_jobs(self.jobs, self.queue_parallel_spin.value()):
+            self.start_job(job)
+
+    def start_job(self, job):
+        runtime = self.job_runtime[job.id]
+        log = runtime["log"]
+        error = self.check_engine_available(job.settings)
+        if error:
+            log.append(error)
+            self.set_job_status(job, ascmhl_jobs.FAILED, -1)
+            return
+        runtime.update(worker=None, scan_thread=None)
+        self.set_job_status(job, ascmhl_jobs.RUNNING)
+        if runtime["scan"] is None and job.settings.get("mode") != "compare":
+            # The scan is the job's first step, so it holds the device slot and the folder is walked once
+            log.append("🔍 Counting files...")
+            runtime["bar"].setRange(0, 0)
+            scan_thread = ScanThread(job.folder, self)
+            scan_thread.scanned.connect(lambda scan: runtime.update(scan=scan))
+            scan_thread.finished.connect(lambda: self.launch_job(job))
+            runtime["scan_thread"] = scan_thread
+            scan_thread.start()
+        else:
+            self.launch_job(job)
+
+    def launch_job(self, job):
+        runtime = self.job_runtime.get(job.id)
+        if runtime is None or job.status != ascmhl_jobs.RUNNING:
+            return  # dropped while its folder was scanned
+        log = runtime["log"]
+        if runtime["aborting"]:
+            self.finish_job(job, -1)
+            return
+        if job.settings.get("destinations"):
+            log.append(f"📦 Offloading to {', '.join(job.settings['destinations'])}")
+        elif job.settings.get("resume"):
+            log.append(ascmhl_jobs.resume_engine_note(job.settings) or "⏯️ Resuming with the native engine")
+        else:
+            log.append(f"🔧 Running: {' '.join(ascmhl_jobs.build_create_command(job.folder, job.settings))}")
+        settings = ascmhl_jobs.small_file_settings(job.settings, runtime["scan"])
+        if settings.get("small_files"):
+            log.append("📁 Small-file tree: using the small-file path, progress is logged per folder")
+        if runtime["scan"] is not None:
+            runtime["tracker"] = ascmhl_scan.ProgressTracker(runtime["scan"], settings.get("small_files", False))
+            runtime["bar"].setRange(0, 1000)
+        else:
+            runtime["bar"].setRange(0, 0)
+
+        def handle_output(line):
+            log.append(line)
+            if runtime["tracker"] is not None:
+                runtime["tracker"].feed(line)
+
+        def handle_progress(percent):
+            if runtime["tracker"] is None:
+                runtime["bar"].setRange(0, 100)
+                runtime["bar"].setValue(percent)
+
+        worker = self.make_worker(job.folder, settings, runtime["scan"])
+        worker.output.connect(handle_output)
+        worker.progress.connect(handle_progress)
+        worker.finished.connect(lambda returncode: self.finish_job(job, returncode))
+        runtime["worker"] = worker
+        worker.start()
+
+    def finish_job(self, job, returncode):
+        runtime = self.job_runtime.get(job.id)
+        if runtime is None or job.status != ascmhl_jobs.RUNNING:
+            return
+        self.refresh_job_history()
+        bar = runtime["bar"]
+        bar.setRange(0, 1000)
+        bar.resetFormat()
+        if runtime["aborting"]:
+            # Only now is the device free and the folder's history no longer written to
+            runtime["aborting"] = False
+            runtime["log"].append("⚠️ Job aborted.")
+            self.set_job_status(job, ascmhl_jobs.ABORTED)
+        elif returncode == 0:
+            bar.setValue(1000)
+            runtime["log"].append("✅ MHL creation complete.")
+            self.set_job_status(job, ascmhl_jobs.DONE, 0)
+        else:
+            runtime["log"].append(f"❌ MHL creation failed with exit code {returncode}.")
+            self.set_job_status(job, ascmhl_jobs.FAILED, returncode)
+        self.log.append(f"{'✅' if returncode == 0 else '❌'} Queue job {job.status.lower()}: {job.folder}")
+        self.schedule_jobs()
+        if not any(j.status in (ascmhl_jobs.QUEUED, ascmhl_jobs.RUNNING) for j in self.jobs):
+            self.queue_timer.stop()
+            self.log.append("✅ Job queue finished.")
+
+    def update_queue_progress(self):
+        for job in self.jobs:
+            if job.status != ascmhl_jobs.RUNNING:
+                continue
+            runtime = self.job_runtime[job.id]
+            tracker = runtime["tracker"]
+            if tracker is not None:
+                rate = tracker.rate()
+                eta = tracker.eta(rate)
+                runtime["bar"].setValue(int(tracker.fraction() * 1000))
+                eta_text = ascmhl_scan.format_duration(eta) if eta is not None else "--:--:--"
+                runtime["bar"].setFormat(f"%p% · {ascmhl_scan.format_bytes(rate)}/s · {eta_text}")
+
+    def abort_selected_job(self):
+        job = self.selected_job()
+        if job is None or job.status != ascmhl_jobs.RUNNING:
+            return
+        runtime = self.job_runtime[job.id]
+        if runtime["aborting"]:
+            return
+        # The job keeps its device until the worker has stopped; finish_job marks it aborted
+        runtime["aborting"] = True
+        if runtime["worker"] is not None:
+            runtime["worker"].terminate()
+        elif runtime["scan_thread"] is not None:
+            runtime["scan_thread"].cancel()
+        runtime["log"].append("⚠️ Aborting...")
+        self.queue_table.item(self.job_row(job), 2).setText("Aborting")
+
+    def resume_selected_job(self):
+        job = self.selected_job()
+        if job is None or job.status not in (ascmhl_jobs.FAILED, ascmhl_jobs.ABORTED):
+            return
+        job.settings = ascmhl_jobs.resume_settings(job.settings)
+        self.job_runtime[job.id]["log"].append("⏯️ Job queued to resume from its journal.")
+        self.set_job_status(job, ascmhl_jobs.QUEUED)
+        self.schedule_jobs()
+
+    def remove_selected_job(self):
+        job = self.selected_job()
+        if job is None or job.status == ascmhl_jobs.RUNNING:
+            return
+        self.drop_job(job)
+        self.save_queue()
+
+    def clear_finished_jobs(self):
+        for job in [j for j in self.jobs if j.status in (ascmhl_jobs.DONE, ascmhl_jobs.FAILED, ascmhl_jobs.ABORTED)]:
+            self.drop_job(job)
+        self.save_queue()
+
+    def drop_job(self, job):
+        runtime = self.job_runtime.pop(job.id)
+        worker = runtime["worker"]
+        if worker is not None and worker.isRunning():
+            self.retired_workers.append(worker)
+            worker.finished.connect(lambda _, worker=worker: self.release_worker(worker))
+        if runtime["scan_thread"] is not None and runtime["scan_thread"].isRunning():
+            runtime["scan_thread"].cancel()
+        self.queue_logs.removeWidget(runtime["log"])
+        self.queue_table.removeRow(self.job_row(job))
+        self.jobs.remove(job)
+
+    def release_worker(self, worker):
+        """Forget an aborted worker once it has stopped, and any other that stopped unnoticed."""
+        if isinstance(worker, QThread):
+            worker.wait()  # finished is emitted at the end of run(), just before the thread stops
+        self.retired_workers = [w for w in self.retired_workers if w is not worker and w.isRunning()]
 
     def init_info_tab(self):
         layout = QFormLayout()
@@ -302,61 +1428,249 @@ SOFTWARE.""")
     def export_user_data_json(self):
         file_path, _ = QFileDialog.getSaveFileName(self, "Export User Data", "identity.json", "JSON Files (*.json)")
         if file_path:
-            user_data = {
-                'location': self.location_input.text(),
-                'name': self.name_input.text(),
-                'email': self.email_input.text(),
-                'phone': self.phone_input.text(),
-                'role': self.role_input.text()
-            }
-            with open(file_path, 'w') as file:
-                json.dump(user_data, file, indent=4)
+            ascmhl_jobs.write_identity(file_path, self.current_identity())
             self.clear_info_fields()
             self.feedback_label.setText("✅ User data exported to JSON.")
 
     def import_user_data_json(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Import User Data", "", "JSON Files (*.json)")
         if file_path:
-            with open(file_path, 'r') as file:
-                user_data = json.load(file)
-            self.location_input.setText(user_data.get('location', ''))
-            self.name_input.setText(user_data.get('name', ''))
-            self.email_input.setText(user_data.get('email', ''))
-            self.phone_input.setText(user_data.get('phone', ''))
-            self.role_input.setText(user_data.get('role', ''))
+            self.set_identity(ascmhl_jobs.read_identity(file_path))
             self.feedback_label.setText("✅ User data imported from JSON.")
 
+    def current_identity(self):
+        """The Info tab fields, None where empty."""
+        return {
+            "location": self.location_input.text().strip() or None,
+            "name": self.name_input.text().strip() or None,
+            "email": self.email_input.text().strip() or None,
+            "phone": self.phone_input.text().strip() or None,
+            "role": self.role_input.text().strip() or None,
+        }
+
+    def set_identity(self, identity):
+        self.location_input.setText(identity.get("location") or "")
+        self.name_input.setText(identity.get("name") or "")
+        self.email_input.setText(identity.get("email") or "")
+        self.phone_input.setText(identity.get("phone") or "")
+        self.role_input.setText(identity.get("role") or "")
+
+    def init_index_tab(self):
+        layout = QVBoxLayout()
+
+        index_row = QHBoxLayout()
+        index_row.addWidget(QLabel("Volume:"))
+        self.index_volume_input = QLineEdit()
+        self.index_volume_input.setPlaceholderText("name of the mount point")
+        self.index_volume_input.setToolTip("Label stored with the indexed generations, e.g. the drive's name.")
+        index_row.addWidget(self.index_volume_input)
+        self.index_folder_btn = QPushButton("Index Folder...")
+        self.index_folder_btn.setToolTip("Add the generations of every ASC MHL history below a folder.\nGenerations already in the index are skipped.")
+        self.index_folder_btn.clicked.connect(self.index_folder)
+        index_row.addWidget(self.index_folder_btn)
+        self.index_abort_btn = QPushButton("Abort")
+        self.index_abort_btn.setEnabled(False)
+        self.index_abort_btn.clicked.connect(lambda: self.index_worker.terminate())
+        index_row.addWidget(self.index_abort_btn)
+        layout.addLayout(index_row)
+
+        search_row = QHBoxLayout()
+        self.index_search_input = QLineEdit()
+        self.index_search_input.setPlaceholderText("Hash, file name prefix or path prefix (with /)")
+        self.index_search_input.returnPressed.connect(self.search_index)
+        search_row.addWidget(self.index_search_input)
+        self.index_search_btn = QPushButton("Search")
+        self.index_search_btn.clicked.connect(self.search_index)
+        search_row.addWidget(self.index_search_btn)
+        layout.addLayout(search_row)
+
+        self.index_results = QTableWidget(0, 7)
+        self.index_results.setHorizontalHeaderLabels(["Volume", "Gen.", "Created", "Path", "Size", "Format", "Hash"])
+        self.index_results.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.index_results.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.index_results.verticalHeader().setVisible(False)
+        self.index_results.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        layout.addWidget(self.index_results)
+
+        self.index_status_label = QLabel("")
+        self.index_status_label.setFont(QFont("Arial", 8))
+        layout.addWidget(self.index_status_label)
+
+        self.index_tab.setLayout(layout)
+        self.index_worker = None
+        self.history_index = None
+
+    def open_history_index(self):
+        """The GUI's own index connection; indexing runs on a separate one so searches never wait for it."""
+        if self.history_index is None:
+            import ascmhl_index
+            try:
+                self.history_index = ascmhl_index.HistoryIndex()
+            except Exception as e:
+                self.index_status_label.setText(f"❌ Index unavailable: {str(e)}")
+        return self.history_index
+
+    def update_index_summary(self):
+        index = self.open_history_index()
+        if index is not None:
+            volumes, generations, rows = index.summary()
+            self.index_status_label.setText(f"📇 {volumes} volumes, {generations} generations, {rows:,} file hashes indexed")
+
+    def index_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder to Index")
+        if not folder:
+            return
+        try:
+            import ascmhl_index
+        except ImportError as e:
+            self.index_status_label.setText(f"❌ lxml is needed to index histories: {str(e)}")
+            return
+        self.index_worker = IndexWorker(folder, self.index_volume_input.text().strip() or None)
+        self.index_worker.output.connect(self.log.append)
+        self.index_worker.output.connect(
+            lambda line: self.index_status_label.setText(line) if line.startswith(("📇", "❌", "⚠️")) else None
+        )
+        self.index_worker.finished.connect(self.handle_index_finished)
+        self.index_folder_btn.setEnabled(False)
+        self.index_abort_btn.setEnabled(True)
+        self.index_worker.start()
+
+    def handle_index_finished(self, returncode):
+        self.index_folder_btn.setEnabled(True)
+        self.index_abort_btn.setEnabled(False)
+        if returncode == 0:
+            self.update_index_summary()
+
+    def search_index(self):
+        index = self.open_history_index()
+        if index is None:
+            return
+        started = time.perf_counter()
+        rows = index.search(self.index_search_input.text())
+        elapsed = time.perf_counter() - started
+        self.index_results.setRowCount(len(rows))
+        for row, (volume, history, sequence, created, path, size, algorithm, digest, action) in enumerate(rows):
+            values = [volume, str(sequence or ""), (created or "")[:19].replace("T", " "),
+                      os.path.join(history, path), ascmhl_scan.format_bytes(size) if size is not None else "",
+                      algorithm, digest + (" (failed)" if action == "failed" else "")]
+            for column, value in enumerate(values):
+                self.index_results.setItem(row, column, QTableWidgetItem(value))
+        self.index_status_label.setText(f"🔎 {len(rows)} results in {elapsed * 1000:.1f} ms")
+
     def init_log_tab(self):
         layout = QVBoxLayout()
 
-        self.log = QTextEdit()
-        self.log.setReadOnly(True)
+        self.log = LogView()
         layout.addWidget(self.log)
 
+        self.skipped_lines_label = QLabel("Skipped lines: 0")
+        self.skipped_lines_label.setFont(QFont("Arial", 8))
+        self.log.skipped_changed.connect(lambda count: self.skipped_lines_label.setText(f"Skipped lines: {count}"))
+        layout.addWidget(self.skipped_lines_label)
+
+        self.full_log_path = None
+        self.open_full_log_btn = QPushButton("Open Full Log")
+        self.open_full_log_btn.setEnabled(False)
+        self.open_full_log_btn.clicked.connect(self.open_full_log)
+        layout.addWidget(self.open_full_log_btn)
+
         self.clear_log_btn = QPushButton("Clear Logs")
         self.clear_log_btn.clicked.connect(self.clear_log)
         layout.addWidget(self.clear_log_btn)
 
+        # Telemetry of finished jobs, see ascmhl_telemetry
+        telemetry_config = ascmhl_telemetry.load_config()
+        layout.addWidget(QLabel("Job History"))
+        self.throughput_chart = ThroughputChart()
+        layout.addWidget(self.throughput_chart)
+        self.telemetry_summary_label = QLabel("")
+        self.telemetry_summary_label.setFont(QFont("Arial", 8))
+        layout.addWidget(self.telemetry_summary_label)
+
+        telemetry_row = QHBoxLayout()
+        self.telemetry_checkbox = QCheckBox("Record Telemetry")
+        self.telemetry_checkbox.setChecked(telemetry_config["enabled"])
+        self.telemetry_checkbox.setToolTip("Append each finished job's timings, throughput and memory to telemetry.jsonl")
+        self.telemetry_checkbox.toggled.connect(self.save_telemetry_config)
+        telemetry_row.addWidget(self.telemetry_checkbox)
+        self.prometheus_field = QLineEdit(telemetry_config["prometheus_file"] or "")
+        self.prometheus_field.setPlaceholderText("Prometheus textfile (optional), e.g. /var/lib/node_exporter/ascmhl.prom")
+        self.prometheus_field.editingFinished.connect(self.save_telemetry_config)
+        telemetry_row.addWidget(self.prometheus_field)
+        self.prometheus_browse_btn = QPushButton("Browse")
+        self.prometheus_browse_btn.clicked.connect(self.select_prometheus_file)
+        telemetry_row.addWidget(self.prometheus_browse_btn)
+        self.open_telemetry_btn = QPushButton("Open Telemetry")
+        self.open_telemetry_btn.clicked.connect(self.open_telemetry_file)
+        telemetry_row.addWidget(self.open_telemetry_btn)
+        layout.addLayout(telemetry_row)
+        self.refresh_job_history()
+
         self.log_tab.setLayout(layout)
 
+    def refresh_job_history(self):
+        records = ascmhl_telemetry.load_history()
+        self.throughput_chart.set_records(records)
+        if not records:
+            self.telemetry_summary_label.setText("")
+            return
+        last = records[-1]
+        rate = f"{last['bytes_per_s'] / 1e6:.1f} MB/s" if last.get("bytes_per_s") else "no throughput"
+        files = f"{last['files']} files, " if last.get("files") is not None else ""
+        # Jobs that ran alongside others have no CPU split of their own
+        cpu = f"wait {last['wait_s']:.1f}s, {last['bound']}, " if last.get("bound") else ""
+        self.telemetry_summary_label.setText(
+            f"Last job: {os.path.basename(last['folder']) or last['folder']} ({last['status']}, exit {last['returncode']}), "
+            f"{files}{rate}, scan {last['scan_s'] or 0:.1f}s, hashing {last['hash_s']:.1f}s, "
+            f"{cpu}ascmhl {last['ascmhl_version']}")
+
+    def save_telemetry_config(self):
+        ascmhl_telemetry.save_config({
+            "enabled": self.telemetry_checkbox.isChecked(),
+            "prometheus_file": self.prometheus_field.text().strip() or None,
+        })
+
+    def select_prometheus_file(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Prometheus Textfile", self.prometheus_field.text() or "ascmhl.prom",
+                                              "Prometheus textfile (*.prom)")
+        if path:
+            self.prometheus_field.setText(path)
+            self.save_telemetry_config()
+
+    def open_telemetry_file(self):
+        path = ascmhl_telemetry.telemetry_file()
+        if os.path.exists(path):
+            QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+
     def clear_log(self):
         self.log.clear()
 
+    def open_full_log(self):
+        if self.full_log_path and os.path.exists(self.full_log_path):
+            QDesktopServices.openUrl(QUrl.fromLocalFile(self.full_log_path))
+
     def check_and_install_ascmhl(self):
         try:
-            result = subprocess.run(["ascmhl", "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True)
-            version = result.stdout.strip()
-            self.mhl_version_label.setText(f"ASC MHL Version: {version}")
-            self.update_status(f"✅ ASC MHL is available: {version}", success=True)
-            self.log.append(f"✅ ASC MHL is available: {version}")
-        except FileNotFoundError:
+            tool = ascmhl_tools.find_ascmhl()
+        except Exception as e:
+            self.mhl_version_label.setText("ASC MHL Version: Not Working")
+            self.update_status(f"❌ ASC MHL found but not working: {str(e)}", success=False)
+            self.log.append(f"❌ ASC MHL found but not working: {str(e)}")
+            return
+        if tool is None:
             self.mhl_version_label.setText("ASC MHL Version: Not Found")
             self.update_status("⚠️ ASC MHL not found. Attempting to install...", success="caution")
             self.log.append("⚠️ ASC MHL not found. Attempting to install...")
             self.install_or_update_ascmhl(upgrade=False)
-            import shutil
-            ascmhl_path = shutil.which("ascmhl")
-            if not ascmhl_path:
+            try:
+                tool = ascmhl_tools.find_ascmhl(refresh=True)
+            except Exception as e:
+                self.update_status(f"❌ Failed to verify ASC MHL after install: {str(e)}", success=False)
+                self.log.append(f"❌ Failed to verify ASC MHL after install: {str(e)}")
+                self.check_for_ascmhl_updates(installed_version=None)
+                return
+            if tool is None:
+                import site
                 scripts_dirs = site.getusersitepackages(), site.getsitepackages()[0]
                 scripts_hint = f"\n\nCommon Python Scripts directories:\n- {scripts_dirs[0]}\\Scripts\n- {scripts_dirs[1]}\\Scripts"
                 self.update_status(
@@ -367,20 +1681,10 @@ SOFTWARE.""")
                     "❌ ASC MHL installed, but not found in PATH. Please add your Python Scripts directory to PATH and restart." + scripts_hint
                 )
                 return
-            try:
-                result = subprocess.run(["ascmhl", "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True)
-                version = result.stdout.strip()
-                self.mhl_version_label.setText(f"ASC MHL Version: {version}")
-                self.update_status(f"✅ ASC MHL is available: {version}", success=True)
-                self.log.append(f"✅ ASC MHL is available: {version}")
-                installed_version = version.split('version')[-1].strip() if 'version' in version else version
-            except Exception as e:
-                self.update_status(f"❌ Failed to verify ASC MHL after install: {str(e)}", success=False)
-                self.log.append(f"❌ Failed to verify ASC MHL after install: {str(e)}")
-                installed_version = None
-        else:
-            installed_version = version.split('version')[-1].strip() if 'version' in version else version
-        self.check_for_ascmhl_updates(installed_version=installed_version)
+        self.mhl_version_label.setText(f"ASC MHL Version: {tool['version_text']}")
+        self.update_status(f"✅ ASC MHL is available: {tool['version_text']}", success=True)
+        self.log.append(f"✅ ASC MHL is available: {tool['version_text']}")
+        self.check_for_ascmhl_updates(installed_version=tool["version"])
 
     def install_or_update_ascmhl(self, upgrade=False):
         try:
@@ -398,6 +1702,7 @@ SOFTWARE.""")
                 QMessageBox.information(self, "Manual ASC MHL Install/Update", msg)
             else:
                 self.log.append("ℹ️ Please run this command manually: " + command)
+            import webbrowser
             webbrowser.open("https://pypi.org/project/ascmhl/")
             self.log.append(f"ℹ️ User prompted to run: {command}")
             self.update_status("ℹ️ Please install/update ASC MHL manually. Command copied to clipboard.", success="caution")
@@ -407,20 +1712,10 @@ SOFTWARE.""")
 
     def check_for_ascmhl_updates(self, installed_version=None):
         try:
-            import pkg_resources
-            import urllib.request
-            import json as _json
             if installed_version is None:
-                try:
-                    installed_version = pkg_resources.get_distribution('ascmhl').version
-                except Exception:
-                    installed_version = None
-            try:
-                with urllib.request.urlopen('https://pypi.org/pypi/ascmhl/json') as response:
-                    data = _json.load(response)
-                    latest_version = data['info']['version']
-            except Exception:
-                latest_version = None
+                installed_version = ascmhl_tools.installed_version()
+            # Cached for a day, and for a while after failing, so offline launches do not wait on PyPI
+            latest_version = ascmhl_tools.latest_version()
             if not installed_version:
                 self.log.append("⚠️ Could not determine installed ASC MHL version. Is it installed?")
                 self.update_status("⚠️ Could not determine installed ASC MHL version. Is it installed?", success="caution")
@@ -441,13 +1736,14 @@ SOFTWARE.""")
 
     def is_ascmhl_available(self):
         try:
-            result = subprocess.run(["ascmhl", "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True)
-            version = result.stdout.strip()
-            self.mhl_version_label.setText(f"ASC MHL Version: {version}")
-            return result.returncode == 0
-        except (FileNotFoundError, subprocess.CalledProcessError):
+            tool = ascmhl_tools.find_ascmhl()
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            tool = None
+        if tool is None:
             self.mhl_version_label.setText("ASC MHL Version: Not Found")
             return False
+        self.mhl_version_label.setText(f"ASC MHL Version: {tool['version_text']}")
+        return True
 
     def update_status(self, message, success=None):
         if len(message) > 100:
@@ -470,137 +1766,352 @@ SOFTWARE.""")
     def select_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Media Folder")
         if folder:
-            self.media_folder = folder
-            self.folder_label.setText(folder)
+            self.set_media_folder(folder)
 
-    def run_ascmhl(self):
+    def compare_folder(self):
         if not self.media_folder:
             self.log.append("⚠️ Please select a media folder.")
             self.update_status("⚠️ Please select a media folder.", success="caution")
             return
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder or History to Compare With")
+        if folder:
+            self.run_ascmhl(compare_with=folder)
 
-        # Check if ascmhl is available before running
+    def write_report(self):
+        """Write the client report of the media folder's latest generation on a background worker."""
+        if not self.media_folder:
+            return
+        output_dir = QFileDialog.getExistingDirectory(self, "Select Report Folder")
+        if not output_dir:
+            return
         try:
-            result = subprocess.run(["ascmhl", "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True)
-        except Exception as e:
-            self.log.append("❌ ascmhl not found or not working. Please check installation and PATH.")
-            self.update_status("❌ ascmhl not found or not working. Please check installation and PATH.", success=False)
+            import ascmhl_report  # noqa: F401
+        except ImportError as e:
+            self.log.append(f"❌ lxml is needed to write reports: {str(e)}")
             return
+        self.abort_requested = False
+        self.log.append(f"\n📄 Reporting the latest generation of {self.media_folder}\n")
+        self.update_status("📄 Writing report...", success=None)
+        self.set_job_controls_enabled(False)
+        self.pause_btn.setEnabled(False)
 
-        hash_alg = self.hash_combo.currentText()
-        cmd = [
-            "ascmhl",
-            "create",
-            self.media_folder,
-            "--hash_format", hash_alg,
-            "-v"
-        ]
-
-        if self.detect_renaming_checkbox.isChecked():
-            cmd.append("--detect_renaming")
-        if self.no_directory_hashes_checkbox.isChecked():
-            cmd.append("--no_directory_hashes")
-
-        def get_safe_input(input_field):
-            return input_field.text().strip() if input_field.text().strip() else None
-
-        location = get_safe_input(self.location_input)
-        name = get_safe_input(self.name_input)
-        email = get_safe_input(self.email_input)
-        phone = get_safe_input(self.phone_input)
-        role = get_safe_input(self.role_input)
-
-        if location:
-            cmd.extend(["--location", location])
-        if name:
-            cmd.extend(["--author_name", name])
-        if email:
-            cmd.extend(["--author_email", email])
-        if phone:
-            cmd.extend(["--author_phone", phone])
-        if role:
-            cmd.extend(["--author_role", role])
-
-        self.log.append(f"\n🔧 Running: {' '.join(cmd)}\n")
-        self.update_status("🔧 Running MHL creation...", success=None)
-
-        self.exit_btn.setEnabled(False)
-        self.abort_btn.setEnabled(True)
-        self.run_btn.setEnabled(False)
-        self.info_tab.setDisabled(True)
-        self.detect_renaming_checkbox.setEnabled(False)
-        self.no_directory_hashes_checkbox.setEnabled(False)
-        self.hash_combo.setEnabled(False)
-        self.folder_btn.setEnabled(False)
+        def handle_finished(returncode):
+            self.set_job_controls_enabled(True)
+            if self.abort_requested:
+                self.update_status("⚠️ Report aborted.", success="caution")
+            elif returncode == 0:
+                self.log.append(f"📄 Report written to {output_dir}: open index.html, report.csv or summary.pdf")
+                self.update_status("✅ Report written.", success=True)
+            else:
+                self.update_status("❌ Report failed.", success=False)
+
+        self.worker_thread = ReportWorker(self.media_folder, output_dir)
+        self.worker_thread.output.connect(self.log.append)
+        self.worker_thread.finished.connect(handle_finished)
+        self.worker_thread.start()
+
+    def add_output_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Offload Destination")
+        if folder and folder not in self.output_folders:
+            self.output_folders.append(folder)
+            self.update_output_folders_label()
+
+    def clear_output_folders(self):
+        self.output_folders = []
+        self.update_output_folders_label()
+
+    def update_output_folders_label(self):
+        if self.output_folders:
+            self.offload_label.setText("; ".join(self.output_folders))
+            self.offload_label.setToolTip("\n".join(self.output_folders))
+        else:
+            self.offload_label.setText("No destination, hash in place.")
+            self.offload_label.setToolTip("")
+        self.apply_hash_policy()
+
+    def set_media_folder(self, folder):
+        self.media_folder = folder
+        self.folder_label.setText(folder)
+        self.resume_btn.setEnabled(self.run_btn.isEnabled() and ascmhl_journal.has_journal(folder))
+        self.report_btn.setEnabled(self.run_btn.isEnabled() and os.path.isdir(os.path.join(folder, "ascmhl")))
+        self.start_folder_scan(folder)
+        self.apply_hash_policy()
+
+    def start_folder_scan(self, folder):
+        """Count files and bytes in the background so a run can show real progress and ETA."""
+        self.cancel_folder_scan()
+        self.folder_scan = None
+        self.scan_label.setText("🔍 Scanning folder...")
+        self.scan_thread = ScanThread(folder, self)
+        self.scan_thread.counting.connect(
+            lambda files, size: self.scan_label.setText(
+                f"🔍 Scanning folder... {files:,} files, {ascmhl_scan.format_bytes(size)}"
+            )
+        )
+        self.scan_thread.scanned.connect(self.handle_folder_scanned)
+        self.scan_thread.start()
+
+    def cancel_folder_scan(self):
+        if self.scan_thread is not None and self.scan_thread.isRunning():
+            self.scan_thread.cancel()
+            self.scan_thread.counting.disconnect()
+            self.scan_thread.scanned.disconnect()
+            # Parented to the window, so it lives until it has actually stopped
+            self.scan_thread.finished.connect(self.scan_thread.deleteLater)
+
+    def handle_folder_scanned(self, scan):
+        if scan.root != self.media_folder:
+            return
+        self.folder_scan = scan
+        self.scan_label.setText(
+            f"📁 {scan.file_count:,} files, {ascmhl_scan.format_bytes(scan.total_bytes)} "
+            f"(scanned in {scan.duration:.1f}s)"
+            + (" · small-file tree, the Native Parallel engine has a path tuned for it" if scan.small_file_heavy else "")
+        )
+
+    def closeEvent(self, event):
+        self.cancel_folder_scan()
+        if self.scan_thread is not None:
+            self.scan_thread.wait(2000)
+        # Running jobs are killed rather than orphaned, their journals let them resume later
+        if self.watch_thread is not None:
+            self.watch_thread.stop()
+            self.watch_thread.wait(5000)
+        workers = [self.worker_thread, self.index_worker, self.benchmark_worker] + [runtime["worker"] for runtime in self.job_runtime.values()]
+        for worker in workers:
+            if worker is not None and worker.isRunning():
+                worker.finished.disconnect()
+                worker.terminate()
+                if isinstance(worker, QThread):
+                    worker.wait(5000)
+        super().closeEvent(event)
+
+    def current_job_settings(self):
+        """Snapshot of the Create and Info tab settings for one job."""
+        return ascmhl_jobs.default_settings(
+            hash_formats=self.selected_hash_formats(),
+            detect_renaming=self.detect_renaming_checkbox.isChecked(),
+            no_directory_hashes=self.no_directory_hashes_checkbox.isChecked(),
+            engine=self.engine_combo.currentText(),
+            backend=self.backend_combo.currentText(),
+            io_strategy=self.io_combo.currentData(),
+            workers=self.workers_spin.value(),
+            per_device=self.per_device_spin.value(),
+            destinations=list(self.output_folders),
+            verify_copies=self.verify_copies_checkbox.isChecked(),
+            hash_cache={"Force full rehash": "rehash", "Trust cache": "trust"}.get(self.hash_cache_combo.currentText(), "off"),
+            priority=self.priority_combo.currentData(),
+            bandwidth_limit=self.bandwidth_spin.value(),
+            identity=self.current_identity(),
+        )
+
+    def check_engine_available(self, settings):
+        """Returns an error message if the engine a job needs cannot run, else None."""
+        return ascmhl_run.check_engine_available(settings)
+
+    def make_worker(self, folder, settings, scan=None):
+        if (settings["backend"] == "QProcess" and settings["engine"] != "Native Parallel"
+                and not settings.get("destinations") and not settings.get("mode")):
+            journal = ascmhl_journal.ProgressJournal(folder, settings["hash_formats"])
+            recorder = ascmhl_telemetry.JobRecorder(folder, settings, scan)
+            throttle = ascmhl_throttle.JobThrottle.from_settings(settings)
+            return ProcessWorker(ascmhl_jobs.build_create_command(folder, settings), self, journal, recorder, throttle)
+        return EngineWorker(folder, settings, scan)
+
+    def run_ascmhl(self, resume=False, verify=False, compare_with=None):
+        if not self.media_folder:
+            self.log.append("⚠️ Please select a media folder.")
+            self.update_status("⚠️ Please select a media folder.", success="caution")
+            return
+
+        settings = self.current_job_settings()
+        if resume:
+            settings = ascmhl_jobs.resume_settings(settings)
+        if verify:
+            settings.update(mode="verify", destinations=[])
+        if compare_with:
+            settings.update(mode="compare", compare_with=compare_with, destinations=[],
+                            rehash=self.compare_rehash_checkbox.isChecked())
+        if self.folder_scan is not None and self.folder_scan.root == self.media_folder:
+            settings = ascmhl_jobs.small_file_settings(settings, self.folder_scan)
+        action = "Comparison" if compare_with else "MHL verification" if verify else "MHL creation"
+        error = self.check_engine_available(settings)
+        if error:
+            self.log.append(error)
+            self.update_status(error, success=False)
+            return
+
+        hash_alg = ", ".join(settings["hash_formats"])
+        self.abort_requested = False
+        if compare_with:
+            self.log.append(f"\n⚖️ Comparing {self.media_folder} with {compare_with}\n")
+        elif verify:
+            self.log.append(f"\n🔍 Verifying {self.media_folder} against its ASC MHL history\n")
+        elif settings.get("destinations"):
+            self.log.append(f"\n📦 Offloading {self.media_folder} to {', '.join(settings['destinations'])} ({hash_alg})\n")
+        elif resume:
+            self.log.append(f"\n⏯️ Resuming with the native engine: {self.media_folder} ({hash_alg})\n")
+            note = ascmhl_jobs.resume_engine_note(settings)
+            if note:
+                self.log.append(note)
+        elif settings["engine"] == "Native Parallel":
+            self.log.append(f"\n🔧 Running native engine: {self.media_folder} ({hash_alg})\n")
+        else:
+            cmd = ascmhl_jobs.build_create_command(self.media_folder, settings)
+            self.log.append(f"\n🔧 Running: {' '.join(cmd)}\n")
+        if settings.get("small_files"):
+            self.log.append("📁 Small-file tree: using the small-file path, progress is logged per folder")
+        self.update_status(f"🔧 Running {action}...", success=None)
+
+        self.set_job_controls_enabled(False)
         self.status_bar.setVisible(True)
         self.status_bar.setRange(0, 0)
 
+        # With a finished pre-scan, per-file output lines drive byte-accurate progress
+        tracker = None
+        if self.folder_scan is not None and self.folder_scan.root == self.media_folder and not compare_with:
+            tracker = ascmhl_scan.ProgressTracker(self.folder_scan, settings.get("small_files", False))
+            self.status_bar.setRange(0, 1000)
+            self.status_bar.setValue(0)
+            self.progress_timer = QTimer(self)
+            self.progress_timer.timeout.connect(lambda: self.update_tracked_progress(tracker))
+            self.progress_timer.start(250)
+
         def handle_output(line):
             self.log.append(line)
-            self.log.moveCursor(self.log.textCursor().End)
-            self.log.ensureCursorVisible()
-            QApplication.processEvents()
+            if tracker is not None:
+                tracker.feed(line)
 
         def handle_progress(percent):
+            if tracker is not None:
+                return
             self.status_bar.setRange(0, 100)
             self.status_bar.setValue(percent)
 
         def handle_finished(returncode):
+            if tracker is not None:
+                self.progress_timer.stop()
+                self.status_bar.resetFormat()
+                elapsed = time.perf_counter() - tracker.started
+                self.log.append(
+                    f"📊 {tracker.done_files:,} files, {ascmhl_scan.format_bytes(tracker.done_bytes)} in "
+                    f"{ascmhl_scan.format_duration(elapsed)} "
+                    f"({ascmhl_scan.format_bytes(tracker.done_bytes / elapsed if elapsed else 0)}/s)"
+                )
+            self.full_log_path = self.worker_thread.tail.spill_path
+            self.open_full_log_btn.setEnabled(self.full_log_path is not None)
             self.status_bar.setRange(0, 0)
             self.status_bar.setVisible(False)
-            if returncode == 0:
-                self.log.append("✅ MHL creation complete.")
-                self.update_status("✅ MHL creation complete.", success=True)
+            if self.abort_requested:
+                self.log.append(f"⚠️ {action} aborted.")
+                if not verify and not compare_with and ascmhl_journal.has_journal(self.media_folder):
+                    self.log.append("⏯️ Completed files are journaled, click Resume to continue.")
+                self.update_status(f"⚠️ {action} aborted.", success="caution")
+            elif returncode == 0:
+                self.log.append(f"✅ {action} complete.")
+                self.update_status(f"✅ {action} complete.", success=True)
             elif returncode == -1:
-                self.log.append("❌ Error occurred during MHL creation. See log above for details.")
-                self.update_status("❌ Error occurred during MHL creation.", success=False)
+                self.log.append(f"❌ Error occurred during {action}. See log above for details.")
+                self.update_status(f"❌ Error occurred during {action}.", success=False)
             else:
-                self.log.append(f"❌ MHL creation failed with exit code {returncode}. See log above for details.")
-                self.update_status(f"❌ MHL creation failed (exit code {returncode}).", success=False)
+                self.log.append(f"❌ {action} failed with exit code {returncode}. See log above for details.")
+                self.update_status(f"❌ {action} failed (exit code {returncode}).", success=False)
 
-            self.exit_btn.setEnabled(True)
-            self.abort_btn.setEnabled(False)
-            self.run_btn.setEnabled(True)
-            self.info_tab.setDisabled(False)
-            self.detect_renaming_checkbox.setEnabled(True)
-            self.no_directory_hashes_checkbox.setEnabled(True)
-            self.hash_combo.setEnabled(True)
-            self.folder_btn.setEnabled(True)
-
-            args_used = "<b>Arguments Used:</b><br>"
-            args_used += f"<span style='color: blue;'>Media Folder:</span> {self.media_folder}<br>"
-            args_used += f"<span style='color: green;'>Hash Algorithm:</span> {hash_alg}<br>"
-            if self.detect_renaming_checkbox.isChecked():
-                args_used += "<span style='color: orange;'>Detect Renaming:</span> Enabled<br>"
-            if self.no_directory_hashes_checkbox.isChecked():
-                args_used += "<span style='color: orange;'>Skip Directory Hashes:</span> Enabled<br>"
-            if location:
-                args_used += f"<span style='color: purple;'>Location:</span> {location}<br>"
-            if name:
-                args_used += f"<span style='color: purple;'>Name:</span> {name}<br>"
-            if email:
-                args_used += f"<span style='color: purple;'>Email:</span> {email}<br>"
-            if phone:
-                args_used += f"<span style='color: purple;'>Phone:</span> {phone}<br>"
-            if role:
-                args_used += f"<span style='color: purple;'>Role:</span> {role}<br>"
-
-            self.log.append(args_used)
-
-        self.worker_thread = WorkerThread(cmd)
+            self.set_job_controls_enabled(True)
+            self.log.append(self.arguments_used_html(self.media_folder, settings))
+            self.refresh_job_history()
+
+        scan = self.folder_scan if self.folder_scan is not None and self.folder_scan.root == self.media_folder else None
+        self.worker_thread = self.make_worker(self.media_folder, settings, scan)
         self.worker_thread.output.connect(handle_output)
         self.worker_thread.finished.connect(handle_finished)
         self.worker_thread.progress.connect(handle_progress)
         self.worker_thread.start()
 
+    def arguments_used_html(self, folder, settings):
+        identity = settings["identity"]
+        args_used = "<b>Arguments Used:</b><br>"
+        args_used += f"<span style='color: blue;'>Media Folder:</span> {folder}<br>"
+        if settings.get("mode") == "verify":
+            args_used += "<span style='color: green;'>Mode:</span> Verify<br>"
+        if settings.get("mode") == "compare":
+            args_used += "<span style='color: green;'>Mode:</span> Compare<br>"
+            args_used += f"<span style='color: blue;'>Compared With:</span> {settings['compare_with']}<br>"
+        args_used += f"<span style='color: green;'>Hash Algorithm:</span> {', '.join(settings['hash_formats'])}<br>"
+        args_used += f"<span style='color: green;'>Engine:</span> {settings['engine']}<br>"
+        if settings.get("destinations"):
+            verify = " (verified)" if settings.get("verify_copies") else ""
+            args_used += f"<span style='color: green;'>Offloaded To:</span> {', '.join(settings['destinations'])}{verify}<br>"
+        if settings["engine"] == "Native Parallel" and settings.get("io_strategy", "auto") != "auto":
+            args_used += f"<span style='color: green;'>Reads:</span> {settings['io_strategy']}<br>"
+        if settings.get("small_files"):
+            args_used += "<span style='color: green;'>Small-File Path:</span> Enabled<br>"
+        if settings["engine"] == "Native Parallel" and settings.get("hash_cache", "off") != "off":
+            args_used += f"<span style='color: green;'>Hash Cache:</span> {settings['hash_cache']}<br>"
+        if settings.get("priority", "normal") != "normal":
+            args_used += f"<span style='color: green;'>Priority:</span> {settings['priority']}<br>"
+        if settings.get("bandwidth_limit"):
+            args_used += f"<span style='color: green;'>Max Read:</span> {settings['bandwidth_limit']} MB/s<br>"
+        if settings["detect_renaming"]:
+            args_used += "<span style='color: orange;'>Detect Renaming:</span> Enabled<br>"
+        if settings["no_directory_hashes"]:
+            args_used += "<span style='color: orange;'>Skip Directory Hashes:</span> Enabled<br>"
+        if identity["location"]:
+            args_used += f"<span style='color: purple;'>Location:</span> {identity['location']}<br>"
+        if identity["name"]:
+            args_used += f"<span style='color: purple;'>Name:</span> {identity['name']}<br>"
+        if identity["email"]:
+            args_used += f"<span style='color: purple;'>Email:</span> {identity['email']}<br>"
+        if identity["phone"]:
+            args_used += f"<span style='color: purple;'>Phone:</span> {identity['phone']}<br>"
+        if identity["role"]:
+            args_used += f"<span style='color: purple;'>Role:</span> {identity['role']}<br>"
+        return args_used
+
+    def update_tracked_progress(self, tracker):
+        rate = tracker.rate()
+        eta = tracker.eta(rate)
+        self.status_bar.setValue(int(tracker.fraction() * 1000))
+        eta_text = ascmhl_scan.format_duration(eta) if eta is not None else "--:--:--"
+        self.status_bar.setFormat(f"%p%  ·  {ascmhl_scan.format_bytes(rate)}/s  ·  ETA {eta_text}")
+
     def abort_ascmhl(self):
         if self.worker_thread and self.worker_thread.isRunning():
+            # The worker reports back through handle_finished once ascmhl is gone
+            self.abort_requested = True
             self.worker_thread.terminate()
-            self.log.append("⚠️ MHL creation aborted.")
-            self.update_status("⚠️ MHL creation aborted.", success="caution")
+            self.log.append("⚠️ Aborting...")
+            self.update_status("⚠️ Aborting...", success="caution")
             self.abort_btn.setEnabled(False)
-            self.exit_btn.setEnabled(True)
-            self.status_bar.setVisible(False)
+            self.pause_btn.setEnabled(False)
+
+    def toggle_pause(self):
+        if not (self.worker_thread and self.worker_thread.isRunning()):
+            return
+        throttle = self.worker_thread.throttle
+        if throttle.paused:
+            throttle.resume()
+            self.pause_btn.setText("Pause")
+            self.log.append("▶️ Resumed.")
+            self.update_status("▶️ Resumed.", success=None)
+        else:
+            throttle.pause()
+            self.pause_btn.setText("Resume")
+            self.log.append("⏸️ Paused, no files are read until resumed.")
+            self.update_status("⏸️ Paused.", success="caution")
+
+    def apply_throttle_settings(self):
+        """Apply the Create tab's priority and read cap to the running job."""
+        if not (self.worker_thread and self.worker_thread.isRunning()):
+            return
+        throttle = self.worker_thread.throttle
+        priority, limit = self.priority_combo.currentData(), self.bandwidth_spin.value()
+        if priority != throttle.priority:
+            warning = throttle.set_priority(priority)
+            self.log.append(warning or f"🎚️ Priority: {priority}")
+        if limit != throttle.limit_mb_s:
+            throttle.set_limit(limit)
+            self.log.append(f"🎚️ Max read: {limit} MB/s" if limit else "🎚️ Max read: unlimited")
 
     def update_no_directory_hashes_label(self):
         if self.no_directory_hashes_checkbox.isChecked():
@@ -611,21 +2122,7 @@ SOFTWARE.""")
     def export_user_data(self):
         file_path, _ = QFileDialog.getSaveFileName(self, "Export User Data", "identity.xml", "XML Files (*.xml)")
         if file_path:
-            user_data = {
-                'location': self.location_input.text(),
-                'name': self.name_input.text(),
-                'email': self.email_input.text(),
-                'phone': self.phone_input.text(),
-                'role': self.role_input.text()
-            }
-            with open(file_path, 'w') as file:
-                file.write("<userdata>\n")
-                file.write("    <user>\n")
-                for key, value in user_data.items():
-                    file.write(f"        <{key}>{value}</{key}>\n")
-                file.write("    </user>\n")
-                file.write("</userdata>\n")
-            user_data = None
+            ascmhl_jobs.write_identity(file_path, self.current_identity())
             self.clear_info_fields()
             self.feedback_label.setText("✅ User data exported successfully.")
 
@@ -633,16 +2130,7 @@ SOFTWARE.""")
         file_path, _ = QFileDialog.getOpenFileName(self, "Import User Data", "", "XML Files (*.xml)")
         if file_path:
             try:
-                from xml.etree import ElementTree as ET
-                tree = ET.parse(file_path)
-                root = tree.getroot()
-                user = root.find('user')
-                self.location_input.setText(user.find('location').text if user.find('location') is not None else "")
-                self.name_input.setText(user.find('name').text if user.find('name') is not None else "")
-                self.email_input.setText(user.find('email').text if user.find('email') is not None else "")
-                self.phone_input.setText(user.find('phone').text if user.find('phone') is not None else "")
-                self.role_input.setText(user.find('role').text if user.find('role') is not None else "")
-                tree = None
+                self.set_identity(ascmhl_jobs.read_identity(file_path))
                 self.feedback_label.setText("✅ User data imported successfully.")
             except Exception as e:
                 self.feedback_label.setStyleSheet("color: red;")
@@ -653,9 +2141,8 @@ SOFTWARE.""")
             self.log.append("🔄 Updating ASC MHL...")
             self.update_status("🔄 Updating ASC MHL...", success=None)
             self.install_or_update_ascmhl(upgrade=True)
-            result = subprocess.run(["ascmhl", "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True)
-            version = result.stdout.strip()
-            self.mhl_version_label.setText(f"ASC MHL Version: {version}")
+            tool = ascmhl_tools.find_ascmhl(refresh=True)
+            self.mhl_version_label.setText(f"ASC MHL Version: {tool['version_text'] if tool else 'Not Found'}")
             self.update_ascmhl_btn.setVisible(False)
         except Exception as e:
             self.log.append(f"❌ Failed to update ASC MHL: {str(e)}")
@@ -671,10 +2158,30 @@ SOFTWARE.""")
                 "Author: Krystian<br><br>"
                 "<b>Usage:</b><br>"
                 "- Select or drag & drop a media folder.<br>"
-                "- Choose hash algorithm and options.<br>"
+                "- Choose hash algorithm, optional extra algorithms and options.<br>"
                 "- Fill in Info tab if needed.<br>"
                 "- Click 'Create MHL Generation' to start.<br>"
                 "- Progress will be shown below.<br><br>"
+                "Drop several folders to queue them; the Queue tab runs jobs on different drives in parallel.<br><br>"
+                "Watch folders on the Queue tab queue every new volume or finished offload once it stops changing, "
+                "with the settings of a saved preset.<br><br>"
+                "Add offload destinations to copy the folder to several drives in one read; each copy gets its own ASC MHL history.<br><br>"
+                "Verify re-hashes the files of the latest generation and lists mismatches and missing files.<br><br>"
+                "Compare... lists the files missing, extra, renamed or different in another folder or ASC MHL history; "
+                "histories are compared by their recorded hashes without reading the media, unless 'Re-read' is checked.<br><br>"
+                "Report... writes a client report of the latest generation: every file's path, size, dates and hashes "
+                "as paginated HTML and CSV, plus a PDF summary.<br><br>"
+                "The Index tab collects the ASC MHL histories of many drives in one database and finds files by hash, name or path.<br><br>"
+                "An aborted or interrupted job can be continued with Resume; files already hashed are not read again.<br><br>"
+                "Pause stops a running job from reading the disk. Priority 'Background' and 'Max read' let a job run next to "
+                "a live offload; both can be changed while the job runs.<br><br>"
+                "Image sequences and other folders of many small files are detected by the folder scan; "
+                "the native engine then uses a small-file path and logs progress per folder.<br><br>"
+                "The native engine builds directory hashes while files are hashed and only recomputes folders "
+                "above changed files, so there is little reason to skip them.<br><br>"
+                "With the native engine, 'Trust cache' skips re-reading files unchanged since they were last hashed.<br><br>"
+                "Benchmark measures how fast this machine hashes each algorithm and how fast the media folder's drive reads; "
+                "'Pick Algorithm' then selects the fastest one a policy allows. Each job logs whether it was CPU-bound or I/O-bound.<br><br>"
                 "You can import/export user info as XML or JSON.<br><br>"
                 "For more info, visit: <a href='https://pypi.org/project/ascmhl/'>ASC MHL PyPI</a>"
             )
@@ -0,0 +1,203 @@
+import json
+import os
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ascmhl_io
+import ascmhl_jobs
+import ascmhl_scan
+
+# --- HASH ALGORITHM BENCHMARK ---
+# Measures how fast this machine hashes each format in memory, and how fast the media folder's
+# device can be read with the page cache bypassed. A job can go no faster than the slower of the
+# two, so on a network share or a card reader every format is equally fast and the choice can
+# follow other concerns, while on NVMe the fastest hash wins. Results are cached per machine
+# (and ascmhl version) and per physical device.
+BENCH_FORMATS = ["md5", "sha1", "sha256", "xxh64", "xxh3", "c4"]  # those the Create tab offers
+HASH_BENCH_BUFFER = 8 * 1024 * 1024  # bytes per update() call
+HASH_BENCH_SECONDS = 0.5  # per format
+READ_BENCH_BYTES = 512 * 1024 * 1024  # read from the media folder at most
+READ_BENCH_SECONDS = 3.0
+MACHINE_RESULTS_TTL = 30 * 24 * 3600  # seconds; hardware and ascmhl rarely change
+DEVICE_RESULTS_TTL = 7 * 24 * 3600
+SAME_SPEED = 0.9  # formats within 10% of the fastest count as equally fast
+CPU_BOUND_UTILISATION = 0.75  # share of the usable cores busy hashing above which a job is CPU-bound
+
+# Which formats each policy may pick, in order of preference for equal speeds
+POLICIES = {
+    "fastest": ["xxh3", "xxh64", "sha1", "md5", "sha256", "c4"],
+    "mhl-v1": ["xxh64", "sha1", "md5"],  # also readable by MHL v1 tools
+    "collision-resistant": ["sha256", "c4"],
+}
+POLICY_LABELS = {
+    "fastest": "Fastest",
+    "mhl-v1": "Fastest MHL v1 compatible",
+    "collision-resistant": "Fastest collision-resistant",
+}
+
+
+def machine_key():
+    """This machine and the installed ascmhl, whose hash implementations are measured."""
+    try:
+        from importlib.metadata import version
+        ascmhl_version = version("ascmhl")
+    except Exception:
+        ascmhl_version = "unknown"
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()}|ascmhl {ascmhl_version}"
+
+
+def results_file():
+    return os.path.join(ascmhl_jobs.app_data_dir(), "hash_benchmark.json")
+
+
+def load_results(path=None):
+    try:
+        with open(path or results_file(), "r", encoding="utf-8") as file:
+            results = json.load(file)
+    except (OSError, ValueError):
+        results = {}
+    results.setdefault("machines", {})
+    results.setdefault("devices", {})
+    return results
+
+
+def save_results(results, path=None):
+    path = path or results_file()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4)
+    os.replace(tmp_path, path)
+
+
+def cached_hash_rates(results=None):
+    """{hash_format: bytes/s on one core} measured on this machine, None if missing or stale."""
+    entry = (results or load_results())["machines"].get(machine_key())
+    if entry is None or time.time() - entry["measured"] > MACHINE_RESULTS_TTL:
+        return None
+    return entry["hash"]
+
+
+def cached_read_rate(folder, results=None):
+    """Bytes/s read from the device holding folder, None if missing or stale."""
+    entry = (results or load_results())["devices"].get(ascmhl_jobs.device_key(folder))
+    if entry is None or time.time() - entry["measured"] > DEVICE_RESULTS_TTL:
+        return None
+    return entry["read"]
+
+
+def measure_hash_rate(hash_format, seconds=HASH_BENCH_SECONDS):
+    """Bytes/s one thread hashes hash_format from memory with ascmhl's own hasher."""
+    from ascmhl.hasher import new_hasher_for_hash_type
+    buffer = os.urandom(HASH_BENCH_BUFFER)
+    hasher = new_hasher_for_hash_type(hash_format)
+    hasher.update(buffer)  # warm up
+    hashed = 0
+    started = time.perf_counter()
+    while True:
+        hasher.update(buffer)
+        hashed += len(buffer)
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return hashed / elapsed
+
+
+def measure_read_rate(folder, threads=4, cancel=None, max_bytes=READ_BENCH_BYTES, seconds=READ_BENCH_SECONDS):
+    """Bytes/s read from the files of folder with the page cache bypassed, None without files."""
+    cancel = cancel or threading.Event()
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    total = [0]
+    paths = iter(os.path.join(folder, relative) for relative, stat in ascmhl_scan.iter_files(folder, cancel)
+                 if stat.st_size > 0)
+
+    def consume(chunk):
+        with lock:
+            total[0] += len(chunk)
+
+    def reader():
+        while time.perf_counter() < deadline and total[0] < max_bytes and not cancel.is_set():
+            with lock:
+                path = next(paths, None)
+            if path is None:
+                return
+            try:
+                ascmhl_io.read_file(path, consume, strategy="direct")
+            except OSError:
+                pass
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads, thread_name_prefix="ascmhl-bench") as pool:
+        for _ in range(threads):
+            pool.submit(reader)
+    elapsed = time.perf_counter() - started
+    return total[0] / elapsed if total[0] and elapsed else None
+
+
+def run_benchmark(folder=None, output=print, cancel=None, measure_hashes=True):
+    """Measure every supported format and, with folder, its device. Stores and returns the results."""
+    cancel = cancel or threading.Event()
+    results = load_results()
+    if measure_hashes:
+        from ascmhl.__version__ import ascmhl_supported_hashformats
+        rates = {}
+        for hash_format in BENCH_FORMATS:
+            if cancel.is_set():
+                return results
+            if hash_format not in ascmhl_supported_hashformats:
+                output(f"  {hash_format:7} not supported by the installed ascmhl")
+                continue
+            rates[hash_format] = measure_hash_rate(hash_format)
+            output(f"  {hash_format:7} {ascmhl_scan.format_bytes(rates[hash_format])}/s per core")
+        results["machines"][machine_key()] = {"measured": time.time(), "hash": rates}
+    if folder:
+        output(f"  reading {folder} with the page cache bypassed...")
+        read_rate = measure_read_rate(folder, cancel=cancel)
+        if cancel.is_set():
+            return results
+        if read_rate is None:
+            output("  no files to read, read speed not measured")
+        else:
+            output(f"  device read: {ascmhl_scan.format_bytes(read_rate)}/s")
+            results["devices"][ascmhl_jobs.device_key(folder)] = {
+                "measured": time.time(), "read": read_rate, "folder": os.path.abspath(folder)
+            }
+    save_results(results)
+    return results
+
+
+def usable_cores(settings):
+    """Files hashed at the same time by a job: one for ascmhl create, the workers of the native engine."""
+    if settings["engine"] != "Native Parallel" and not settings.get("destinations") and not settings.get("mode"):
+        return 1
+    workers = settings.get("workers") or min(32, (os.cpu_count() or 1) + 4)
+    return max(1, min(workers, os.cpu_count() or 1))
+
+
+def recommend(hash_rates, read_rate, policy="fastest", current=None, cores=1):
+    """(hash_format, explanation) of the fastest format the policy allows, None if it allows none measured.
+
+    A job runs at the slower of cores x hash rate and the device read rate. Formats within
+    SAME_SPEED of the fastest are equally good, then the current format is kept.
+    """
+    allowed = [f for f in POLICIES[policy] if f in hash_rates]
+    if not allowed:
+        return None
+    effective = {f: min(hash_rates[f] * cores, read_rate or float("inf")) for f in allowed}
+    best = max(effective.values())
+    equal = [f for f in allowed if effective[f] >= best * SAME_SPEED]
+    choice = current if current in equal else equal[0]
+    speed = ascmhl_scan.format_bytes(effective[choice])
+    if read_rate is not None and hash_rates[choice] * cores >= read_rate:
+        others = ", ".join(f for f in equal if f != choice)
+        return choice, f"{choice}: I/O-bound at {speed}/s" + (f", {others} as fast" if others else "")
+    return choice, f"{choice}: CPU-bound at {speed}/s on {cores} core{'s' if cores > 1 else ''}"
+
+
+def classify_job(cpu_seconds, wall_seconds, cores):
+    """("CPU-bound" or "I/O-bound", share of the usable cores that were busy)."""
+    if wall_seconds <= 0:
+        return "I/O-bound", 0.0
+    utilisation = cpu_seconds / (wall_seconds * max(1, cores))
+    return ("CPU-bound" if utilisation >= CPU_BOUND_UTILISATION else "I/O-bound"), utilisation
@@ -0,0 +1,247 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from lxml import etree
+
+import ascmhl_jobs
+
+# --- HISTORY INDEX ---
+# Generation files of every indexed volume are streamed with iterparse into one SQLite database,
+# so "which drive holds a clip with this hash?" is an indexed lookup instead of parsing XML.
+# Generation files never change once written: a file already in the index with the same size
+# and modification time is skipped, so re-indexing a volume only reads its new generations.
+MHL_NAMESPACE = "{urn:ASC:MHL:v2.0}"
+HASH_FORMATS = {"md5", "sha1", "sha256", "xxh32", "xxh64", "xxh3", "xxh128", "c4"}
+INSERT_BATCH = 5000  # file rows per executemany
+SEARCH_LIMIT = 500
+HASH_QUERY_RE = re.compile(r'^(?:[0-9a-fA-F]{8,128}|c4[1-9A-HJ-NP-Za-km-z]{88})$')
+
+
+def default_index_path():
+    return os.path.join(ascmhl_jobs.app_data_dir(), "history_index.sqlite")
+
+
+def volume_label(path):
+    """The name of the volume holding path: the last component of its mount point, else of path itself."""
+    mount = os.path.abspath(path)
+    while not os.path.ismount(mount):
+        mount = os.path.dirname(mount)
+    return os.path.basename(mount.rstrip(os.sep)) or os.path.basename(os.path.abspath(path).rstrip(os.sep)) or mount
+
+
+def generation_files(root, cancel=None):
+    """(history root, generation file) for every ascmhl folder below root, nested histories included."""
+    for folder, directories, files in os.walk(root):
+        if cancel is not None and cancel.is_set():
+            return
+        if os.path.basename(folder) == "ascmhl":
+            directories.clear()
+            history = os.path.dirname(folder)
+            for name in sorted(files):
+                if name.endswith(".mhl"):
+                    yield history, os.path.join(folder, name)
+        directories.sort()
+
+
+def iter_generation(file):
+    """Stream the file entries of one generation file as (path, size, [(algorithm, digest, action)]).
+
+    Only the elements of one <hash> are held in memory at a time. The creation date is
+    yielded first as (None, None, creationdate text).
+    """
+    for _, element in etree.iterparse(file, events=("end",), tag=(MHL_NAMESPACE + "hash",
+                                                                 MHL_NAMESPACE + "creationdate")):
+        if element.tag == MHL_NAMESPACE + "creationdate":
+            yield None, None, element.text
+            continue
+        path, size = None, None
+        hashes = []
+        for child in element:
+            tag = etree.QName(child).localname
+            if tag == "path":
+                path, size = child.text, child.get("size")
+            elif tag in HASH_FORMATS:
+                hashes.append((tag, (child.text or "").strip(), child.get("action")))
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+        if path is not None:
+            yield path, int(size) if size else None, hashes
+
+
+class IndexCancelled(Exception):
+    pass
+
+
+class HistoryIndex:
+    """SQLite index of (volume, generation, path, size, hash, algorithm) over ascmhl histories.
+
+    Writes come from one indexing thread at a time, searches may run on any thread.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_index_path()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS generations ("
+            " id INTEGER PRIMARY KEY, volume TEXT, history TEXT, file TEXT UNIQUE, sequence INTEGER,"
+            " created TEXT, size INTEGER, mtime_ns INTEGER, file_count INTEGER);"
+            "CREATE TABLE IF NOT EXISTS files ("
+            " generation INTEGER, path TEXT, name TEXT COLLATE NOCASE, size INTEGER,"
+            " algorithm TEXT, hash TEXT, action TEXT);"
+            "CREATE INDEX IF NOT EXISTS files_hash ON files (hash);"
+            "CREATE INDEX IF NOT EXISTS files_name ON files (name);"
+            # NOCASE like LIKE itself, so a path prefix is a range search on this index
+            "CREATE INDEX IF NOT EXISTS files_path ON files (path COLLATE NOCASE);"
+            "CREATE INDEX IF NOT EXISTS files_generation ON files (generation);"
+        )
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # -- indexing --
+    def _indexed(self, file, stat):
+        row = self._db.execute("SELECT id, size, mtime_ns FROM generations WHERE file=?", (file,)).fetchone()
+        if row is None:
+            return False
+        if row[1:] == (stat.st_size, stat.st_mtime_ns):
+            return True
+        # A rewritten generation file (a restored backup, a flattened manifest) is indexed again
+        self._db.execute("DELETE FROM files WHERE generation=?", (row[0],))
+        self._db.execute("DELETE FROM generations WHERE id=?", (row[0],))
+        return False
+
+    def add_generation(self, volume, history, file, cancel=None):
+        """Stream one generation file into the index. Returns the number of files, None if already indexed."""
+        stat = os.stat(file)
+        with self._lock:
+            if self._indexed(file, stat):
+                return None
+            name = os.path.basename(file)
+            sequence = int(name.split("_", 1)[0]) if name.split("_", 1)[0].isdigit() else None
+            cursor = self._db.execute(
+                "INSERT INTO generations (volume, history, file, sequence, size, mtime_ns) VALUES (?, ?, ?, ?, ?, ?)",
+                (volume, history, file, sequence, stat.st_size, stat.st_mtime_ns),
+            )
+            generation = cursor.lastrowid
+            created = None
+            rows = []
+            files = 0
+            try:
+                for path, size, hashes in iter_generation(file):
+                    if path is None:
+                        created = hashes
+                        continue
+                    files += 1
+                    rows.extend((generation, path, path.rsplit("/", 1)[-1], size, algorithm, digest, action)
+                                for algorithm, digest, action in hashes)
+                    if len(rows) >= INSERT_BATCH:
+                        if cancel is not None and cancel.is_set():
+                            raise IndexCancelled()
+                        self._insert(rows)
+                        rows = []
+                self._insert(rows)
+                self._db.execute("UPDATE generations SET created=?, file_count=? WHERE id=?", (created, files, generation))
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+        return files
+
+    def _insert(self, rows):
+        self._db.executemany(
+            "INSERT INTO files (generation, path, name, size, algorithm, hash, action) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+        )
+
+    # -- lookups --
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Files whose hash equals query, or whose name starts with it, or whose path starts with it (with a "/").
+
+        Returns rows of (volume, history, sequence, created, path, size, algorithm, hash, action),
+        newest generations first.
+        """
+        query = query.strip()
+        if not query:
+            return []
+        conditions, arguments = [], []
+        if HASH_QUERY_RE.match(query):
+            conditions.append("f.hash = ?")
+            arguments.append(query if query.startswith("c4") else query.lower())
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        if "/" in query:
+            conditions.append("f.path LIKE ? ESCAPE '\\'")  # a prefix match on the indexed path column
+            arguments.append(f"{escaped.lstrip('/')}%")
+        else:
+            conditions.append("f.name LIKE ? ESCAPE '\\'")  # a prefix match on the indexed name column
+            arguments.append(f"{escaped}%")
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT g.volume, g.history, g.sequence, g.created, f.path, f.size, f.algorithm, f.hash, f.action"
+                " FROM files f JOIN generations g ON g.id = f.generation"
+                f" WHERE {' OR '.join(conditions)} LIMIT ?",
+                arguments + [limit],
+            ).fetchall()
+        # Sorted after the LIMIT, so a short name prefix never sorts millions of rows
+        return sorted(rows, key=lambda row: row[3] or "", reverse=True)
+
+    def summary(self):
+        """(volumes, generations, file rows) in the index."""
+        with self._lock:
+            volumes, generations = self._db.execute("SELECT COUNT(DISTINCT volume), COUNT(*) FROM generations").fetchone()
+            rows = self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        return volumes, generations, rows
+
+
+def index_folder(root, volume=None, output=print, cancel=None, index=None):
+    """Add the generations of every ascmhl history below root that are not indexed yet.
+
+    volume defaults to volume_label(root). Returns an exit code: 0, -1 when cancelled,
+    30 when no ascmhl history was found.
+    """
+    cancel = cancel or threading.Event()
+    volume = volume or volume_label(root)
+    own_index = index is None
+    index = index or HistoryIndex()
+    started = time.perf_counter()
+    added = skipped = files = 0
+    found = False
+    output(f"📇 Indexing {root} as volume '{volume}'")
+    try:
+        for history, file in generation_files(root, cancel):
+            found = True
+            if cancel.is_set():
+                break
+            try:
+                count = index.add_generation(volume, history, file, cancel)
+            except IndexCancelled:
+                break
+            except (OSError, etree.XMLSyntaxError) as e:
+                output(f"⚠️ Could not index {file}: {str(e)}")
+                continue
+            if count is None:
+                skipped += 1
+                continue
+            added += 1
+            files += count
+            output(f"  indexed {os.path.relpath(file, root)}: {count} files")
+    finally:
+        if own_index:
+            index.close()
+    elapsed = time.perf_counter() - started
+    output(f"📇 Indexed {added} new generations, {files} files in {elapsed:.1f}s "
+           f"({files / elapsed if elapsed else 0:.0f} files/s), {skipped} generations were already indexed")
+    if cancel.is_set():
+        output("⚠️ Indexing cancelled.")
+        return -1
+    if not found:
+        output(f"❌ No ascmhl history found in {root}")
+        return 30
+    return 0
@@ -0,0 +1,218 @@
+import mmap
+import os
+import sys
+import threading
+
+# --- ADAPTIVE FILE READING ---
+# How the in-process paths read file content. "auto" picks per file from its size and file system:
+# small files in one read, mid-sized files on fixed local disks memory-mapped, large, network and
+# removable-device files with large aligned reads plus sequential/drop-behind hints. A mapped file
+# whose card is pulled or fails to read raises SIGBUS and kills the whole process, so only disks
+# known to be fixed are mapped. Hashing reads every byte once, so the pages it
+# has read are dropped again (posix_fadvise DONTNEED) instead of pushing other applications' data
+# out of the page cache.
+STRATEGIES = ["auto", "buffered", "fadvise", "mmap", "direct"]
+SMALL_FILE_SIZE = 1024 * 1024  # read in a single call
+MMAP_MAX_SIZE = 64 * 1024 * 1024  # larger local files use fadvise reads, not a mapping
+LARGE_BUFFER_SIZE = 4 * 1024 * 1024  # bytes per read for large files
+DROP_BEHIND_SIZE = 32 * 1024 * 1024  # bytes hashed between DONTNEED hints
+ALIGNMENT = 4096  # O_DIRECT needs page-aligned buffers, offsets and sizes
+NETWORK_FILE_SYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "afpfs", "fuse.sshfs", "9p", "ceph", "glusterfs"}
+
+_buffers = threading.local()
+_file_systems = {}
+_fixed_devices = {}
+
+
+def aligned_buffer(size):
+    """A page-aligned buffer of at least size bytes, reused per thread."""
+    size = (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+    cached = getattr(_buffers, "by_size", None)
+    if cached is None:
+        cached = _buffers.by_size = {}
+    buffer = cached.get(size)
+    if buffer is None:
+        # Anonymous mappings start on a page boundary
+        buffer = cached[size] = mmap.mmap(-1, size)
+    return buffer
+
+
+def file_system_type(stat):
+    """File system type of the volume holding a file (Linux only, "" elsewhere). Cached per device."""
+    fs_type = _file_systems.get(stat.st_dev)
+    if fs_type is None:
+        fs_type = ""
+        if sys.platform.startswith("linux"):
+            device = f"{os.major(stat.st_dev)}:{os.minor(stat.st_dev)}"
+            try:
+                with open("/proc/self/mountinfo", "r", encoding="utf-8") as file:
+                    for line in file:
+                        fields = line.split()
+                        if fields[2] == device and " - " in line:
+                            fs_type = line.split(" - ", 1)[1].split()[0]
+                            break
+            except OSError:
+                pass
+        _file_systems[stat.st_dev] = fs_type
+    return fs_type
+
+
+def is_fixed_device(stat):
+    """True when the disk holding a file is known not to be removable (Linux only). Cached per device.
+
+    Unknown devices count as removable: the disk's /sys/block "removable" flag must be 0 and it
+    must not hang off a USB bus, where card readers and USB drives often report 0 as well.
+    """
+    fixed = _fixed_devices.get(stat.st_dev)
+    if fixed is None:
+        fixed = False
+        if sys.platform.startswith("linux"):
+            device = os.path.realpath(f"/sys/dev/block/{os.major(stat.st_dev)}:{os.minor(stat.st_dev)}")
+            if os.path.exists(os.path.join(device, "partition")):
+                device = os.path.dirname(device)
+            try:
+                with open(os.path.join(device, "removable"), "r", encoding="ascii") as file:
+                    fixed = file.read().strip() == "0" and "/usb" not in device
+            except OSError:
+                pass
+        _fixed_devices[stat.st_dev] = fixed
+    return fixed
+
+
+def choose_strategy(stat, requested="auto"):
+    """The strategy used for one file. Explicit requests fall back where they cannot work."""
+    network = file_system_type(stat) in NETWORK_FILE_SYSTEMS
+    mappable = not network and is_fixed_device(stat)
+    if requested == "auto":
+        if stat.st_size <= SMALL_FILE_SIZE:
+            return "buffered"
+        if mappable and stat.st_size <= MMAP_MAX_SIZE:
+            return "mmap"
+        return "fadvise"
+    if requested == "mmap" and (stat.st_size == 0 or not mappable):
+        # Empty files cannot be mapped; mapped network and removable files fault on disconnect
+        return "fadvise"
+    if requested == "direct" and not (hasattr(os, "O_DIRECT") or hasattr(_fcntl(), "F_NOCACHE")):
+        return "fadvise"
+    return requested if requested in STRATEGIES else "fadvise"
+
+
+def _fcntl():
+    try:
+        import fcntl
+        return fcntl
+    except ImportError:
+        return None
+
+
+def _advise(fd, offset, length, advice):
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, offset, length, advice)
+        except OSError:
+            pass
+
+
+def read_file(path, consume, strategy="auto", buffer_size=None, stat=None, throttle=None):
+    """Pass the content of a file to consume() as memoryviews, which are only valid during the call.
+
+    throttle, an ascmhl_throttle.JobThrottle, is told about every chunk and may pause the reads.
+    Returns the number of bytes read.
+    """
+    stat = stat or os.stat(path)
+    strategy = choose_strategy(stat, strategy)
+    if throttle is not None:
+        consume = _throttled(consume, throttle)
+    if strategy == "mmap":
+        return _read_mmap(path, consume)
+    if strategy == "direct":
+        return _read_direct(path, consume, buffer_size or LARGE_BUFFER_SIZE)
+    if buffer_size is None:
+        buffer_size = SMALL_FILE_SIZE if stat.st_size <= SMALL_FILE_SIZE else LARGE_BUFFER_SIZE
+    return _read_buffered(path, consume, buffer_size, hints=strategy == "fadvise")
+
+
+def _throttled(consume, throttle):
+    def throttled_consume(chunk):
+        # Mapped chunks are read from the disk while they are hashed, so the wait comes first
+        throttle.consume(len(chunk))
+        consume(chunk)
+    return throttled_consume
+
+
+def _read_loop(fd, buffer, consume, drop_behind=False):
+    view = memoryview(buffer)
+    offset = dropped = 0
+    try:
+        while True:
+            n = os.readv(fd, [buffer]) if hasattr(os, "readv") else _read_into(fd, view)
+            if not n:
+                break
+            chunk = view[:n]
+            consume(chunk)
+            chunk.release()
+            offset += n
+            if drop_behind and offset - dropped >= DROP_BEHIND_SIZE:
+                _advise(fd, dropped, offset - dropped, getattr(os, "POSIX_FADV_DONTNEED", 0))
+                dropped = offset
+    finally:
+        view.release()
+    return offset
+
+
+def _read_into(fd, view):
+    data = os.read(fd, len(view))
+    view[:len(data)] = data
+    return len(data)
+
+
+def _read_buffered(path, consume, buffer_size, hints):
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if hints:
+            _advise(fd, 0, 0, getattr(os, "POSIX_FADV_SEQUENTIAL", 0))
+        bytes_read = _read_loop(fd, aligned_buffer(buffer_size), consume, drop_behind=hints)
+        if hints:
+            _advise(fd, 0, 0, getattr(os, "POSIX_FADV_DONTNEED", 0))
+        return bytes_read
+    finally:
+        os.close(fd)
+
+
+def _read_mmap(path, consume):
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, len(mapped), LARGE_BUFFER_SIZE):
+                    chunk = view[offset:offset + LARGE_BUFFER_SIZE]
+                    consume(chunk)
+                    chunk.release()
+            finally:
+                view.release()
+            size = len(mapped)
+        _advise(file.fileno(), 0, 0, getattr(os, "POSIX_FADV_DONTNEED", 0))
+    return size
+
+
+def _read_direct(path, consume, buffer_size):
+    """Unbuffered reads that bypass the page cache: O_DIRECT on Linux, F_NOCACHE on macOS."""
+    buffer_size = (buffer_size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+    flags = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+    fd = None
+    if hasattr(os, "O_DIRECT"):
+        try:
+            fd = os.open(path, flags | os.O_DIRECT)
+        except OSError:
+            fd = None  # tmpfs and some FUSE file systems refuse O_DIRECT
+    if fd is None:
+        fd = os.open(path, flags)
+        fcntl = _fcntl()
+        if fcntl is not None and hasattr(fcntl, "F_NOCACHE"):
+            fcntl.fcntl(fd, fcntl.F_NOCACHE, 1)
+    try:
+        return _read_loop(fd, aligned_buffer(buffer_size), consume)
+    finally:
+        os.close(fd)
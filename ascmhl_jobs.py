@@ -0,0 +1,345 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import uuid
+
+# --- APPLICATION DATA ---
+def app_data_dir():
+    """Per-user folder for queue, caches and logs. Created on first use."""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    path = os.path.join(base, "ASCMHLCreatorGUI")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# --- JOB SETTINGS AND COMMAND BUILDING ---
+# Info tab field -> ascmhl create option
+IDENTITY_OPTIONS = [
+    ("location", "--location"),
+    ("name", "--author_name"),
+    ("email", "--author_email"),
+    ("phone", "--author_phone"),
+    ("role", "--author_role"),
+]
+
+
+def default_settings(**overrides):
+    """A job settings dict with the defaults of the Create tab, updated with overrides."""
+    settings = {
+        "hash_formats": ["xxh64"],
+        "detect_renaming": False,
+        "no_directory_hashes": False,
+        "engine": "External CLI",
+        "backend": "QThread",
+        "io_strategy": "auto",
+        "workers": 0,
+        "per_device": 0,
+        "destinations": [],
+        "verify_copies": False,
+        "hash_cache": "off",
+        "priority": "normal",
+        "bandwidth_limit": 0,
+        "identity": {key: None for key, _ in IDENTITY_OPTIONS},
+    }
+    settings.update(overrides)
+    return settings
+
+
+def read_identity(path):
+    """The identity fields of an Info tab export, XML (<userdata><user>) or JSON by extension. Empty fields are None."""
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    else:
+        from xml.etree import ElementTree
+        user = ElementTree.parse(path).getroot().find("user")
+        data = {} if user is None else {child.tag: child.text for child in user}
+    return {key: (data.get(key) or "").strip() or None for key, _ in IDENTITY_OPTIONS}
+
+
+def write_identity(path, identity):
+    """Write identity fields as an Info tab export, XML or JSON by extension."""
+    data = {key: identity.get(key) or "" for key, _ in IDENTITY_OPTIONS}
+    with open(path, "w", encoding="utf-8") as file:
+        if path.lower().endswith(".json"):
+            json.dump(data, file, indent=4)
+            return
+        from xml.sax.saxutils import escape
+        file.write("<userdata>\n")
+        file.write("    <user>\n")
+        for key, value in data.items():
+            file.write(f"        <{key}>{escape(value)}</{key}>\n")
+        file.write("    </user>\n")
+        file.write("</userdata>\n")
+
+
+def build_create_command(folder, settings):
+    """The 'ascmhl create' command line for a folder and a job settings dict."""
+    cmd = ["ascmhl", "create", folder]
+    # ascmhl hashes every given format from a single read of each file
+    for hash_format in settings["hash_formats"]:
+        cmd.extend(["--hash_format", hash_format])
+    cmd.append("-v")
+    if settings.get("detect_renaming"):
+        cmd.append("--detect_renaming")
+    if settings.get("no_directory_hashes"):
+        cmd.append("--no_directory_hashes")
+    identity = settings.get("identity", {})
+    for key, option in IDENTITY_OPTIONS:
+        if identity.get(key):
+            cmd.extend([option, identity[key]])
+    return cmd
+
+
+def engine_options(settings):
+    """Keyword arguments for ascmhl_engine.create_generation from a job settings dict."""
+    identity = settings.get("identity", {})
+    return {
+        "detect_renaming": settings.get("detect_renaming", False),
+        "no_directory_hashes": settings.get("no_directory_hashes", False),
+        "author_name": identity.get("name"),
+        "author_email": identity.get("email"),
+        "author_phone": identity.get("phone"),
+        "author_role": identity.get("role"),
+        "location": identity.get("location"),
+        "workers": settings.get("workers") or None,
+        "per_device": settings.get("per_device") or None,
+        "hash_cache": settings.get("hash_cache", "off"),
+        "resume": settings.get("resume", False),
+        "io_strategy": settings.get("io_strategy", "auto"),
+        "small_files": settings.get("small_files", False),
+    }
+
+
+# --- CHILD PROCESSES ---
+def new_process_group_options():
+    """Popen keyword arguments that start a command in its own process group."""
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _windows_parent_pids():
+    """(pid, parent pid) of every process, from a Toolhelp snapshot."""
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESSENTRY32(ctypes.Structure):
+        _fields_ = [("dwSize", wintypes.DWORD), ("cntUsage", wintypes.DWORD), ("th32ProcessID", wintypes.DWORD),
+                    ("th32DefaultHeapID", ctypes.c_size_t), ("th32ModuleID", wintypes.DWORD),
+                    ("cntThreads", wintypes.DWORD), ("th32ParentProcessID", wintypes.DWORD),
+                    ("pcPriClassBase", ctypes.c_long), ("dwFlags", wintypes.DWORD), ("szExeFile", ctypes.c_char * 260)]
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    snapshot = kernel32.CreateToolhelp32Snapshot(0x2, 0)  # TH32CS_SNAPPROCESS
+    if snapshot in (None, wintypes.HANDLE(-1).value):
+        return []
+    pairs = []
+    entry = PROCESSENTRY32()
+    entry.dwSize = ctypes.sizeof(PROCESSENTRY32)
+    try:
+        found = kernel32.Process32First(snapshot, ctypes.byref(entry))
+        while found:
+            pairs.append((entry.th32ProcessID, entry.th32ParentProcessID))
+            found = kernel32.Process32Next(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+    return pairs
+
+
+def descendant_pids(pid):
+    """Pids of every process started by pid, directly or through its children."""
+    if sys.platform == "win32":
+        pairs = _windows_parent_pids()
+    else:
+        try:
+            listing = subprocess.run(["ps", "-A", "-o", "pid=", "-o", "ppid="],
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+        except OSError:
+            return []
+        pairs = [tuple(int(field) for field in line.split()) for line in listing.splitlines() if len(line.split()) == 2]
+    children = {}
+    for child, parent in pairs:
+        children.setdefault(parent, []).append(child)
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def kill_process_tree(pid):
+    """Kill a process and everything it started, so an aborted ascmhl does not keep reading the disk."""
+    if sys.platform == "win32":
+        subprocess.run(["taskkill", "/PID", str(pid), "/T", "/F"], stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, creationflags=subprocess.CREATE_NO_WINDOW)
+        return
+    # Children are collected before the parent dies and they get re-parented
+    pids = descendant_pids(pid) + [pid]
+    try:
+        if os.getpgid(pid) == pid:
+            os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+    for child in pids:
+        try:
+            os.kill(child, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+# --- DEVICE IDENTIFICATION ---
+def device_key(path):
+    """A key that is equal for folders on the same physical device.
+
+    On Linux partitions are mapped to their parent block device through sysfs, so two
+    partitions of one disk share a key. Elsewhere the volume (st_dev) is used.
+    """
+    try:
+        dev = os.stat(path).st_dev
+    except OSError:
+        return f"unknown:{path}"
+    if sys.platform.startswith("linux"):
+        sys_path = f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+        try:
+            real = os.path.realpath(sys_path)
+            if os.path.exists(os.path.join(real, "partition")):
+                real = os.path.dirname(real)
+            return os.path.basename(real) if os.path.exists(real) else str(dev)
+        except OSError:
+            return str(dev)
+    return str(dev)
+
+
+# --- PRESETS ---
+# Named job settings, used by watch folders to queue jobs without the Create tab
+def presets_file():
+    return os.path.join(app_data_dir(), "presets.json")
+
+
+def load_presets(path=None):
+    """{name: settings} of the saved presets."""
+    path = path or presets_file()
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return {name: default_settings(**settings) for name, settings in json.load(file).items()}
+    except (OSError, ValueError, AttributeError, TypeError):
+        return {}
+
+
+def save_preset(name, settings, path=None):
+    path = path or presets_file()
+    presets = load_presets(path)
+    presets[name] = settings
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(presets, file, indent=4)
+    os.replace(tmp_path, path)
+
+
+# --- PERSISTENT JOB QUEUE ---
+QUEUED, RUNNING, DONE, FAILED, ABORTED = "Queued", "Running", "Done", "Failed", "Aborted"
+
+
+class QueuedJob:
+    def __init__(self, folder, settings, job_id=None, status=QUEUED, returncode=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.folder = folder
+        self.settings = settings
+        self.status = status
+        self.returncode = returncode
+        self.device = device_key(folder)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "folder": self.folder,
+            "settings": self.settings,
+            "status": self.status,
+            "returncode": self.returncode,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        status = data.get("status", QUEUED)
+        settings = data["settings"]
+        # A job that was running when the app stopped resumes from its journal
+        if status == RUNNING:
+            status = QUEUED
+            settings = resume_settings(settings)
+        return cls(data["folder"], settings, data.get("id"), status, data.get("returncode"))
+
+
+def resume_settings(settings):
+    """Settings that resume a job from its journal. Resuming always runs the native engine.
+
+    'ascmhl create' has no way to skip files, so only the native engine can take the journaled
+    hashes instead of reading every file again. The engine the job was set up with is kept in
+    "resumed_engine" so the switch can be reported, see resume_engine_note.
+    """
+    return dict(settings, engine="Native Parallel", resume=True,
+                resumed_engine=settings.get("resumed_engine", settings["engine"]))
+
+
+def resume_engine_note(settings):
+    """A warning when resuming replaced the job's engine with the native one, else None."""
+    engine = settings.get("resumed_engine")
+    if not settings.get("resume") or engine in (None, "Native Parallel"):
+        return None
+    return (f"⚠️ Resuming with the native engine instead of {engine}: 'ascmhl create' cannot skip "
+            "the files already hashed, only the native engine takes them from the journal")
+
+
+def small_file_settings(settings, scan):
+    """Settings that use the native engine's small-file path when the folder scan found a small-file-heavy tree."""
+    if (scan is not None and scan.small_file_heavy and settings["engine"] == "Native Parallel"
+            and not settings.get("destinations") and not settings.get("mode")):
+        return dict(settings, small_files=True)
+    return settings
+
+
+def queue_file():
+    return os.path.join(app_data_dir(), "queue.json")
+
+
+def load_queue(path=None):
+    path = path or queue_file()
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return [QueuedJob.from_dict(d) for d in json.load(file)]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def save_queue(jobs, path=None):
+    path = path or queue_file()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump([job.to_dict() for job in jobs], file, indent=4)
+    os.replace(tmp_path, path)
+
+
+def runnable_jobs(jobs, max_parallel):
+    """Queued jobs that may start now: one job per device, at most max_parallel overall."""
+    busy = {job.device for job in jobs if job.status == RUNNING}
+    slots = max_parallel - sum(1 for job in jobs if job.status == RUNNING)
+    ready = []
+    for job in jobs:
+        if slots <= 0:
+            break
+        if job.status == QUEUED and job.device not in busy:
+            ready.append(job)
+            busy.add(job.device)
+            slots -= 1
+    return ready
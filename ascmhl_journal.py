@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import ascmhl_jobs
+
+# --- WRITE-AHEAD PROGRESS JOURNAL ---
+# Every completed file hash is appended to a per-folder journal before the job moves on.
+# After an abort or crash a resumed job takes the hashes of unchanged files from the journal
+# and only reads the files that are left.
+JOURNAL_SYNC_INTERVAL = 1.0  # seconds between fsyncs, writes are flushed after every file
+
+# Hash lines of "ascmhl create -v" that carry the digest. Verified files only print "OK".
+HASH_LINE_RE = re.compile(
+    r'^\s*created (?:original|new \(verif\.\)) hash for\s+(.+?)\s+'
+    r'(md5|sha1|sha256|xxh32|xxh64|xxh3|xxh128|c4): (\S+)\s*$'
+)
+
+
+def journal_path(folder):
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(folder)).encode("utf-8")).hexdigest()
+    path = os.path.join(ascmhl_jobs.app_data_dir(), "journals")
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, key + ".jsonl")
+
+
+def has_journal(folder):
+    """True if an unfinished job left hashes for this folder. The first line is the header."""
+    try:
+        with open(journal_path(folder), "r", encoding="utf-8") as file:
+            return bool(file.readline()) and bool(file.readline())
+    except OSError:
+        return False
+
+
+class ProgressJournal:
+    """Append-only journal of completed file hashes for one media folder. Thread safe.
+
+    With resume=True the existing journal is loaded and extended, otherwise it is started over.
+    """
+
+    def __init__(self, folder, hash_formats, resume=False):
+        self.folder = os.path.abspath(folder)
+        self.path = journal_path(folder)
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._last_sync = time.monotonic()
+        if resume:
+            self._load()
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._write({"folder": self.folder, "hash_formats": list(hash_formats), "started": time.time()})
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by the crash
+                if "p" not in record:
+                    continue
+                entry = self.entries.get(record["p"])
+                if entry is None or entry[:2] != (record["s"], record["m"]):
+                    entry = self.entries[record["p"]] = (record["s"], record["m"], {})
+                entry[2].update(record["h"])
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._file.flush()
+        now = time.monotonic()
+        if now - self._last_sync >= JOURNAL_SYNC_INTERVAL:
+            self._last_sync = now
+            os.fsync(self._file.fileno())
+
+    def _relative(self, path):
+        return os.path.relpath(os.path.abspath(path), self.folder).replace("\\", "/")
+
+    def known_hashes(self, path, stat, hash_formats):
+        """Journaled digests of a file that has not changed since it was hashed."""
+        entry = self.entries.get(self._relative(path))
+        if entry is None or entry[:2] != (stat.st_size, stat.st_mtime_ns):
+            return {}
+        return {f: entry[2][f] for f in hash_formats if f in entry[2]}
+
+    def record(self, path, stat, hashes):
+        if not hashes:
+            return
+        with self._lock:
+            if not self._file.closed:
+                self._write({"p": self._relative(path), "s": stat.st_size, "m": stat.st_mtime_ns, "h": hashes})
+
+    def feed(self, line):
+        """Journal a hash line of 'ascmhl create -v' output."""
+        match = HASH_LINE_RE.match(line)
+        if not match:
+            return
+        path = os.path.join(self.folder, match.group(1))
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self.record(path, stat, {match.group(2): match.group(3)})
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+    def discard(self):
+        """Close and delete the journal once the generation has been written."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,317 @@
+import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import Future
+
+from ascmhl.hasher import new_hasher_for_hash_type
+
+import ascmhl_engine
+import ascmhl_journal
+import ascmhl_records
+import ascmhl_scan
+
+# --- FAN-OUT OFFLOAD ---
+# The source is read once, in large buffers. Every buffer is handed to one hashing thread and to
+# one writer thread per destination through bounded queues, so the copy runs at the speed of the
+# slowest destination instead of the sum of separate copy and hash passes. The hashes are then
+# journaled for each destination and its ascmhl generation is created without reading the copy again.
+OFFLOAD_BUFFER_SIZE = 8 * 1024 * 1024  # bytes per source read
+OFFLOAD_QUEUE_DEPTH = 8  # buffers queued per hashing or writer thread before the reader waits
+
+
+class _Sink(threading.Thread):
+    """A thread consuming ("open", ...), ("data", bytes), ("close" or "abort", ...) messages from a bounded queue.
+
+    Writers also get ("folder", relative path) for every source folder, so empty ones are copied too.
+    """
+
+    def __init__(self, name):
+        super().__init__(name=name, daemon=True)
+        self.queue = queue.Queue(OFFLOAD_QUEUE_DEPTH)
+        self.error = None
+
+    def run(self):
+        while True:
+            message = self.queue.get()
+            if message is None:
+                break
+            if self.error is not None and message[0] != "abort":
+                continue  # keep draining so the reader never blocks on a failed sink, but clean up an aborted file
+            try:
+                self.handle(*message)
+            except Exception as e:
+                self.error = e
+                self.fail(message)
+
+    def handle(self, kind, payload):
+        raise NotImplementedError
+
+    def fail(self, message):
+        pass
+
+
+class _HashSink(_Sink):
+    def __init__(self, hash_formats):
+        super().__init__("offload-hash")
+        self.hash_formats = hash_formats
+        self._hashers = None
+        self._result = None
+
+    def handle(self, kind, payload):
+        if kind == "open":
+            self._hashers = [(f, new_hasher_for_hash_type(f)) for f in self.hash_formats]
+            self._result = payload
+        elif kind == "data":
+            for _, hasher in self._hashers:
+                hasher.update(payload)
+        elif kind == "close":
+            self._result.set_result({f: hasher.string_digest() for f, hasher in self._hashers})
+        elif kind == "abort":
+            if not self._result.done():
+                self._result.set_exception(ascmhl_engine.JobCancelled())
+
+    def fail(self, message):
+        if self._result is not None and not self._result.done():
+            self._result.set_exception(self.error)
+
+
+class _WriterSink(_Sink):
+    def __init__(self, target, journal):
+        super().__init__(f"offload-write-{os.path.basename(target)}")
+        self.target = target
+        self.journal = journal  # None while a read-back verification will journal instead
+        self.bytes_written = 0
+        self._file = None
+        self._path = None
+
+    def handle(self, kind, payload):
+        if kind == "folder":
+            os.makedirs(os.path.join(self.target, payload), exist_ok=True)
+        elif kind == "open":
+            self._path = os.path.join(self.target, payload)
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            self._file = open(self._path, "wb", buffering=0)
+        elif kind == "data":
+            self._file.write(payload)
+            self.bytes_written += len(payload)
+        elif kind == "close":
+            source_stat, hashes = payload
+            if self.journal is None:
+                # A copy that will be read back must come from the disk, not the page cache
+                os.fsync(self._file.fileno())
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(self._file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            self._file.close()
+            self._file = None
+            os.utime(self._path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+            if self.journal is not None:
+                self.journal.record(self._path, os.stat(self._path), hashes.result())
+        elif kind == "abort":
+            # A file cut short must not look like a finished copy: no source mtime, no journal entry.
+            # After a write error fail() has closed it already, the partial file is removed all the same.
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            try:
+                os.remove(self._path)
+            except FileNotFoundError:
+                pass
+
+    def fail(self, message):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _source_files(root):
+    """Relative paths of every file and folder below root, ascmhl folders included, in a stable order.
+
+    Folders end with "/" and come before their contents.
+    """
+    stack = [""]
+    while stack:
+        prefix = stack.pop()
+        try:
+            entries = sorted(os.scandir(os.path.join(root, prefix)), key=lambda e: e.name)
+        except OSError:
+            continue
+        folders = []
+        for entry in entries:
+            relative = prefix + entry.name
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    folders.append(relative + "/")
+            else:
+                yield relative
+        stack.extend(reversed(folders))
+        yield from folders
+
+
+def _verify_copy(target, copied, hash_formats, journal, cancel, mismatches, throttle=None):
+    """Read every copied file back and compare it to the source hashes, journaling good copies."""
+    for index in copied:
+        if cancel.is_set():
+            return
+        relative, hashes = copied.path(index), copied.hashes(index)
+        path = os.path.join(target, relative)
+        try:
+            # Direct reads so the comparison sees what is on the disk, not what is still cached
+            found, _ = ascmhl_engine.hash_file_single_pass(path, hash_formats, OFFLOAD_BUFFER_SIZE, "direct",
+                                                           throttle=throttle)
+        except OSError as e:
+            mismatches.append(f"{relative}: {str(e)}")
+            continue
+        if found != hashes:
+            mismatches.append(relative)
+            continue
+        journal.record(path, os.stat(path), found)
+
+
+def offload(source, destinations, hash_formats, verify=False, output=print, cancel=None, throttle=None, **options):
+    """Copy source into every destination folder in one read, then create an ascmhl generation on each copy.
+
+    Each copy is placed in a folder named after the source. With verify=True every copy is read
+    back and compared to the source hashes before its generation is written. The remaining options
+    are passed to ascmhl_engine.create_generation. throttle (an ascmhl_throttle.JobThrottle) pauses
+    and caps the source reads, the read-back and the generations. Returns an ascmhl-style exit code.
+    """
+    cancel = cancel or threading.Event()
+    source = os.path.abspath(source)
+    name = os.path.basename(source.rstrip(os.sep)) or "offload"
+    targets = [os.path.join(os.path.abspath(d), name) for d in destinations]
+    for destination in destinations:
+        if not os.path.isdir(destination):
+            output(f"❌ Destination is not a folder: {destination}")
+            return 2
+    for target in targets:
+        if os.path.isdir(target) and os.listdir(target):
+            output(f"❌ Destination already contains {name}: {target}")
+            return 2
+    try:
+        scan = ascmhl_scan.scan_folder(source, cancel)
+    except ascmhl_scan.ScanCancelled:
+        return -1
+    # Destinations sharing a volume need room for one copy each
+    per_volume = {}
+    for destination in destinations:
+        per_volume.setdefault(os.stat(destination).st_dev, []).append(destination)
+    for folders in per_volume.values():
+        free = shutil.disk_usage(folders[0]).free
+        needed = scan.total_bytes * len(folders)
+        if free < needed:
+            output(f"❌ Not enough space on {folders[0]}: {ascmhl_scan.format_bytes(free)} free, "
+                   f"{ascmhl_scan.format_bytes(needed)} needed")
+            return 2
+
+    journals = [ascmhl_journal.ProgressJournal(target, hash_formats) for target in targets]
+    hasher = _HashSink(hash_formats)
+    writers = [_WriterSink(target, None if verify else journal) for target, journal in zip(targets, journals)]
+    sinks = [hasher] + writers
+    for sink in sinks:
+        sink.start()
+    output(f"📦 Offloading {scan.file_count} files, {ascmhl_scan.format_bytes(scan.total_bytes)} "
+           f"to {len(targets)} destinations")
+
+    copied = ascmhl_records.FileRecords(hash_formats)  # source path, size, mtime and digests of each copied file
+    returncode = 0
+    started = time.perf_counter()
+    try:
+        for relative in _source_files(source):
+            if cancel.is_set():
+                break
+            if relative.endswith("/"):
+                for writer in writers:
+                    writer.queue.put(("folder", relative))
+                continue
+            path = os.path.join(source, relative)
+            stat = os.stat(path)
+            hashes = Future()
+            for sink in sinks:
+                sink.queue.put(("open", hashes if sink is hasher else relative))
+            complete = False
+            try:
+                with open(path, "rb", buffering=0) as file:
+                    while not cancel.is_set():
+                        chunk = file.read(OFFLOAD_BUFFER_SIZE)
+                        if not chunk:
+                            break
+                        if throttle is not None:
+                            throttle.consume(len(chunk))
+                        # The same immutable buffer is shared by every sink
+                        for sink in sinks:
+                            sink.queue.put(("data", chunk))
+                complete = not cancel.is_set()
+            finally:
+                for sink in sinks:
+                    if complete:
+                        sink.queue.put(("close", (stat, hashes) if sink is not hasher else None))
+                    else:
+                        sink.queue.put(("abort", None))
+            if not complete:
+                break
+            digests = hashes.result()
+            copied.add(relative, stat.st_size, stat.st_mtime_ns, digests, ascmhl_records.DONE)
+            for hash_format, digest in digests.items():
+                output(f"  copied    {relative}  {hash_format}: {digest}")
+    except OSError as e:
+        output(f"❌ Error reading source: {str(e)}")
+        returncode = 1
+        cancel.set()
+    finally:
+        for sink in sinks:
+            sink.queue.put(None)
+        for sink in sinks:
+            sink.join()
+
+    if hasher.error is not None:
+        output(f"❌ Error hashing source: {str(hasher.error)}")
+        returncode = 1
+    if cancel.is_set() and returncode == 0:
+        output("⚠️ Offload cancelled, the copies are incomplete.")
+        returncode = -1
+    if returncode != 0:
+        for journal in journals:
+            journal.close()
+        return returncode
+    elapsed = time.perf_counter() - started
+    output(f"📦 Copied {ascmhl_scan.format_bytes(scan.total_bytes)} in {ascmhl_scan.format_duration(elapsed)} "
+           f"({ascmhl_scan.format_bytes(scan.total_bytes / elapsed if elapsed else 0)}/s per destination)")
+
+    failed = {}
+    for target, writer in zip(targets, writers):
+        if writer.error is not None:
+            failed[target] = f"write error: {str(writer.error)}"
+    if verify:
+        output("🔁 Reading the copies back...")
+        mismatches = {target: [] for target in targets}
+        threads = [
+            threading.Thread(target=_verify_copy, args=(t, copied, hash_formats, j, cancel, mismatches[t], throttle))
+            for t, j in zip(targets, journals) if t not in failed
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for target, bad in mismatches.items():
+            for relative in bad:
+                output(f"ERROR: copy does not match the source: {os.path.join(target, relative)}")
+            if bad:
+                failed[target] = f"{len(bad)} files do not match the source"
+
+    for target, journal in zip(targets, journals):
+        journal.close()
+        if target in failed:
+            output(f"❌ {target}: {failed[target]}, no generation created")
+            continue
+        output(f"📝 Creating ascmhl generation in {target}")
+        result = ascmhl_engine.create_generation(
+            target, hash_formats, output=output, cancel=cancel, resume=True, throttle=throttle, **options
+        )
+        if result != 0:
+            failed[target] = f"exit code {result}"
+    if failed:
+        return 11 if verify and any("match" in reason for reason in failed.values()) else 1
+    output(f"✅ Offloaded to {len(targets)} destinations")
+    return 0
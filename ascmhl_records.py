@@ -0,0 +1,216 @@
+from array import array
+
+# --- COMPACT PER-FILE RECORDS ---
+# A job can touch millions of files. A dict or an object per file costs several hundred bytes on
+# CPython, so per-file data (the folder scan, progress, verify and offload results) is kept in
+# columns instead: typed arrays for size, mtime and status, one bytearray of fixed-width binary
+# digests, and paths split into an interned folder and a UTF-8 name in one shared buffer.
+# Lookups by path use an open-addressing table of record numbers, built while adding (indexed=True)
+# or when find() is first called. With one xxh64 digest and the path index a record costs about
+# 54 bytes plus its file name, against some 400 for the dicts and tuples used before; see
+# benchmarks/bench_records.py, which fails when a record grows past RECORD_BYTES_TARGET.
+RECORD_BYTES_TARGET = 100  # bytes per record, paths excluded
+
+PENDING, DONE, FAILED, MISSING = 0, 1, 2, 3
+
+# Binary width of each digest; c4 ids are base58 text of a fixed length and are kept as ASCII
+DIGEST_SIZES = {"md5": 16, "sha1": 20, "sha256": 32, "xxh32": 4, "xxh64": 8, "xxh3": 8, "xxh128": 16, "c4": 90}
+TEXT_DIGESTS = {"c4"}
+
+
+def _pack_digest(hash_format, digest):
+    data = digest.encode("ascii") if hash_format in TEXT_DIGESTS else bytes.fromhex(digest)
+    if len(data) != DIGEST_SIZES[hash_format]:
+        raise ValueError(f"{hash_format} digest of the wrong length: {digest}")
+    return data
+
+
+def _unpack_digest(hash_format, data):
+    return data.decode("ascii") if hash_format in TEXT_DIGESTS else data.hex()
+
+
+class FileRecords:
+    """Columns of per-file data: path, size, mtime (ns), status and digests of hash_formats.
+
+    Records are numbered in the order they are added. Formats not given up front get a column
+    when the first digest of that format is added. With indexed=True the path index is kept up
+    to date while adding, so the first find() does not have to build it. Adding is not
+    thread-safe; reading and set_status are, since every column is updated in place.
+    """
+
+    def __init__(self, hash_formats=(), indexed=False):
+        self._folders = []  # interned folder prefixes, "" for the root
+        self._folder_ids = {}
+        self._folder_column = array("I")
+        self._names = bytearray()  # UTF-8 file names back to back
+        self._name_ends = array("Q")
+        self._sizes = array("q")
+        self._mtimes = array("q")
+        self._statuses = bytearray()
+        self._formats = []
+        self._offsets = {}  # hash format -> byte offset of its digest within a record's digests
+        self._width = 0
+        self._present = bytearray()  # bit n set when the record has a digest of self._formats[n]
+        self._digests = bytearray()
+        self._keys = None  # 32-bit path hashes and the slot table, once find() was used
+        self._table = None
+        for hash_format in hash_formats:
+            self._add_format(hash_format)
+        if indexed:
+            self._build_index()
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def __iter__(self):
+        return iter(range(len(self._sizes)))
+
+    @property
+    def hash_formats(self):
+        return list(self._formats)
+
+    def add(self, path, size, mtime_ns=0, hashes=None, status=PENDING):
+        """Add a file by its relative path ("/" separated). Returns its record number."""
+        folder, _, name = path.rpartition("/")
+        folder_id = self._folder_ids.get(folder)
+        if folder_id is None:
+            folder_id = self._folder_ids[folder] = len(self._folders)
+            self._folders.append(folder)
+        index = len(self._sizes)
+        self._folder_column.append(folder_id)
+        self._names += name.encode("utf-8", "surrogatepass")
+        self._name_ends.append(len(self._names))
+        self._sizes.append(-1 if size is None else size)
+        self._mtimes.append(mtime_ns)
+        self._statuses.append(status)
+        self._present.append(0)
+        self._digests += bytes(self._width)
+        if hashes:
+            self.set_hashes(index, hashes)
+        if self._table is not None:
+            self._insert(index, hash(path))
+        return index
+
+    def path(self, index):
+        start = self._name_ends[index - 1] if index else 0
+        name = self._names[start:self._name_ends[index]].decode("utf-8", "surrogatepass")
+        folder = self._folders[self._folder_column[index]]
+        return f"{folder}/{name}" if folder else name
+
+    def size(self, index):
+        size = self._sizes[index]
+        return None if size < 0 else size
+
+    def mtime_ns(self, index):
+        return self._mtimes[index]
+
+    def status(self, index):
+        return self._statuses[index]
+
+    def set_status(self, index, status):
+        self._statuses[index] = status
+
+    def count(self, status):
+        return self._statuses.count(status)
+
+    def with_status(self, status):
+        """Record numbers with the given status, in order."""
+        statuses = self._statuses
+        index = statuses.find(status)
+        while index >= 0:
+            yield index
+            index = statuses.find(status, index + 1)
+
+    # -- digests --
+    def _add_format(self, hash_format):
+        if hash_format in self._offsets:
+            return
+        if len(self._formats) >= 8:
+            raise ValueError("at most 8 hash formats per FileRecords")
+        width = DIGEST_SIZES[hash_format]
+        old_width = self._width
+        if self._sizes:
+            # Widen every record; happens at most once per format
+            old, self._digests = self._digests, bytearray(len(self._sizes) * (old_width + width))
+            for index in range(len(self._sizes)):
+                start = index * (old_width + width)
+                self._digests[start:start + old_width] = old[index * old_width:(index + 1) * old_width]
+        self._offsets[hash_format] = old_width
+        self._formats.append(hash_format)
+        self._width = old_width + width
+
+    def set_hashes(self, index, hashes):
+        """Store {hash_format: digest} of a record, digests as ascmhl prints them."""
+        for hash_format, digest in hashes.items():
+            self._add_format(hash_format)
+            start = index * self._width + self._offsets[hash_format]
+            self._digests[start:start + DIGEST_SIZES[hash_format]] = _pack_digest(hash_format, digest)
+            self._present[index] |= 1 << self._formats.index(hash_format)
+
+    def digest(self, index, hash_format):
+        """The digest of a record in hash_format, or None when it has none."""
+        bit = self._formats.index(hash_format) if hash_format in self._offsets else -1
+        if bit < 0 or not self._present[index] & (1 << bit):
+            return None
+        start = index * self._width + self._offsets[hash_format]
+        return _unpack_digest(hash_format, self._digests[start:start + DIGEST_SIZES[hash_format]])
+
+    def hashes(self, index):
+        """{hash_format: digest} of a record."""
+        present = self._present[index]
+        return {f: self.digest(index, f) for bit, f in enumerate(self._formats) if present & (1 << bit)}
+
+    # -- lookup by path --
+    def find(self, path):
+        """Record number of path, or None. The first call indexes every record."""
+        if self._table is None:
+            self._build_index()
+        key = hash(path)
+        short_key = key & 0xFFFFFFFF
+        mask = len(self._table) - 1
+        slot = key & mask
+        while True:
+            index = self._table[slot]
+            if index < 0:
+                return None
+            if self._keys[index] == short_key and self.path(index) == path:
+                return index
+            slot = (slot + 1) & mask
+
+    def _build_index(self, capacity=None):
+        capacity = capacity or 16
+        while capacity < 2 * len(self._sizes) + 2:
+            capacity *= 2
+        if self._keys is None:
+            self._keys = array("I", (hash(self.path(index)) & 0xFFFFFFFF for index in range(len(self._sizes))))
+        self._table = array("i", [-1]) * capacity
+        mask = capacity - 1
+        for index, key in enumerate(self._keys):
+            # The slot comes from the low bits, which the 32-bit key keeps while capacity < 2**32
+            slot = key & mask
+            while self._table[slot] >= 0:
+                slot = (slot + 1) & mask
+            self._table[slot] = index
+
+    def _insert(self, index, key):
+        self._keys.append(key & 0xFFFFFFFF)
+        if 2 * len(self._sizes) + 2 > len(self._table):
+            self._build_index(2 * len(self._table))
+            return
+        mask = len(self._table) - 1
+        slot = key & mask
+        while self._table[slot] >= 0:
+            slot = (slot + 1) & mask
+        self._table[slot] = index
+
+    # -- memory --
+    def record_bytes(self):
+        """Bytes held per record, folder prefixes and file names excluded."""
+        columns = [self._folder_column, self._name_ends, self._sizes, self._mtimes, self._keys, self._table]
+        total = sum(column.buffer_info()[1] * column.itemsize for column in columns if column is not None)
+        total += len(self._statuses) + len(self._present) + len(self._digests)
+        return total / len(self._sizes) if self._sizes else 0.0
+
+    def path_bytes(self):
+        """Bytes held for paths: the file name buffer and the interned folders."""
+        return len(self._names) + sum(len(folder.encode("utf-8", "surrogatepass")) for folder in self._folders)
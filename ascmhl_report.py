@@ -0,0 +1,365 @@
+import csv
+import heapq
+import html
+import os
+import threading
+import time
+
+from lxml import etree
+
+import ascmhl_index
+import ascmhl_scan
+
+# --- JOB REPORTS ---
+# A client report of one ascmhl generation: every file with its size, modification date, hash
+# date and hashes. The manifest is streamed once with iterparse and the rows are written as they
+# are read (CSV, and HTML pages of REPORT_PAGE_ROWS rows), so a million-file volume takes as little
+# memory as a small one. Only bounded summaries are kept: counts, the largest files and the top
+# level folders, which go into the index page and the one-page PDF summary at the end.
+REPORT_FORMATS = ["html", "csv", "pdf"]
+REPORT_PAGE_ROWS = 5000  # files per HTML page
+REPORT_LARGEST_FILES = 20
+REPORT_MAX_FOLDERS = 40  # top level folders listed in the summary, the rest are counted together
+OTHER_FOLDERS = "(other folders)"
+REPORT_CANCEL_CHECK = 1000  # entries between checks for a cancelled report
+
+PAGE_STYLE = (
+    "body{font-family:Arial,sans-serif;font-size:12px;margin:16px}"
+    "table{border-collapse:collapse;width:100%}th,td{border:1px solid #ccc;padding:2px 6px;text-align:left}"
+    "th{background:#eee}td.num{text-align:right}td.hash{font-family:monospace}nav{margin:8px 0}"
+)
+
+
+class ReportCancelled(Exception):
+    pass
+
+
+def latest_generation(folder):
+    """The newest generation file of the ascmhl history in folder, or None."""
+    history = os.path.join(folder, "ascmhl")
+    try:
+        names = sorted(name for name in os.listdir(history) if name.endswith(".mhl"))
+    except OSError:
+        return None
+    return os.path.join(history, names[-1]) if names else None
+
+
+def iter_manifest(file):
+    """Stream a generation file. Yields ("info", dict) for the creator and process info, then
+    ("file", (path, size, modified, [(algorithm, digest, action, hash date)])) per file entry.
+    """
+    ns = ascmhl_index.MHL_NAMESPACE
+    hash_tag, path_tag = ns + "hash", ns + "path"
+    # Tags are compared with their namespace; splitting every tag into a QName costs a third of the parse
+    formats = {ns + algorithm: algorithm for algorithm in ascmhl_index.HASH_FORMATS}
+    tags = tuple(ns + tag for tag in ("creatorinfo", "process", "hash", "directoryhash"))
+    for _, element in etree.iterparse(file, events=("end",), tag=tags):
+        tag = element.tag
+        if tag == hash_tag:
+            path = size = modified = None
+            hashes = []
+            for child in element:
+                if child.tag == path_tag:
+                    path, size, modified = child.text, child.get("size"), child.get("lastmodificationdate")
+                elif child.tag in formats:
+                    hashes.append((formats[child.tag], (child.text or "").strip(), child.get("action"),
+                                   child.get("hashdate")))
+            if path is not None:
+                yield "file", (path, int(size) if size else None, modified, hashes)
+        elif tag == ns + "creatorinfo":
+            info = {}
+            for child in element.iter(etree.Element):
+                name = etree.QName(child).localname
+                if name != "creatorinfo" and child.text and child.text.strip():
+                    info[name] = child.text.strip()
+                    if child.get("version"):
+                        info[name] += " " + child.get("version")
+            yield "info", info
+        elif tag == ns + "process":
+            yield "info", {"process": (element.text or "").strip()}
+        # Drop what has been read so the tree never grows past one entry
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+class ReportSummary:
+    """Totals of a report, with bounded lists of the largest files and the top level folders."""
+
+    def __init__(self):
+        self.info = {}
+        self.files = 0
+        self.bytes = 0
+        self.actions = {}
+        self.formats = []
+        self.largest = []  # min-heap of (size, path)
+        self.folders = {}  # top level folder -> [files, bytes]
+
+    def add(self, path, size, hashes):
+        size = size or 0
+        self.files += 1
+        self.bytes += size
+        for algorithm, _, action, _ in hashes:
+            if algorithm not in self.formats:
+                self.formats.append(algorithm)
+            self.actions[action or "unknown"] = self.actions.get(action or "unknown", 0) + 1
+        if len(self.largest) < REPORT_LARGEST_FILES:
+            heapq.heappush(self.largest, (size, path))
+        elif size > self.largest[0][0]:
+            heapq.heapreplace(self.largest, (size, path))
+        folder = path.split("/", 1)[0] if "/" in path else "."
+        if folder not in self.folders and len(self.folders) >= REPORT_MAX_FOLDERS:
+            folder = OTHER_FOLDERS
+        totals = self.folders.setdefault(folder, [0, 0])
+        totals[0] += 1
+        totals[1] += size
+
+    def lines(self, folder, manifest):
+        """The summary as (heading, [text lines]) sections, shared by the HTML index and the PDF."""
+        info = self.info
+        author = ", ".join(info[key] for key in ("name", "email", "role") if key in info)
+        overview = [
+            f"Folder: {folder}",
+            f"Generation: {os.path.basename(manifest)}",
+            f"Created: {info.get('creationdate', 'unknown')} on {info.get('hostname', 'unknown')}",
+            f"Tool: {info.get('tool', 'unknown')}, process: {info.get('process', 'unknown')}",
+            f"Files: {self.files:,}, {ascmhl_scan.format_bytes(self.bytes)} ({self.bytes:,} bytes)",
+            f"Hash formats: {', '.join(self.formats) or 'none'}",
+            "Hashes: " + (", ".join(f"{count:,} {action}" for action, count in sorted(self.actions.items())) or "none"),
+        ]
+        if author:
+            overview.append(f"Author: {author}")
+        if "location" in info:
+            overview.append(f"Location: {info['location']}")
+        folders = [f"{name}: {files:,} files, {ascmhl_scan.format_bytes(size)}"
+                   for name, (files, size) in sorted(self.folders.items(), key=lambda item: item[0] == OTHER_FOLDERS)]
+        largest = [f"{ascmhl_scan.format_bytes(size)}  {path}" for size, path in sorted(self.largest, reverse=True)]
+        return [("Summary", overview), ("Top level folders", folders), ("Largest files", largest)]
+
+
+def _html_head(title):
+    return (f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>"
+            f"<style>{PAGE_STYLE}</style></head><body>\n<h2>{html.escape(title)}</h2>\n")
+
+
+class _HtmlPages:
+    """Writes report_NNNN.html pages of page_rows files each, linked to each other and to index.html."""
+
+    def __init__(self, output_dir, title, formats, page_rows):
+        self.output_dir = output_dir
+        self.title = title
+        self.formats = formats
+        self.page_rows = page_rows
+        self.pages = []  # (file name, first path, last path), one small tuple per page
+        self._file = None
+        self._rows = 0
+        self._first = self._last = None
+
+    def _page_name(self, number):
+        return f"report_{number:04d}.html"
+
+    def _open(self):
+        name = self._page_name(len(self.pages) + 1)
+        self._file = open(os.path.join(self.output_dir, name), "w", encoding="utf-8")
+        self._file.write(_html_head(f"{self.title} · page {len(self.pages) + 1}"))
+        self._file.write("<nav><a href=\"index.html\">Summary</a></nav>\n<table><tr><th>Path</th><th>Size</th>"
+                         "<th>Modified</th><th>Hashed</th>"
+                         + "".join(f"<th>{html.escape(f)}</th>" for f in self.formats)
+                         + "<th>Other hashes</th></tr>\n")
+        self._rows = 0
+        self._first = None
+
+    def add(self, path, size, modified, hashes):
+        # A full page is closed when the next row arrives, so the last page never links to a missing one
+        if self._file is not None and self._rows >= self.page_rows:
+            self._close_page(last=False)
+        if self._file is None:
+            self._open()
+        by_format = {algorithm: digest for algorithm, digest, _, _ in hashes}
+        others = " ".join(f"{algorithm}:{digest}" for algorithm, digest, _, _ in hashes if algorithm not in self.formats)
+        hashed = hashes[0][3] or "" if hashes else ""
+        # Cell text only needs &, < and > escaped
+        self._file.write(
+            f"<tr><td>{html.escape(path, False)}</td><td class=\"num\">{size if size is not None else ''}</td>"
+            f"<td>{html.escape(modified or '', False)}</td><td>{html.escape(hashed[:19], False)}</td>"
+            + "".join(f"<td class=\"hash\">{html.escape(by_format.get(f, ''), False)}</td>" for f in self.formats)
+            + f"<td class=\"hash\">{html.escape(others, False)}</td></tr>\n"
+        )
+        self._first = self._first or path
+        self._last = path
+        self._rows += 1
+
+    def _close_page(self, last):
+        number = len(self.pages) + 1
+        links = ["<a href=\"index.html\">Summary</a>"]
+        if number > 1:
+            links.append(f"<a href=\"{self._page_name(number - 1)}\">Previous</a>")
+        if not last:
+            links.append(f"<a href=\"{self._page_name(number + 1)}\">Next</a>")
+        self._file.write("</table>\n<nav>" + " · ".join(links) + "</nav>\n</body></html>\n")
+        self._file.close()
+        self._file = None
+        self.pages.append((self._page_name(number), self._first, self._last))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def finish(self, sections):
+        if self._file is not None:
+            self._close_page(last=True)
+        with open(os.path.join(self.output_dir, "index.html"), "w", encoding="utf-8") as file:
+            file.write(_html_head(self.title))
+            for heading, lines in sections:
+                file.write(f"<h3>{html.escape(heading)}</h3>\n<ul>\n")
+                file.writelines(f"<li>{html.escape(line)}</li>\n" for line in lines)
+                file.write("</ul>\n")
+            file.write("<h3>Files</h3>\n<ol>\n")
+            file.writelines(f"<li><a href=\"{name}\">{html.escape(first or '')} … {html.escape(last or '')}</a></li>\n"
+                            for name, first, last in self.pages)
+            file.write("</ol>\n</body></html>\n")
+
+
+class _CsvRows:
+    """report.csv with one row per file: path, size, dates, one column per hash format and the hash action."""
+
+    def __init__(self, output_dir, formats):
+        self.formats = formats
+        self._file = open(os.path.join(output_dir, "report.csv"), "w", encoding="utf-8", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(["path", "size", "last_modified", "hash_date"] + formats + ["action", "other_hashes"])
+
+    def add(self, path, size, modified, hashes):
+        by_format = {algorithm: digest for algorithm, digest, _, _ in hashes}
+        others = " ".join(f"{algorithm}:{digest}" for algorithm, digest, _, _ in hashes if algorithm not in self.formats)
+        self._writer.writerow([path, size if size is not None else "", modified or "", hashes[0][3] if hashes else ""]
+                              + [by_format.get(f, "") for f in self.formats]
+                              + [hashes[0][2] if hashes else "", others])
+
+    def close(self):
+        self._file.close()
+
+    def finish(self, sections):
+        self.close()
+
+
+# --- PDF SUMMARY ---
+PDF_PAGE_SIZE = (595, 842)  # A4 in points
+PDF_MARGIN = 50
+PDF_FONT_SIZE = 9
+PDF_LINE_HEIGHT = 12
+
+
+def _pdf_text(text):
+    # The standard Helvetica font only covers Latin-1
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, title, sections):
+    """Write sections of text lines as a plain PDF with the built-in Helvetica font, no dependencies."""
+    width, height = PDF_PAGE_SIZE
+    rows = [(title, 14)] + [row for heading, lines in sections
+                             for row in [("", PDF_FONT_SIZE), (heading, 11)] + [(line, PDF_FONT_SIZE) for line in lines]]
+    per_page = (height - 2 * PDF_MARGIN) // PDF_LINE_HEIGHT
+    max_chars = int((width - 2 * PDF_MARGIN) / (PDF_FONT_SIZE * 0.5))
+    pages = [rows[i:i + per_page] for i in range(0, len(rows), per_page)]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        stream = "BT\n" + "".join(
+            f"/F1 {size} Tf 1 0 0 1 {PDF_MARGIN} {height - PDF_MARGIN - i * PDF_LINE_HEIGHT} Tm "
+            f"({_pdf_text(text if len(text) <= max_chars else text[:max_chars - 1] + '~')}) Tj\n"
+            for i, (text, size) in enumerate(page)
+        ) + "ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    with open(path, "wb") as file:
+        file.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(file.tell())
+            file.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+        xref = file.tell()
+        file.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+        file.write("".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1"))
+        file.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+
+
+class _PdfSummary:
+    def __init__(self, output_dir, title):
+        self.path = os.path.join(output_dir, "summary.pdf")
+        self.title = title
+
+    def add(self, path, size, modified, hashes):
+        pass
+
+    def close(self):
+        pass
+
+    def finish(self, sections):
+        write_pdf(self.path, self.title, sections)
+
+
+def write_report(folder, output_dir, formats=None, manifest=None, output=print, cancel=None,
+                 page_rows=REPORT_PAGE_ROWS):
+    """Write the report of a folder's newest generation (or of manifest) into output_dir.
+
+    formats is a subset of REPORT_FORMATS, all by default. Returns 0 when written, 1 when there is
+    no generation or it cannot be read or written, -1 when cancelled.
+    """
+    cancel = cancel or threading.Event()
+    formats = formats or REPORT_FORMATS
+    manifest = manifest or latest_generation(folder)
+    if manifest is None:
+        output(f"❌ No ascmhl generation to report in {folder}")
+        return 1
+    title = f"ASC MHL report · {os.path.basename(os.path.abspath(folder).rstrip(os.sep)) or folder}"
+    summary = ReportSummary()
+    writers = []
+    started = time.perf_counter()
+    output(f"📄 Writing {', '.join(formats).upper()} report of {os.path.basename(manifest)} to {output_dir}")
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        for kind, value in iter_manifest(manifest):
+            if kind == "info":
+                summary.info.update(value)
+                continue
+            path, size, modified, hashes = value
+            if not summary.files:
+                # Columns are the formats of the first file; formats added later go to the other hashes column
+                columns = [algorithm for algorithm, _, _, _ in hashes]
+                writers = ([_HtmlPages(output_dir, title, columns, page_rows)] if "html" in formats else []) \
+                    + ([_CsvRows(output_dir, columns)] if "csv" in formats else [])
+            for writer in writers:
+                writer.add(path, size, modified, hashes)
+            summary.add(path, size, hashes)
+            if summary.files % REPORT_CANCEL_CHECK == 0 and cancel.is_set():
+                raise ReportCancelled()
+        if not summary.files and "html" in formats:
+            writers = [_HtmlPages(output_dir, title, [], page_rows)]
+        if "pdf" in formats:
+            writers.append(_PdfSummary(output_dir, title))
+        sections = summary.lines(folder, manifest)
+        for writer in writers:
+            writer.finish(sections)
+    except ReportCancelled:
+        output("⚠️ Report cancelled, the written files are incomplete.")
+        return -1
+    except etree.XMLSyntaxError as e:
+        output(f"❌ Could not read {manifest}: {str(e)}")
+        return 1
+    except OSError as e:
+        output(f"❌ Report failed: {str(e)}")
+        return 1
+    finally:
+        for writer in writers:
+            writer.close()
+    elapsed = time.perf_counter() - started
+    output(f"📄 Reported {summary.files:,} files, {ascmhl_scan.format_bytes(summary.bytes)} in "
+           f"{ascmhl_scan.format_duration(elapsed)} ({summary.files / elapsed if elapsed else 0:,.0f} files/s)")
+    return 0
@@ -0,0 +1,175 @@
+import re
+import subprocess
+import threading
+import time
+
+import ascmhl_jobs
+import ascmhl_journal
+import ascmhl_scan
+
+# --- JOB EXECUTION ---
+# Runs one job described by a settings dict (see ascmhl_jobs.default_settings) with any engine and
+# mode. Nothing here imports Qt: the GUI runs jobs on a QThread, ascmhl_cli runs them headless.
+# The engine modules are imported when a job needs them, so the External CLI path starts fast.
+
+# Matches "progress ... NN%" on a single line, anywhere inside a chunk of output
+PROGRESS_RE = re.compile(r'progress[^\n]*?(\d{1,3})\s*%', re.IGNORECASE)
+CANCEL_POLL_INTERVAL = 0.2  # seconds between checks for a cancelled external ascmhl
+
+
+def check_engine_available(settings):
+    """Returns an error message if the engine a job needs cannot run, else None."""
+    if settings["engine"] == "Native Parallel" or settings.get("destinations") or settings.get("mode") in ("verify", "compare"):
+        # The native engine and offloads need the ascmhl Python package, not the ascmhl executable
+        try:
+            import ascmhl_engine
+        except ImportError as e:
+            return f"❌ ascmhl Python package not available for the native engine: {str(e)}"
+        return None
+    # Check if ascmhl is available before running, answered from the tool cache once it worked
+    import ascmhl_tools
+    try:
+        found = ascmhl_tools.find_ascmhl() is not None
+    except Exception:
+        found = False
+    if not found:
+        return "❌ ascmhl not found or not working. Please check installation and PATH."
+    return None
+
+
+def finish_journal(journal, returncode):
+    """Keep the journal of an unfinished job for Resume, drop it once the generation exists."""
+    if journal is None:
+        return
+    if returncode == 0:
+        journal.discard()
+    else:
+        journal.close()
+
+
+def run_command(cmd, journal=None, output=print, cancel=None, progress=None, throttle=None):
+    """Run an 'ascmhl create' command line, reading its output line by line. Returns its exit code.
+
+    Output lines are journaled for Resume. progress(percent) gets ascmhl's progress lines. Once cancel
+    is set, ascmhl and its children are killed and -1 is returned. throttle, an
+    ascmhl_throttle.JobThrottle, sets the priority of ascmhl and pauses it.
+    """
+    cancel = cancel or threading.Event()
+    options = ascmhl_jobs.new_process_group_options()
+    if throttle is not None:
+        import ascmhl_throttle
+        for key, value in ascmhl_throttle.popen_priority_options(throttle.priority).items():
+            options[key] = options.get(key, 0) | value
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, **options)
+    except FileNotFoundError:
+        finish_journal(journal, -1)
+        output("❌ ascmhl not found or not in PATH. Please check installation.")
+        return -1
+    if throttle is not None:
+        warning = throttle.attach(process.pid)
+        if warning:
+            output(warning)
+
+    def kill_when_cancelled():
+        while not cancel.wait(CANCEL_POLL_INTERVAL):
+            if process.poll() is not None:
+                return
+        if process.poll() is None:
+            ascmhl_jobs.kill_process_tree(process.pid)
+
+    threading.Thread(target=kill_when_cancelled, daemon=True, name="ascmhl-cancel").start()
+    try:
+        for line in process.stdout:
+            line = line.strip()
+            if journal is not None:
+                journal.feed(line)
+            output(line)
+            # Progress feedback: look for "Progress: XX%" in output
+            match = PROGRESS_RE.search(line) if progress is not None else None
+            if match:
+                progress(int(match.group(1)))
+        process.wait()
+    except BaseException:
+        ascmhl_jobs.kill_process_tree(process.pid)
+        finish_journal(journal, -1)
+        raise
+    finally:
+        if throttle is not None:
+            throttle.detach()
+    returncode = -1 if cancel.is_set() else process.returncode
+    finish_journal(journal, returncode)
+    return returncode
+
+
+def run_job(folder, settings, output=print, cancel=None, progress=None, scan=None, throttle=None, prescan=False):
+    """Run one job on folder: create, resume, verify, compare or offload. Returns an ascmhl-style exit code.
+
+    The job's telemetry is recorded (see ascmhl_telemetry). scan is a FolderScan of folder made
+    earlier; without one and with prescan=True the folder is scanned first, so files and bytes
+    are counted exactly and the throughput curve is recorded. Otherwise the folder is walked only
+    by the engine, and the counts come from the native engine's summary line. A finished job
+    reports whether it was CPU-bound or I/O-bound. throttle is an ascmhl_throttle.JobThrottle that
+    changes the priority, bandwidth cap and pause of the running job; by default one is made from
+    the "priority" and "bandwidth_limit" settings.
+    """
+    import ascmhl_telemetry
+    import ascmhl_throttle
+    cancel = cancel or threading.Event()
+    throttle = throttle or ascmhl_throttle.JobThrottle.from_settings(settings, cancel)
+    scan_seconds = None
+    if scan is None and prescan and settings.get("mode") != "compare":
+        started = time.perf_counter()
+        try:
+            scan = ascmhl_scan.scan_folder(folder, cancel)
+        except ascmhl_scan.ScanCancelled:
+            return -1
+        scan_seconds = time.perf_counter() - started
+    recorder = ascmhl_telemetry.JobRecorder(folder, settings, scan, scan_seconds)
+
+    def record_output(line):
+        recorder.feed(line)
+        output(line)
+
+    try:
+        returncode = _run_job(folder, settings, record_output, cancel, progress, throttle)
+    except BaseException:
+        recorder.close()
+        raise
+    for line in ascmhl_telemetry.summary_lines(recorder.finish(returncode, cancel.is_set())):
+        output(line)
+    return returncode
+
+
+def _run_job(folder, settings, output, cancel, progress, throttle):
+    options = ascmhl_jobs.engine_options(settings)
+    hash_formats = settings["hash_formats"]
+    if settings.get("mode") == "compare":
+        import ascmhl_compare
+        # A recorded format is compared without reading the disk, the selected one for plain folders or a rehash
+        other = settings["compare_with"]
+        rehash = settings.get("rehash", False)
+        recorded = not rehash and (ascmhl_compare.has_history(folder) or ascmhl_compare.has_history(other))
+        return ascmhl_compare.compare_trees(
+            folder, other, None if recorded else hash_formats[0], options["detect_renaming"], rehash,
+            workers=options["workers"], output=output, cancel=cancel, throttle=throttle
+        )
+    if settings.get("mode") == "verify":
+        import ascmhl_verify
+        return ascmhl_verify.verify_folder(
+            folder, options["workers"], options["per_device"], output=output, cancel=cancel,
+            io_strategy=options["io_strategy"], throttle=throttle
+        )
+    if settings.get("destinations"):
+        import ascmhl_offload
+        options.pop("resume")  # every destination gets a fresh copy and history
+        return ascmhl_offload.offload(
+            folder, settings["destinations"], hash_formats, settings.get("verify_copies", False),
+            output=output, cancel=cancel, throttle=throttle, **options
+        )
+    if settings["engine"] == "Native Parallel":
+        import ascmhl_engine
+        return ascmhl_engine.create_generation(folder, hash_formats, output=output, cancel=cancel, throttle=throttle,
+                                               **options)
+    journal = ascmhl_journal.ProgressJournal(folder, hash_formats)
+    return run_command(ascmhl_jobs.build_create_command(folder, settings), journal, output, cancel, progress, throttle)
@@ -0,0 +1,171 @@
+import os
+import re
+import time
+from collections import deque
+
+import ascmhl_records
+
+# --- PRE-FLIGHT FOLDER SCAN ---
+# Names ascmhl never hashes (see ascmhl.ignore.default_ignore_list)
+SCAN_IGNORED_NAMES = {".DS_Store", "ascmhl"}
+SCAN_REPORT_INTERVAL = 0.2  # seconds between progress callbacks while scanning
+# Trees where per-file overhead outweighs reading, such as DPX/EXR/ARRIRAW frame sequences
+SMALL_FILE_MIN_COUNT = 10000
+SMALL_FILE_MAX_AVERAGE = 16 * 1024 * 1024  # bytes
+
+
+class ScanCancelled(Exception):
+    pass
+
+
+class FolderScan:
+    """Result of scan_folder: file count, byte total and the relative path, size and mtime of every file."""
+
+    def __init__(self, root):
+        self.root = root
+        self.file_count = 0
+        self.total_bytes = 0
+        self.records = ascmhl_records.FileRecords(indexed=True)
+        self.duration = 0.0
+
+    @property
+    def small_file_heavy(self):
+        """True for many files of a few MB or less, which the native engine's small-file path suits."""
+        return (self.file_count >= SMALL_FILE_MIN_COUNT
+                and self.total_bytes / self.file_count <= SMALL_FILE_MAX_AVERAGE)
+
+
+def relative_key(path):
+    return path.replace("\\", "/")
+
+
+def iter_files(root, cancel=None):
+    """(relative path, os.stat_result) of every file below root that ascmhl create would hash, folder by folder.
+
+    cancel is an optional threading.Event; ScanCancelled is raised once it is set.
+    """
+    stack = [(root, "")]
+    while stack:
+        if cancel is not None and cancel.is_set():
+            raise ScanCancelled()
+        folder, prefix = stack.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name in SCAN_IGNORED_NAMES:
+                continue
+            try:
+                if entry.is_dir():
+                    # ascmhl does not descend into symlinked folders
+                    if not entry.is_symlink():
+                        stack.append((entry.path, prefix + entry.name + "/"))
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield prefix + entry.name, stat
+
+
+def scan_folder(root, cancel=None, progress=None):
+    """Count files and bytes below root with os.scandir, the way ascmhl create will see them.
+
+    cancel is an optional threading.Event; ScanCancelled is raised once it is set.
+    progress(file_count, total_bytes) is called every SCAN_REPORT_INTERVAL seconds.
+    """
+    scan = FolderScan(root)
+    started = last_report = time.perf_counter()
+    for relative, stat in iter_files(root, cancel):
+        size = stat.st_size
+        scan.records.add(relative, size, stat.st_mtime_ns)
+        scan.file_count += 1
+        scan.total_bytes += size
+        if progress is not None and scan.file_count % 1000 == 0:
+            now = time.perf_counter()
+            if now - last_report >= SCAN_REPORT_INTERVAL:
+                last_report = now
+                progress(scan.file_count, scan.total_bytes)
+    scan.duration = time.perf_counter() - started
+    return scan
+
+
+# --- BYTE-WEIGHTED PROGRESS FROM VERBOSE OUTPUT ---
+# One of these lines is printed per file and hash format by "ascmhl create -v" (and by an offload)
+FILE_LINE_RE = re.compile(
+    r'^\s*(?:created original hash for|verified|created new \(verif\.\) hash for|ERROR: hash mismatch for|copied)'
+    r'\s+(.+?)\s+(?:md5|sha1|sha256|xxh32|xxh64|xxh3|xxh128|c4)(?: \(old\))?:'
+)
+# The native engine's small-file path prints one line per folder instead, see ascmhl_engine.DirectoryProgress
+DIRECTORY_LINE_RE = re.compile(r'^📁 (\d+) files, (\d+) bytes: ')
+RATE_WINDOW = 10.0  # seconds of history used for the MB/s figure
+
+
+class ProgressTracker:
+    """Turns per-file output lines into done bytes, throughput and ETA using a FolderScan.
+
+    With per_directory=True progress comes from per-folder lines only, and file lines are
+    passed over so a file reported on its own (a hash mismatch) is not counted twice.
+    """
+
+    def __init__(self, scan, per_directory=False):
+        self.scan = scan
+        self.per_directory = per_directory
+        self._done = None if per_directory else bytearray(len(scan.records))  # 1 per record once counted
+        self.done_files = 0
+        self.done_bytes = 0
+        self.started = time.perf_counter()
+        self._samples = deque([(self.started, 0)])
+
+    def feed(self, line):
+        if self.per_directory:
+            match = DIRECTORY_LINE_RE.match(line)
+            if match:
+                self.done_files += int(match.group(1))
+                self.done_bytes += int(match.group(2))
+                return True
+        match = FILE_LINE_RE.match(line)
+        if not match:
+            return False
+        if self.per_directory:
+            return True
+        # Several hash formats print several lines for the same file; only the first counts
+        index = self.scan.records.find(relative_key(match.group(1)))
+        if index is not None and not self._done[index]:
+            self._done[index] = 1
+            self.done_files += 1
+            self.done_bytes += self.scan.records.size(index)
+        return True
+
+    def fraction(self):
+        if self.scan.total_bytes:
+            return min(1.0, self.done_bytes / self.scan.total_bytes)
+        return min(1.0, self.done_files / self.scan.file_count) if self.scan.file_count else 0.0
+
+    def rate(self):
+        """Bytes per second over the last RATE_WINDOW seconds."""
+        now = time.perf_counter()
+        samples = self._samples
+        samples.append((now, self.done_bytes))
+        while len(samples) > 2 and now - samples[0][0] > RATE_WINDOW:
+            samples.popleft()
+        elapsed = now - samples[0][0]
+        return (self.done_bytes - samples[0][1]) / elapsed if elapsed > 0 else 0.0
+
+    def eta(self, rate):
+        """Seconds left at the given rate, or None while the rate is unknown."""
+        if rate <= 0:
+            return None
+        return (self.scan.total_bytes - self.done_bytes) / rate
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if count < 1024 or unit == "TB":
+            return f"{count:.1f} {unit}" if unit != "B" else f"{count} B"
+        count /= 1024
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
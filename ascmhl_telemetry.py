@@ -0,0 +1,343 @@
+import json
+import os
+import platform
+import re
+import sys
+import threading
+import time
+
+import ascmhl_jobs
+import ascmhl_scan
+
+# --- RUN TELEMETRY ---
+# Every job run through ascmhl_run (GUI, queue and headless) appends one JSON line to
+# telemetry.jsonl in the app data folder: scan and hashing time, files, bytes, throughput over
+# the run, peak memory, the CPU/wait split, exit code and ascmhl version. Ingest stations can
+# also write a Prometheus textfile-collector file, set on the Logs tab or with
+# ascmhl_cli.py --prometheus, so node_exporter publishes running totals and the last job.
+TELEMETRY_MAX_BYTES = 8 * 1024 * 1024  # telemetry.jsonl is rotated to telemetry.jsonl.1 beyond this
+TELEMETRY_HISTORY_LIMIT = 500  # records loaded for the Logs tab history
+HISTORY_READ_BLOCK = 64 * 1024
+THROUGHPUT_SAMPLE_INTERVAL = 2.0  # seconds between throughput samples, doubled whenever they fill up
+THROUGHPUT_MAX_SAMPLES = 120
+BOUND_MIN_SECONDS = 1.0  # shorter jobs are not reported as CPU-bound or I/O-bound
+RECORD_VERSION = 1
+# Summary line of the native engine (ascmhl_engine.create_generation), counts for jobs run without a scan
+ENGINE_TOTALS_RE = re.compile(r"^⚙️ Hashed (\d+) files, ([\d.]+) MB")
+
+# Settings changed for this process only, e.g. by command line options
+config_overrides = {}
+_write_lock = threading.Lock()
+_active_lock = threading.Lock()
+_active = set()  # JobRecorders of the jobs running in this process
+
+
+def telemetry_file():
+    return os.path.join(ascmhl_jobs.app_data_dir(), "telemetry.jsonl")
+
+
+def config_file():
+    return os.path.join(ascmhl_jobs.app_data_dir(), "telemetry.json")
+
+
+def totals_file():
+    return os.path.join(ascmhl_jobs.app_data_dir(), "telemetry_totals.json")
+
+
+def load_config(path=None):
+    """{"enabled": bool, "prometheus_file": path or None} saved by the Logs tab, with config_overrides applied."""
+    config = {"enabled": True, "prometheus_file": None}
+    try:
+        with open(path or config_file(), "r", encoding="utf-8") as file:
+            config.update(json.load(file))
+    except (OSError, ValueError):
+        pass
+    config.update(config_overrides)
+    return config
+
+
+def save_config(config, path=None):
+    _write_json(path or config_file(), {key: config[key] for key in ("enabled", "prometheus_file")})
+
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=4)
+    os.replace(tmp_path, path)
+
+
+def ascmhl_version():
+    try:
+        from importlib.metadata import version
+        return version("ascmhl")
+    except Exception:
+        return "unknown"
+
+
+def peak_rss_bytes():
+    """Largest resident set of this process or any job it ran, None where the resource module is missing (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is in bytes on macOS, KB elsewhere
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * scale
+
+
+def _cpu_times():
+    """(user, system) seconds of this process and the reaped external ascmhl processes."""
+    times = os.times()
+    return times.user + times.children_user, times.system + times.children_system
+
+
+class JobRecorder:
+    """Collects the telemetry of one job. feed() every output line, then finish(returncode).
+
+    With a FolderScan the per-file output lines give byte-accurate progress, sampled every
+    THROUGHPUT_SAMPLE_INTERVAL seconds into the throughput curve of the run. CPU time and peak
+    memory can only be measured for the whole process, so they are left out (None) of the
+    record of a job that overlapped with another job of the same process, e.g. on the Queue
+    tab. The peak is also left out when the job did not raise the process's high-water mark,
+    since an earlier job's peak would be reported otherwise.
+    """
+
+    def __init__(self, folder, settings, scan=None, scan_seconds=None):
+        self.folder = folder
+        self.settings = settings
+        self.scan = scan
+        self.scan_seconds = scan.duration if scan_seconds is None and scan is not None else scan_seconds
+        self.tracker = (ascmhl_scan.ProgressTracker(scan, settings.get("small_files", False))
+                        if scan is not None else None)
+        self.started = time.time()
+        self._started_clock = time.perf_counter()
+        self._started_cpu = _cpu_times()
+        self._started_peak = peak_rss_bytes()
+        with _active_lock:
+            self.overlapped = bool(_active)
+            for recorder in _active:
+                recorder.overlapped = True
+            _active.add(self)
+        self._interval = THROUGHPUT_SAMPLE_INTERVAL
+        self._last_sample = (self._started_clock, 0)
+        self.samples = []  # [seconds since start, bytes/s since the previous sample]
+        self.engine_totals = None  # (files, bytes) from the native engine's summary, without a scan
+
+    def feed(self, line):
+        if self.tracker is None:
+            match = ENGINE_TOTALS_RE.match(line)
+            if match:
+                self.engine_totals = (int(match.group(1)), round(float(match.group(2)) * 1024 * 1024))
+            return
+        if not self.tracker.feed(line):
+            return
+        now = time.perf_counter()
+        last_clock, last_bytes = self._last_sample
+        if now - last_clock < self._interval:
+            return
+        self.samples.append([round(now - self._started_clock, 1),
+                             round((self.tracker.done_bytes - last_bytes) / (now - last_clock))])
+        self._last_sample = (now, self.tracker.done_bytes)
+        if len(self.samples) >= THROUGHPUT_MAX_SAMPLES:
+            # Keep the whole run in view at half the resolution
+            self.samples = [[b[0], (a[1] + b[1]) // 2] for a, b in zip(self.samples[::2], self.samples[1::2])]
+            self._interval *= 2
+
+    def close(self):
+        """Stop counting the job as running without a record, e.g. when it could not start."""
+        with _active_lock:
+            _active.discard(self)
+
+    def finish(self, returncode, aborted=False):
+        """The record of the finished job. It is also written to the telemetry files when enabled."""
+        import ascmhl_hashbench
+        hash_seconds = time.perf_counter() - self._started_clock
+        self.close()
+        cores = ascmhl_hashbench.usable_cores(self.settings)
+        cpu_user = cpu_system = wait = bound = utilisation = peak = None
+        if not self.overlapped:
+            user, system = _cpu_times()
+            cpu_user, cpu_system = user - self._started_cpu[0], system - self._started_cpu[1]
+            bound, utilisation = ascmhl_hashbench.classify_job(cpu_user, hash_seconds, cores)
+            # Wall time the usable cores were idle, mostly waiting for reads and writes
+            wait = max(0.0, hash_seconds - (cpu_user + cpu_system) / cores)
+            peak = peak_rss_bytes()
+            if peak is not None and self._started_peak is not None and peak <= self._started_peak:
+                peak = None
+        done_files, done_bytes = self.engine_totals or (None, None)
+        if self.tracker is not None:
+            done_files, done_bytes = self.tracker.done_files, self.tracker.done_bytes
+        settings = self.settings
+        record = {
+            "version": RECORD_VERSION,
+            "host": platform.node(),
+            "ascmhl_version": ascmhl_version(),
+            "folder": self.folder,
+            "mode": settings.get("mode") or ("offload" if settings.get("destinations") else "create"),
+            "engine": settings["engine"],
+            "hash_formats": settings["hash_formats"],
+            "started": round(self.started, 3),
+            "finished": round(time.time(), 3),
+            "returncode": returncode,
+            "status": "aborted" if aborted or returncode == -1 else "ok" if returncode == 0 else "failed",
+            "scan_s": round(self.scan_seconds, 3) if self.scan_seconds is not None else None,
+            "hash_s": round(hash_seconds, 3),
+            "total_files": self.scan.file_count if self.scan is not None else None,
+            "total_bytes": self.scan.total_bytes if self.scan is not None else None,
+            "files": done_files,
+            "bytes": done_bytes,
+            "bytes_per_s": round(done_bytes / hash_seconds) if done_bytes is not None and hash_seconds > 0 else None,
+            "throughput": self.samples,
+            "peak_rss_bytes": peak,
+            "cpu_user_s": round(cpu_user, 3) if cpu_user is not None else None,
+            "cpu_system_s": round(cpu_system, 3) if cpu_system is not None else None,
+            "wait_s": round(wait, 3) if wait is not None else None,
+            "cores": cores,
+            "bound": bound,
+            "utilisation": round(utilisation, 3) if utilisation is not None else None,
+            "overlapped": self.overlapped,
+        }
+        config = load_config()
+        if config["enabled"]:
+            try:
+                write_record(record, config)
+            except OSError as e:
+                record["telemetry_error"] = str(e)
+        return record
+
+
+def summary_lines(record):
+    """Log lines for a finished job: CPU-bound or I/O-bound, and where its telemetry went."""
+    lines = []
+    if record["status"] != "aborted" and record["hash_s"] >= BOUND_MIN_SECONDS and record["bound"] is not None:
+        icon = "🧮" if record["bound"] == "CPU-bound" else "💽"
+        cores = record["cores"]
+        lines.append(f"{icon} {record['bound']}: {record['utilisation']:.0%} of {cores} core{'s' if cores > 1 else ''} "
+                     f"busy over {record['hash_s']:.1f}s")
+    if "telemetry_error" in record:
+        lines.append(f"⚠️ Telemetry not written: {record['telemetry_error']}")
+    return lines
+
+
+def write_record(record, config=None):
+    """Append record to telemetry.jsonl and refresh the Prometheus file if one is set."""
+    config = config or load_config()
+    path = telemetry_file()
+    line = (json.dumps(record) + "\n").encode("utf-8")
+    with _write_lock:
+        try:
+            if os.path.getsize(path) + len(line) > TELEMETRY_MAX_BYTES:
+                os.replace(path, path + ".1")
+        except OSError:
+            pass
+        # One write on an O_APPEND file, so the GUI and ascmhl_cli can append at the same time
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+        if config.get("prometheus_file"):
+            totals = _add_to_totals(record)
+            write_prometheus(config["prometheus_file"], totals, record)
+
+
+def load_history(limit=TELEMETRY_HISTORY_LIMIT, path=None):
+    """The last limit records of telemetry.jsonl, oldest first.
+
+    The file is read backwards in blocks until limit lines are found, so the Logs tab does not
+    parse megabytes of old records at startup.
+    """
+    lines = []
+    try:
+        with open(path or telemetry_file(), "rb") as file:
+            position = file.seek(0, os.SEEK_END)
+            tail = b""
+            while position > 0 and len(lines) <= limit:
+                size = min(HISTORY_READ_BLOCK, position)
+                position -= size
+                file.seek(position)
+                block = file.read(size) + tail
+                # The first line of a block may be incomplete until the block before it is read
+                tail, *complete = block.split(b"\n")
+                lines[:0] = [line for line in complete if line]
+            if position == 0 and tail:
+                lines.insert(0, tail)
+    except OSError:
+        pass
+    records = []
+    for line in lines[-(limit + 1):]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue  # a line cut short by a crash
+    return records[-limit:]
+
+
+# --- PROMETHEUS TEXTFILE ---
+def _add_to_totals(record):
+    """Running counters kept in telemetry_totals.json, so they survive restarts and log rotation."""
+    try:
+        with open(totals_file(), "r", encoding="utf-8") as file:
+            totals = json.load(file)
+    except (OSError, ValueError):
+        totals = {}
+    mode, status = record["mode"], record["status"]
+    for key, value in (
+        (f"jobs|{mode}|{status}", 1),
+        (f"bytes|{mode}", record["bytes"] or 0),
+        (f"files|{mode}", record["files"] or 0),
+        (f"scan_seconds|{mode}", record["scan_s"] or 0),
+        (f"hash_seconds|{mode}", record["hash_s"]),
+    ):
+        totals[key] = totals.get(key, 0) + value
+    _write_json(totals_file(), totals)
+    return totals
+
+
+def _labels(**labels):
+    escaped = (str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+
+def write_prometheus(path, totals, last):
+    """Write the counters and the last job as a node_exporter textfile (replaced atomically)."""
+    lines = [
+        "# HELP ascmhl_info Host and ascmhl version of the station.",
+        "# TYPE ascmhl_info gauge",
+        f"ascmhl_info{_labels(host=last['host'], version=last['ascmhl_version'])} 1",
+    ]
+    counters = {
+        "jobs": ("ascmhl_jobs_total", "Finished jobs.", ("mode", "status")),
+        "bytes": ("ascmhl_bytes_total", "Bytes hashed.", ("mode",)),
+        "files": ("ascmhl_files_total", "Files hashed.", ("mode",)),
+        "scan_seconds": ("ascmhl_scan_seconds_total", "Time spent scanning folders.", ("mode",)),
+        "hash_seconds": ("ascmhl_hash_seconds_total", "Time spent running jobs.", ("mode",)),
+    }
+    for kind, (name, help_text, label_names) in counters.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for key in sorted(totals):
+            parts = key.split("|")
+            if parts[0] == kind:
+                lines.append(f"{name}{_labels(**dict(zip(label_names, parts[1:])))} {totals[key]}")
+    labels = _labels(mode=last["mode"], engine=last["engine"], hash_format=last["hash_formats"][0])
+    for name, help_text, value in (
+        ("ascmhl_last_job_finished_timestamp_seconds", "When the last job finished.", last["finished"]),
+        ("ascmhl_last_job_exit_code", "Exit code of the last job.", last["returncode"]),
+        ("ascmhl_last_job_scan_seconds", "Folder scan time of the last job.", last["scan_s"]),
+        ("ascmhl_last_job_hash_seconds", "Run time of the last job.", last["hash_s"]),
+        ("ascmhl_last_job_bytes", "Bytes hashed by the last job.", last["bytes"]),
+        ("ascmhl_last_job_files", "Files hashed by the last job.", last["files"]),
+        ("ascmhl_last_job_bytes_per_second", "Average throughput of the last job.", last["bytes_per_s"]),
+        ("ascmhl_last_job_peak_rss_bytes", "Peak resident memory while running the last job.", last["peak_rss_bytes"]),
+        ("ascmhl_last_job_cpu_user_seconds", "User CPU time of the last job.", last["cpu_user_s"]),
+        ("ascmhl_last_job_cpu_system_seconds", "System CPU time of the last job.", last["cpu_system_s"]),
+        ("ascmhl_last_job_wait_seconds", "Time the last job's cores waited, mostly on I/O.", last["wait_s"]),
+    ):
+        if value is not None:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name}{labels} {value}"]
+    # node_exporter only reads *.prom files, so the partial file is never collected
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
@@ -0,0 +1,216 @@
+import os
+import platform
+import signal
+import sys
+import threading
+import time
+
+import ascmhl_jobs
+
+# --- PRIORITY, BANDWIDTH AND PAUSE ---
+# A job runs in a priority class so hashing can share an ingest station with a live card offload.
+# The external ascmhl and the processes it starts get the class as nice + ionice (Linux, macOS) or as
+# a priority class + I/O priority (Windows). In-process reads run on the job's own threads, which get
+# the same nice and ionice on Linux (both are per thread there). In-process reads are also capped in
+# MB/s with a token bucket. Pause stops the reads: the external ascmhl is stopped (SIGSTOP, or
+# suspended on Windows), in-process reads wait before their next chunk.
+# Lowering a running job's priority always works. Raising it (background -> normal, or urgent at
+# all) needs CAP_SYS_NICE/root on Linux and macOS, or administrator rights on Windows for urgent I/O.
+PRIORITIES = ["background", "normal", "urgent"]
+NICE = {"background": 19, "normal": 0, "urgent": -5}
+IOPRIO_CLASS_BE, IOPRIO_CLASS_IDLE = 2, 3
+IONICE = {"background": (IOPRIO_CLASS_IDLE, 0), "normal": (IOPRIO_CLASS_BE, 4), "urgent": (IOPRIO_CLASS_BE, 0)}
+WINDOWS_PRIORITY_CLASS = {"background": 0x40, "normal": 0x20, "urgent": 0x8000}  # IDLE, NORMAL, ABOVE_NORMAL
+WINDOWS_IO_PRIORITY = {"background": 0, "normal": 2, "urgent": 2}  # very low, normal (high needs admin)
+BURST_SECONDS = 0.25  # bytes a capped job may read at once, in seconds of its rate
+PAUSE_POLL_INTERVAL = 0.2  # seconds between checks for a cancelled job while paused or throttled
+# ioprio_set has no libc wrapper; its number differs per architecture
+IOPRIO_SET_SYSCALL = {"x86_64": 251, "i686": 289, "i386": 289, "aarch64": 30, "riscv64": 30, "armv7l": 314,
+                      "ppc64le": 273}
+IOPRIO_WHO_PROCESS = 1
+
+_libc = None
+
+
+def _ioprio_set(pid, priority):
+    """Set the I/O class of a Linux process or thread. False when the kernel refused or is not Linux."""
+    number = IOPRIO_SET_SYSCALL.get(platform.machine())
+    if not sys.platform.startswith("linux") or number is None:
+        return False
+    global _libc
+    if _libc is None:
+        import ctypes
+        _libc = ctypes.CDLL(None, use_errno=True)
+    io_class, level = IONICE[priority]
+    return _libc.syscall(number, IOPRIO_WHO_PROCESS, pid, (io_class << 13) | level) == 0
+
+
+def _windows_process(pid, access):
+    import ctypes
+    return ctypes.windll.kernel32.OpenProcess(access, False, pid)
+
+
+def set_process_priority(pid, priority):
+    """Apply a priority class to a process and everything it started. Returns a warning or None."""
+    refused = False
+    for p in [pid] + ascmhl_jobs.descendant_pids(pid):
+        if sys.platform == "win32":
+            import ctypes
+            handle = _windows_process(p, 0x0200)  # PROCESS_SET_INFORMATION
+            if not handle:
+                continue
+            refused |= not ctypes.windll.kernel32.SetPriorityClass(handle, WINDOWS_PRIORITY_CLASS[priority])
+            io_priority = ctypes.c_ulong(WINDOWS_IO_PRIORITY[priority])
+            # ProcessIoPriority (33)
+            ctypes.windll.ntdll.NtSetInformationProcess(handle, 33, ctypes.byref(io_priority), ctypes.sizeof(io_priority))
+            ctypes.windll.kernel32.CloseHandle(handle)
+            continue
+        try:
+            os.setpriority(os.PRIO_PROCESS, p, NICE[priority])
+        except PermissionError:
+            refused = True
+        except OSError:
+            continue  # exited in the meantime
+        _ioprio_set(p, priority)
+    if refused:
+        return f"⚠️ Not allowed to raise the priority of the running job to {priority}, it keeps its lower priority."
+    return None
+
+
+def signal_process_tree(pid, pause):
+    """Stop (pause=True) or continue a process and everything it started."""
+    pids = [pid] + ascmhl_jobs.descendant_pids(pid)
+    if sys.platform == "win32":
+        import ctypes
+        for p in pids:
+            handle = _windows_process(p, 0x0800)  # PROCESS_SUSPEND_RESUME
+            if handle:
+                (ctypes.windll.ntdll.NtSuspendProcess if pause else ctypes.windll.ntdll.NtResumeProcess)(handle)
+                ctypes.windll.kernel32.CloseHandle(handle)
+        return
+    for p in pids:
+        try:
+            os.kill(p, signal.SIGSTOP if pause else signal.SIGCONT)
+        except OSError:
+            pass
+
+
+def popen_priority_options(priority):
+    """Popen keyword arguments that start a process in a priority class where the platform allows it."""
+    if sys.platform == "win32" and priority != "normal":
+        return {"creationflags": WINDOWS_PRIORITY_CLASS[priority]}
+    return {}
+
+
+class JobThrottle:
+    """Live controls of one job: its priority class, a read bandwidth cap and pause. Thread-safe.
+
+    The external ascmhl is attach()ed by its pid. In-process readers call consume() after every
+    chunk they read; it waits while the job is paused and keeps the reads under the cap. Waiting
+    ends early once cancel is set, so an aborted job is never held up here.
+    """
+
+    def __init__(self, priority="normal", limit_mb_s=0, cancel=None):
+        self.cancel = cancel or threading.Event()
+        self.priority = priority if priority in PRIORITIES else "normal"
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._running.set()
+        self._pid = None
+        self._rate = 0
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self._generation = 0 if self.priority == "normal" else 1  # threads apply newer priorities
+        self._applied = threading.local()
+        self.set_limit(limit_mb_s)
+
+    @classmethod
+    def from_settings(cls, settings, cancel=None):
+        return cls(settings.get("priority", "normal"), settings.get("bandwidth_limit", 0), cancel)
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    @property
+    def limit_mb_s(self):
+        return self._rate / 1e6
+
+    def set_limit(self, limit_mb_s):
+        """Cap in-process reads at limit_mb_s (MB/s, 0 for no cap)."""
+        with self._lock:
+            self._rate = max(0.0, float(limit_mb_s or 0)) * 1e6
+            self._tokens = min(self._tokens, self._rate * BURST_SECONDS) if self._rate else 0.0
+            self._updated = time.monotonic()
+
+    def set_priority(self, priority):
+        """Change the priority class. Returns a warning when the running ascmhl may not be raised, else None."""
+        with self._lock:
+            self.priority = priority
+            self._generation += 1
+            pid = self._pid
+        return set_process_priority(pid, priority) if pid is not None else None
+
+    def pause(self):
+        with self._lock:
+            self._running.clear()
+            pid = self._pid
+        if pid is not None:
+            signal_process_tree(pid, pause=True)
+
+    def resume(self):
+        with self._lock:
+            self._running.set()
+            pid = self._pid
+        if pid is not None:
+            signal_process_tree(pid, pause=False)
+
+    def attach(self, pid):
+        """Control the external ascmhl started as pid: apply the priority and a pause made before it started."""
+        with self._lock:
+            self._pid = pid
+            priority, paused = self.priority, self.paused
+        warning = set_process_priority(pid, priority) if priority != "normal" else None
+        if paused:
+            signal_process_tree(pid, pause=True)
+        return warning
+
+    def detach(self):
+        with self._lock:
+            self._pid = None
+
+    def consume(self, nbytes):
+        """Account for nbytes read on this thread. Blocks while paused or while the job is over its cap."""
+        if getattr(self._applied, "generation", 0) != self._generation:
+            self._applied.generation = self._generation
+            self._apply_to_thread()
+        while True:
+            while not self._running.wait(PAUSE_POLL_INTERVAL):
+                if self.cancel.is_set():
+                    return
+            with self._lock:
+                rate = self._rate
+                if not rate:
+                    return
+                now = time.monotonic()
+                self._tokens = min(rate * BURST_SECONDS, self._tokens + (now - self._updated) * rate)
+                self._updated = now
+                if self._tokens >= 0:
+                    # Reads are charged after the fact; the debt makes the next readers wait
+                    self._tokens -= nbytes
+                    return
+                wait = -self._tokens / rate
+            if self.cancel.is_set():
+                return
+            time.sleep(min(wait, PAUSE_POLL_INTERVAL))
+
+    def _apply_to_thread(self):
+        # nice and ioprio are per thread on Linux only; elsewhere they would change the whole GUI
+        if not sys.platform.startswith("linux"):
+            return
+        thread_id = threading.get_native_id()
+        try:
+            os.setpriority(os.PRIO_PROCESS, thread_id, NICE[self.priority])
+        except OSError:
+            pass  # raising needs CAP_SYS_NICE; the thread keeps its lower priority
+        _ioprio_set(thread_id, self.priority)
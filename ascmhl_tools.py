@@ -0,0 +1,134 @@
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+import ascmhl_jobs
+
+# --- TOOL DISCOVERY ---
+# 'ascmhl --version' starts a whole Python interpreter and imports ascmhl, so its result is kept
+# in tools.json in the app data folder, keyed by the resolved path, mtime and size of the ascmhl
+# executable. pip rewrites the executable on every install or upgrade, which invalidates the entry.
+# The latest release on PyPI is cached the same way for UPDATE_CHECK_TTL; a check that fails
+# (offline, proxy) is cached for UPDATE_CHECK_RETRY so offline launches do not wait on it again.
+UPDATE_CHECK_TTL = 24 * 3600  # seconds a successful PyPI check is reused
+UPDATE_CHECK_RETRY = 15 * 60  # seconds before a failed PyPI check is retried
+UPDATE_CHECK_TIMEOUT = 3.0  # seconds for the PyPI request
+VERSION_TIMEOUT = 30  # seconds for 'ascmhl --version' (first start after install compiles ascmhl)
+PYPI_URL = "https://pypi.org/pypi/ascmhl/json"
+
+_lock = threading.Lock()
+_memo = None  # tools.json of this process, loaded once
+
+
+def cache_file():
+    return os.path.join(ascmhl_jobs.app_data_dir(), "tools.json")
+
+
+def _load():
+    global _memo
+    if _memo is None:
+        try:
+            with open(cache_file(), "r", encoding="utf-8") as file:
+                _memo = json.load(file)
+        except (OSError, ValueError):
+            _memo = {}
+    return _memo
+
+
+def _save():
+    path = cache_file()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(_memo, file, indent=4)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # a read-only app data folder only costs the next launch a version check
+
+
+def parse_version(version_text):
+    """'ascmhl, version 1.0.2' -> '1.0.2'."""
+    return version_text.split("version")[-1].strip(" ,:") if "version" in version_text else version_text.strip()
+
+
+def _executable_key(path):
+    stat = os.stat(path)
+    return [os.path.realpath(path), stat.st_mtime_ns, stat.st_size]
+
+
+def find_ascmhl(refresh=False):
+    """{"path", "version_text", "version"} of the ascmhl executable on PATH, or None when there is none.
+
+    Only runs 'ascmhl --version' when the executable changed since the cached check or refresh is
+    set. Raises subprocess.CalledProcessError (or TimeoutExpired) when ascmhl is found but broken.
+    """
+    path = shutil.which("ascmhl")
+    if path is None:
+        return None
+    try:
+        key = _executable_key(path)
+    except OSError:
+        return None
+    with _lock:
+        entry = _load().get("ascmhl")
+        if not refresh and entry and entry["key"] == key:
+            return entry
+    result = subprocess.run([path, "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True,
+                            timeout=VERSION_TIMEOUT)
+    version_text = result.stdout.strip()
+    entry = {"key": key, "path": path, "version_text": version_text, "version": parse_version(version_text),
+             "checked": time.time()}
+    with _lock:
+        _load()["ascmhl"] = entry
+        _save()
+    return entry
+
+
+def forget_ascmhl():
+    """Drop the cached executable, e.g. after an install or upgrade was requested."""
+    with _lock:
+        if _load().pop("ascmhl", None) is not None:
+            _save()
+
+
+def installed_version():
+    """Version of the ascmhl Python package, without importing it, or None."""
+    try:
+        from importlib.metadata import version
+        return version("ascmhl")
+    except Exception:
+        return None
+
+
+def latest_version(max_age=UPDATE_CHECK_TTL, fetch=True):
+    """Latest ascmhl release on PyPI, or None when it could not be determined.
+
+    A cached answer younger than max_age is returned without touching the network; so is the
+    result of a failed check younger than UPDATE_CHECK_RETRY. With fetch=False nothing is fetched.
+    """
+    with _lock:
+        entry = _load().get("pypi")
+    now = time.time()
+    if entry is not None:
+        age = now - entry["checked"]
+        if (entry["version"] and age < max_age) or (not entry["version"] and age < UPDATE_CHECK_RETRY) or not fetch:
+            return entry["version"]
+    elif not fetch:
+        return None
+    version = _fetch_latest_version()
+    with _lock:
+        _load()["pypi"] = {"version": version, "checked": now}
+        _save()
+    return version
+
+
+def _fetch_latest_version():
+    import urllib.request
+    try:
+        with urllib.request.urlopen(PYPI_URL, timeout=UPDATE_CHECK_TIMEOUT) as response:
+            return json.load(response)["info"]["version"]
+    except Exception:
+        return None
@@ -0,0 +1,317 @@
+import os
+import threading
+import time
+from collections import deque
+
+from ascmhl.hasher import new_hasher_for_hash_type
+
+import ascmhl_engine
+import ascmhl_index
+import ascmhl_records
+import ascmhl_scan
+
+# --- PARALLEL VERIFY ---
+# Re-hashes the files recorded in the latest generation of every history below a folder.
+# Work is queued per device; a worker takes from its own device first and steals from the others
+# when that device is idle or at its read limit. Digests are sequential, so a large file is split
+# into chunks that several workers read at the same time while the chunks are hashed in order.
+VERIFY_CHUNK_SIZE = 32 * 1024 * 1024  # files larger than two chunks are read in parallel chunks
+VERIFY_CHUNK_WINDOW = 4  # chunks of one file read ahead of the hashing position
+# Verify with the fastest recorded format, one digest per file proves the content
+FORMAT_PREFERENCE = ["xxh3", "xxh128", "xxh64", "xxh32", "md5", "sha1", "c4"]
+
+
+def expected_files(root, cancel=None):
+    """FileRecords of the files in the latest generation of the history at root and of every nested history.
+
+    Paths are relative to root. Only digests of FORMAT_PREFERENCE formats are kept, failed ones
+    left out, and a path listed once per hash format is one record with several digests.
+    """
+    newest = {}
+    for history, file in ascmhl_index.generation_files(root, cancel):
+        newest[history] = file  # names sort by generation number
+    records = ascmhl_records.FileRecords(indexed=True)
+    for history, file in newest.items():
+        prefix = os.path.relpath(history, root).replace("\\", "/")
+        prefix = "" if prefix == "." else prefix + "/"
+        for path, size, hashes in ascmhl_index.iter_generation(file):
+            if path is None:
+                continue
+            path = prefix + path
+            hashes = {algorithm: digest for algorithm, digest, action in hashes
+                      if action != "failed" and algorithm in FORMAT_PREFERENCE}
+            if not hashes:
+                continue
+            index = records.find(path)
+            if index is None:
+                records.add(path, size, hashes=hashes)
+            else:
+                records.set_hashes(index, hashes)
+    return records
+
+
+def preferred_format(records, index):
+    """The fastest format a record has a digest of, or None."""
+    for hash_format in FORMAT_PREFERENCE:
+        if records.digest(index, hash_format) is not None:
+            return hash_format
+    return None
+
+
+class _LargeFile:
+    """Hashing state of a file that is read in chunks by several workers."""
+
+    def __init__(self, index, hash_format, fd, size):
+        self.index = index
+        self.hash_format = hash_format
+        self.fd = fd
+        self.size = size
+        self.hasher = new_hasher_for_hash_type(hash_format)
+        self.lock = threading.Lock()
+        self.pending = {}  # offset -> chunk read but not hashed yet
+        self.hashed = 0
+        self.next_chunk = 0
+        self.in_flight = 0
+        self.hashing = False
+        self.finished = False
+        self.error = None
+
+
+class ParallelVerifyJob:
+    def __init__(self, root, workers=None, per_device=None, output=print, cancel=None, io_strategy="auto",
+                 throttle=None):
+        self.root = os.path.abspath(root)
+        self.io_strategy = io_strategy
+        self.throttle = throttle
+        self.workers = max(1, workers or ascmhl_engine.DEFAULT_WORKERS)
+        self.per_device = max(1, per_device or ascmhl_engine.DEFAULT_PER_DEVICE)
+        self.output = output
+        self.cancel = cancel or threading.Event()
+        self.files_verified = 0
+        self.bytes_verified = 0
+        self.records = None  # the expected files, their status is DONE, FAILED or MISSING once checked
+        self._queues = {}  # device -> deque of tasks
+        self._active = {}  # device -> reads in progress
+        self._outstanding = 0
+        self._condition = threading.Condition()
+        self._open_files = set()  # _LargeFile states whose fd is open
+
+    # -- scheduling --
+    def _push(self, device, task, urgent=False):
+        with self._condition:
+            tasks = self._queues.setdefault(device, deque())
+            self._active.setdefault(device, 0)
+            tasks.appendleft(task) if urgent else tasks.append(task)
+            self._outstanding += 1
+            self._condition.notify()
+
+    def _take(self, home):
+        with self._condition:
+            while True:
+                if self.cancel.is_set() or self._outstanding == 0:
+                    return None, None
+                devices = list(self._queues)
+                if devices:
+                    start = home % len(devices)
+                    for device in devices[start:] + devices[:start]:
+                        if self._queues[device] and self._active[device] < self.per_device:
+                            self._active[device] += 1
+                            return device, self._queues[device].popleft()
+                self._condition.wait(0.5)
+
+    def _done(self, device):
+        with self._condition:
+            self._active[device] -= 1
+            self._outstanding -= 1
+            self._condition.notify_all()
+
+    def _worker(self, home):
+        while True:
+            device, task = self._take(home)
+            if task is None:
+                return
+            try:
+                task[0](device, *task[1:])
+            finally:
+                self._done(device)
+
+    # -- tasks --
+    @property
+    def mismatches(self):
+        return self.records.count(ascmhl_records.FAILED) if self.records is not None else 0
+
+    @property
+    def missing(self):
+        return self.records.count(ascmhl_records.MISSING) if self.records is not None else 0
+
+    def _report(self, index, hash_format, found, size):
+        relative = self.records.path(index)
+        expected = self.records.digest(index, hash_format)
+        with self._condition:
+            self.files_verified += 1
+            self.bytes_verified += size
+        if found == expected:
+            self.records.set_status(index, ascmhl_records.DONE)
+            self.output(f"  verified                      {relative}  {hash_format}: OK")
+            return
+        self.records.set_status(index, ascmhl_records.FAILED)
+        self.output(f"ERROR: hash mismatch for        {relative}  "
+                    f"{hash_format} (old): {expected}, {hash_format} (new): {found}")
+
+    def _report_error(self, index, error):
+        self.records.set_status(index, ascmhl_records.FAILED)
+        self.output(f"ERROR: could not read {self.records.path(index)}: {str(error)}")
+
+    def _verify_file(self, device, index, hash_format, size):
+        path = os.path.join(self.root, self.records.path(index))
+        try:
+            result, size = ascmhl_engine.hash_file_single_pass(path, [hash_format], strategy=self.io_strategy,
+                                                               throttle=self.throttle)
+        except OSError as e:
+            self._report_error(index, e)
+            return
+        self._report(index, hash_format, result[hash_format], size)
+
+    def _open_large_file(self, device, index, hash_format, size):
+        try:
+            fd = os.open(os.path.join(self.root, self.records.path(index)), os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except OSError as e:
+            self._report_error(index, e)
+            return
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        state = _LargeFile(index, hash_format, fd, size)
+        with self._condition:
+            self._open_files.add(state)
+        for _ in range(VERIFY_CHUNK_WINDOW):
+            self._queue_next_chunk(device, state)
+
+    def _queue_next_chunk(self, device, state):
+        with state.lock:
+            offset = state.next_chunk * VERIFY_CHUNK_SIZE
+            if offset >= state.size or state.finished:
+                return
+            state.next_chunk += 1
+            state.in_flight += 1
+        # Chunks go to the front so started files finish before new ones are opened
+        self._push(device, (self._read_chunk, state, offset), urgent=True)
+
+    def _read_chunk(self, device, state, offset):
+        try:
+            data = self._pread(state, offset)
+        except OSError as e:
+            data, error = None, e
+        if self.throttle is not None and data:
+            self.throttle.consume(len(data))
+        with state.lock:
+            state.in_flight -= 1
+            if data is None and not state.finished:
+                state.finished, state.error = True, error
+            elif not state.finished:
+                state.pending[offset] = data
+            if state.hashing or state.finished:
+                return self._close_if_idle(state)
+            state.hashing = True
+        while True:
+            with state.lock:
+                data = state.pending.pop(state.hashed, None)
+                if data is None:
+                    state.hashing = False
+                    return
+            # Hashing happens outside the lock while other workers keep reading
+            state.hasher.update(data)
+            with state.lock:
+                state.hashed += len(data)
+                if state.hashed >= state.size or not data:
+                    state.finished = True
+                    state.hashing = False
+                    self._close_if_idle(state)
+                    break
+            self._queue_next_chunk(device, state)
+
+    def _close_if_idle(self, state):
+        """Close the file and report once it is finished and no chunk read is using it. Holds state.lock."""
+        if not state.finished or state.in_flight or state.hashing or state.fd is None:
+            return
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(state.fd, 0, 0, os.POSIX_FADV_DONTNEED)  # leave the page cache to other applications
+        os.close(state.fd)
+        state.fd = None
+        with self._condition:
+            self._open_files.discard(state)
+        if state.error is not None:
+            self._report_error(state.index, state.error)
+        else:
+            self._report(state.index, state.hash_format, state.hasher.string_digest(), state.size)
+
+    @staticmethod
+    def _pread(state, offset):
+        if hasattr(os, "pread"):
+            return os.pread(state.fd, VERIFY_CHUNK_SIZE, offset)
+        with state.lock:
+            os.lseek(state.fd, offset, os.SEEK_SET)
+            return os.read(state.fd, VERIFY_CHUNK_SIZE)
+
+    # -- running --
+    def run(self, records):
+        self.records = records
+        threads = [threading.Thread(target=self._worker, args=(i,), daemon=True, name="ascmhl-verify")
+                   for i in range(self.workers)]
+        with self._condition:
+            self._outstanding += 1  # held while files are still being queued
+        for thread in threads:
+            thread.start()
+        try:
+            for index in records:
+                if self.cancel.is_set():
+                    break
+                relative = records.path(index)
+                try:
+                    stat = os.stat(os.path.join(self.root, relative))
+                except OSError:
+                    records.set_status(index, ascmhl_records.MISSING)
+                    self.output(f"ERROR: missing file {relative}")
+                    continue
+                task = self._open_large_file if stat.st_size > 2 * VERIFY_CHUNK_SIZE else self._verify_file
+                # Tasks hold the record number, the path is looked up again when the file is read
+                self._push(stat.st_dev, (task, index, preferred_format(records, index), stat.st_size))
+        finally:
+            with self._condition:
+                self._outstanding -= 1
+                self._condition.notify_all()
+            for thread in threads:
+                thread.join()
+            # A cancelled run drops the queued chunks of files it started: close them once no worker reads
+            for state in self._open_files:
+                os.close(state.fd)
+                state.fd = None
+            self._open_files.clear()
+
+
+def verify_folder(root, workers=None, per_device=None, output=print, cancel=None, io_strategy="auto", throttle=None):
+    """Re-hash the files of the latest ascmhl generation below root. Returns an ascmhl-style exit code.
+
+    0 when every file matches, 10 when files are missing, 11 when a hash does not match
+    and 30 when the folder has no ascmhl history.
+    """
+    started = time.perf_counter()
+    files = expected_files(root, cancel)
+    if not files:
+        output(f"❌ No ascmhl history with files found in {root}")
+        return 30
+    job = ParallelVerifyJob(root, workers, per_device, output, cancel, io_strategy, throttle)
+    output(f"🔍 Verifying {len(files)} files with {job.workers} workers, {job.per_device} concurrent reads per device")
+    job.run(files)
+    elapsed = time.perf_counter() - started
+    output(f"📊 Verified {job.files_verified} files, {ascmhl_scan.format_bytes(job.bytes_verified)} in "
+           f"{ascmhl_scan.format_duration(elapsed)} "
+           f"({ascmhl_scan.format_bytes(job.bytes_verified / elapsed if elapsed else 0)}/s): "
+           f"{job.mismatches} failed, {job.missing} missing")
+    if job.cancel.is_set():
+        output("⚠️ Verification cancelled.")
+        return -1
+    if job.mismatches:
+        return 11
+    if job.missing:
+        return 10
+    return 0
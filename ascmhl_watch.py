@@ -0,0 +1,266 @@
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+import ascmhl_jobs
+import ascmhl_scan
+
+# --- WATCH FOLDERS ---
+# Every folder that appears directly inside a watched root (a volume under /media or /Volumes, an
+# offload landing in a destination folder) is queued once it has stopped changing. The roots are
+# watched with inotify on Linux, which also reports mounts through /proc/self/mounts, so an idle
+# watcher sleeps in select() however many roots it has. Elsewhere, or when inotify is not
+# available, the root listings are polled every WATCH_POLL_INTERVAL seconds. Only folders waiting
+# to settle are walked, comparing their file count, bytes and newest modification time.
+WATCH_POLL_INTERVAL = 5.0  # seconds between root listings without inotify
+WATCH_SETTLE_SECONDS = 10.0  # a new folder must stay unchanged this long before it is queued
+WATCH_IDLE_TIMEOUT = 60.0  # wake-up interval with inotify, to pick up roots created later
+MOUNTS_FILE = "/proc/self/mounts"  # polls "exceptional" whenever the mount table changes
+
+_IN_MOVED_FROM, _IN_MOVED_TO, _IN_CREATE, _IN_DELETE = 0x40, 0x80, 0x100, 0x200
+_IN_DELETE_SELF, _IN_MOVE_SELF, _IN_IGNORED, _IN_ONLYDIR = 0x400, 0x800, 0x8000, 0x01000000
+_IN_NONBLOCK, _IN_CLOEXEC = os.O_NONBLOCK, getattr(os, "O_CLOEXEC", 0o2000000)
+_EVENT = struct.Struct("iIII")  # struct inotify_event, followed by len bytes of name
+
+
+def default_mount_roots():
+    """Folders where removable volumes appear on this platform, those that exist."""
+    if sys.platform == "darwin":
+        roots = ["/Volumes"]
+    elif sys.platform.startswith("linux"):
+        user = os.environ.get("USER") or os.environ.get("LOGNAME") or ""
+        roots = [f"/media/{user}", f"/run/media/{user}", "/media", "/mnt"]
+    else:
+        roots = []
+    return [root for root in roots if os.path.isdir(root)]
+
+
+def watch_config_file():
+    return os.path.join(ascmhl_jobs.app_data_dir(), "watch.json")
+
+
+def load_watch_config(path=None):
+    """{"roots": [...], "preset": name or None, "max_pending": n} saved by the Queue tab."""
+    config = {"roots": [], "preset": None, "max_pending": 8}
+    try:
+        with open(path or watch_config_file(), "r", encoding="utf-8") as file:
+            config.update(json.load(file))
+    except (OSError, ValueError):
+        pass
+    return config
+
+
+def save_watch_config(config, path=None):
+    path = path or watch_config_file()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(config, file, indent=4)
+    os.replace(tmp_path, path)
+
+
+def folder_signature(path, cancel=None):
+    """(files, bytes, newest mtime) of what ascmhl create would hash below path."""
+    files = total = newest = 0
+    for _, stat in ascmhl_scan.iter_files(path, cancel):
+        files += 1
+        total += stat.st_size
+        newest = max(newest, stat.st_mtime_ns)
+    return files, total, newest
+
+
+class _Inotify:
+    """Directory-entry events of a set of folders through the Linux inotify API."""
+
+    MASK = _IN_CREATE | _IN_DELETE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths = {}  # watch descriptor -> root
+
+    def add(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.paths[wd] = path
+
+    def watched(self):
+        return set(self.paths.values())
+
+    def read(self):
+        """Roots with new events. Roots that were deleted or moved are no longer watched."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size + length
+                path = self.paths.get(wd)
+                if path is None:
+                    continue
+                changed.add(path)
+                if mask & (_IN_IGNORED | _IN_DELETE_SELF | _IN_MOVE_SELF):
+                    self.paths.pop(wd, None)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _Pending:
+    def __init__(self, now):
+        self.signature = None
+        self.next_check = now
+        self.held = False  # announced as held back by back-pressure
+
+
+class FolderWatcher:
+    """Calls accept(folder) for every new, settled folder inside roots. Stops with stop().
+
+    accept returns False to apply back-pressure: the folder stays pending and is offered again
+    at the next check. Existing folders are only offered with include_existing.
+    """
+
+    def __init__(self, roots, accept, output=print, settle_seconds=WATCH_SETTLE_SECONDS, poll=False,
+                 include_existing=False):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.accept = accept
+        self.output = output
+        self.settle_seconds = settle_seconds
+        self.include_existing = include_existing
+        self.cancel = threading.Event()
+        self._wake_read, self._wake_write = os.pipe()
+        self._known = {root: {} for root in self.roots}  # root -> {name: (st_dev, st_ino)}
+        self._pending = {}  # folder -> _Pending
+        self._inotify = None
+        self._mounts = None
+        if not poll and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                self.output(f"⚠️ inotify not available, polling the watch folders: {str(e)}")
+            try:
+                self._mounts = open(MOUNTS_FILE, "r")
+            except OSError:
+                pass
+
+    def stop(self):
+        self.cancel.set()
+        os.write(self._wake_write, b"x")
+
+    # -- roots --
+    def _watch_roots(self):
+        """Start watching roots that appeared since the last call. Returns them."""
+        if self._inotify is None:
+            return set()
+        added = set()
+        for root in set(self.roots) - self._inotify.watched():
+            try:
+                self._inotify.add(root)
+                added.add(root)
+            except OSError:
+                pass  # not there yet, retried at the next wake-up
+        return added
+
+    def _scan_root(self, root, initial=False):
+        try:
+            entries = {entry.name: entry for entry in os.scandir(root)}
+        except OSError:
+            entries = {}
+        known = self._known[root]
+        current = {}
+        for name, entry in entries.items():
+            try:
+                if name.startswith(".") or not entry.is_dir():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            # A volume mounted on an existing folder changes its device and inode
+            current[name] = (stat.st_dev, stat.st_ino)
+            if known.get(name) != current[name] and (not initial or self.include_existing):
+                folder = os.path.join(root, name)
+                self.output(f"📥 New folder {folder}, waiting until it stops changing")
+                self._pending[folder] = _Pending(time.monotonic())
+        for name in set(known) - set(current):
+            self._pending.pop(os.path.join(root, name), None)
+        self._known[root] = current
+
+    # -- settling --
+    def _check_pending(self):
+        now = time.monotonic()
+        for folder, state in list(self._pending.items()):
+            if state.next_check > now or self.cancel.is_set():
+                continue
+            try:
+                signature = folder_signature(folder, self.cancel)
+            except ascmhl_scan.ScanCancelled:
+                return
+            if signature != state.signature or signature[0] == 0:
+                # Still changing, or still empty: a copy may not have started yet
+                state.signature = signature
+                state.next_check = now + self.settle_seconds
+                continue
+            if not self.accept(folder):
+                if not state.held:
+                    self.output(f"⏸️ Too many pending jobs, holding {folder}")
+                    state.held = True
+                state.next_check = now + self.settle_seconds
+                continue
+            del self._pending[folder]
+            self.output(f"✅ {folder} settled: {signature[0]} files, {ascmhl_scan.format_bytes(signature[1])}, queued")
+
+    def _wait(self, timeout):
+        """Block until an event, a timeout or stop(). Returns the roots to list again."""
+        readers = [self._wake_read] + ([self._inotify.fd] if self._inotify is not None else [])
+        exceptional = [self._mounts] if self._mounts is not None else []
+        readable, _, mount_changed = select.select(readers, [], exceptional, timeout)
+        if self._wake_read in readable:
+            os.read(self._wake_read, 64)
+        if mount_changed or self._inotify is None:
+            if mount_changed:
+                self._mounts.seek(0)
+                self._mounts.read()
+            return set(self.roots)
+        return self._inotify.read() if self._inotify.fd in readable else set()
+
+    def run(self):
+        self._watch_roots()
+        for root in self.roots:
+            self._scan_root(root, initial=True)
+        mode = "inotify" if self._inotify is not None else f"polling every {WATCH_POLL_INTERVAL:.0f}s"
+        self.output(f"👀 Watching {len(self.roots)} folders ({mode})")
+        try:
+            while not self.cancel.is_set():
+                if self._pending:
+                    timeout = max(0.0, min(state.next_check for state in self._pending.values()) - time.monotonic())
+                else:
+                    timeout = WATCH_IDLE_TIMEOUT
+                if self._inotify is None:
+                    timeout = min(timeout, WATCH_POLL_INTERVAL)
+                changed = self._wait(timeout)
+                if self.cancel.is_set():
+                    break
+                for root in changed | self._watch_roots():
+                    if root in self._known:
+                        self._scan_root(root)
+                self._check_pending()
+        finally:
+            if self._inotify is not None:
+                self._inotify.close()
+            if self._mounts is not None:
+                self._mounts.close()
+            os.close(self._wake_read)
+            os.close(self._wake_write)
+            self.output("👀 Stopped watching")
@@ -0,0 +1,72 @@
+"""Compare GUI-side CPU cost per output line of the QThread and QProcess backends.
+
+Runs benchmarks/fake_ascmhl.py as ascmhl, printing verbose-style lines as fast as it can, through
+each backend (ProcessWorker, and EngineWorker with the External CLI engine) and measures the CPU
+time spent in this (GUI) process while the output is consumed.
+
+    python benchmarks/bench_output_backends.py [--lines 200000]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QEventLoop
+from PyQt5.QtWidgets import QApplication
+
+import ascmhl_gui
+import ascmhl_jobs
+import fake_ascmhl
+
+
+def run_backend(name, folder, settings):
+    if name == "QProcess":
+        worker = ascmhl_gui.ProcessWorker(ascmhl_jobs.build_create_command(folder, settings))
+    else:
+        worker = ascmhl_gui.EngineWorker(folder, settings)
+    received = [0]
+    loop = QEventLoop()
+    worker.output.connect(lambda line: received.__setitem__(0, received[0] + 1))
+    worker.finished.connect(lambda code: loop.quit())
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    worker.start()
+    loop.exec_()
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    if isinstance(worker, ascmhl_gui.EngineWorker):
+        worker.wait()
+    return {
+        "backend": name,
+        "lines": received[0],
+        "wall_s": round(wall, 3),
+        "cpu_s": round(cpu, 3),
+        "cpu_us_per_line": round(cpu / max(received[0], 1) * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200000)
+    args = parser.parse_args()
+    app = QApplication(sys.argv)
+    work = tempfile.mkdtemp(prefix="bench-backends-")
+    try:
+        # The stand-in prints lines for made-up paths, so the folder can stay empty
+        os.environ["PATH"] = fake_ascmhl.install(os.path.join(work, "bin")) + os.pathsep + os.environ.get("PATH", "")
+        os.environ["FAKE_ASCMHL_LINES"] = str(args.lines)
+        folder = os.path.join(work, "media")
+        os.makedirs(folder)
+        settings = ascmhl_jobs.default_settings(engine="External CLI", hash_formats=["xxh64"])
+        results = [run_backend(name, folder, settings) for name in ("QThread", "QProcess")]
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    for result in results:
+        print("{backend:9} lines={lines} wall={wall_s}s cpu={cpu_s}s cpu/line={cpu_us_per_line}us".format(**result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Memory per file of ascmhl_records.FileRecords against the dicts and tuples it replaced.
+
+Builds the per-file data of a synthetic frame sequence (relative path, size, mtime, xxh64 digest,
+status, path index) both ways and reports the bytes per file measured with tracemalloc, paths
+excluded, plus add and find rates. Exits with 1 when a record costs more than
+ascmhl_records.RECORD_BYTES_TARGET, so it can guard against regressions.
+
+    python benchmarks/bench_records.py [--files 1000000] [--formats xxh64[,md5]]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ascmhl_records
+
+
+def synthetic_files(count, formats, clips=500):
+    """(relative path, size, mtime_ns, {hash_format: digest}) of a frame sequence split into clips."""
+    per_clip = -(-count // clips)
+    for i in range(count):
+        clip = f"A{i // per_clip // 100:03d}/A001C{i // per_clip:03d}"
+        digest = f"{i * 2654435761 % (1 << 64):016x}"
+        hashes = {f: (digest * 8)[:2 * ascmhl_records.DIGEST_SIZES[f]] for f in formats}
+        yield f"{clip}/A001C{i // per_clip:03d}.{i:07d}.dpx", 16384 + i % 4096, 1700000000000000000 + i, hashes
+
+
+def measure(build, count, formats):
+    """(what build returns, bytes allocated per file) for count synthetic files."""
+    tracemalloc.start()
+    kept = build(synthetic_files(count, formats))
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return kept, allocated / count
+
+
+def adds_per_s(build, count, formats):
+    """Files added per second, without tracemalloc slowing every allocation down."""
+    files = list(synthetic_files(count, formats))
+    started = time.perf_counter()
+    build(files)
+    return round(count / (time.perf_counter() - started))
+
+
+def build_records(files):
+    records = ascmhl_records.FileRecords(indexed=True)
+    for path, size, mtime_ns, hashes in files:
+        records.add(path, size, mtime_ns, hashes)
+    return records
+
+
+def build_dicts(files):
+    # What the scan, progress and offload kept before: {path: size}, a copy to pop from, (path, hashes) pairs
+    sizes, copied = {}, []
+    for path, size, _, hashes in files:
+        sizes[path] = size
+        copied.append((path, hashes))
+    return sizes, dict(sizes), copied
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1000000)
+    parser.add_argument("--formats", default="xxh64")
+    args = parser.parse_args()
+    formats = args.formats.split(",")
+    count = args.files
+
+    records, allocated = measure(build_records, count, formats)
+    path_bytes = records.path_bytes() / count
+    started = time.perf_counter()
+    probes = range(0, count, max(1, count // 100000))
+    for index in probes:
+        assert records.find(records.path(index)) == index
+    find_seconds = time.perf_counter() - started
+    del records
+
+    # Paths are shared by the dict and the list, so they are counted once
+    _, dict_allocated = measure(build_dicts, count, formats)
+    dict_path_bytes = sum(sys.getsizeof(path) for path, _, _, _ in synthetic_files(min(count, 10000), formats))
+    dict_path_bytes /= min(count, 10000)
+
+    result = {
+        "files": count,
+        "formats": formats,
+        "record_bytes": round(allocated - path_bytes, 1),
+        "record_bytes_target": ascmhl_records.RECORD_BYTES_TARGET,
+        "path_bytes": round(path_bytes, 1),
+        "dicts_bytes": round(dict_allocated - dict_path_bytes, 1),
+        "dicts_path_bytes": round(dict_path_bytes, 1),
+        "adds_per_s": adds_per_s(build_records, min(count, 100000), formats),
+        "dicts_adds_per_s": adds_per_s(build_dicts, min(count, 100000), formats),
+        "finds_per_s": round(len(probes) / find_seconds),
+    }
+    print(json.dumps(result, indent=2))
+    if result["record_bytes"] > ascmhl_records.RECORD_BYTES_TARGET:
+        print(f"❌ {result['record_bytes']} bytes per record, over the target of {ascmhl_records.RECORD_BYTES_TARGET}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Throughput and memory of the client report (ascmhl_report) on large manifests.
+
+Writes a synthetic ascmhl generation with the given numbers of file entries (default 100k and the
+published 1M), then writes its HTML, CSV and PDF report in a child process per size and reports
+entries/s and the child's peak RSS. Peak RSS should stay flat as the manifest grows.
+
+    python benchmarks/bench_report.py [--entries 100000 --entries 1000000] [--formats html,csv,pdf] [--dir PATH]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import ascmhl_report
+started = time.perf_counter()
+returncode = ascmhl_report.write_report({folder!r}, {output!r}, formats={formats!r}, output=lambda line: None)
+elapsed = time.perf_counter() - started
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+print(json.dumps({{"returncode": returncode, "seconds": elapsed, "peak_rss": peak}}))
+"""
+
+
+def write_manifest(folder, entries, clips=500):
+    """An ascmhl/0001_*.mhl with entries file hashes, written line by line."""
+    history = os.path.join(folder, "ascmhl")
+    os.makedirs(history)
+    path = os.path.join(history, "0001_bench_2026-01-01_000000Z.mhl")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n<hashlist version="2.0" xmlns="urn:ASC:MHL:v2.0">\n'
+                   "  <creatorinfo>\n    <creationdate>2026-01-01T00:00:00+00:00</creationdate>\n"
+                   "    <hostname>bench</hostname>\n    <tool version=\"1.2\">ascmhl</tool>\n  </creatorinfo>\n"
+                   "  <processinfo>\n    <process>in-place</process>\n  </processinfo>\n  <hashes>\n")
+        per_clip = -(-entries // clips)
+        for i in range(entries):
+            clip = f"A{i // per_clip // 100:03d}/A001C{i // per_clip:03d}"
+            file.write(f'    <hash>\n      <path size="{16384 + i % 4096}" lastmodificationdate="2026-01-01T00:00:00+00:00">'
+                       f"{clip}/frame.{i:07d}.dpx</path>\n"
+                       f'      <xxh64 action="original" hashdate="2026-01-01T00:00:01+00:00">{i * 2654435761 % (1 << 64):016x}'
+                       "</xxh64>\n    </hash>\n")
+        file.write("  </hashes>\n</hashlist>\n")
+    return path
+
+
+def folder_size(folder):
+    return sum(os.path.getsize(os.path.join(base, name)) for base, _, names in os.walk(folder) for name in names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, action="append")
+    parser.add_argument("--formats", default="html,csv,pdf")
+    parser.add_argument("--dir", help="where to write the manifests and reports (default: a temporary folder)")
+    args = parser.parse_args()
+    formats = args.formats.split(",")
+    results = []
+    for entries in args.entries or [100000, 1000000]:
+        work = tempfile.mkdtemp(prefix="bench-report-", dir=args.dir)
+        try:
+            folder, output = os.path.join(work, "volume"), os.path.join(work, "report")
+            started = time.perf_counter()
+            manifest = write_manifest(folder, entries)
+            written = time.perf_counter() - started
+            child = subprocess.run([sys.executable, "-c", CHILD.format(root=ROOT, folder=folder, output=output,
+                                                                       formats=formats)],
+                                   stdout=subprocess.PIPE, check=True, text=True)
+            run = json.loads(child.stdout.strip().splitlines()[-1])
+            if run["returncode"] != 0:
+                raise SystemExit(f"write_report failed with exit code {run['returncode']}")
+            results.append({
+                "entries": entries,
+                "manifest_mb": round(os.path.getsize(manifest) / 1e6, 1),
+                "manifest_write_s": round(written, 2),
+                "report_s": round(run["seconds"], 2),
+                "entries_per_s": round(entries / run["seconds"]),
+                "report_mb": round(folder_size(output) / 1e6, 1),
+                "peak_rss_mb": round(run["peak_rss"] / 1e6, 1),
+            })
+            print("{entries:>9} entries  {report_s}s  {entries_per_s} entries/s  "
+                  "peak RSS {peak_rss_mb} MB  report {report_mb} MB".format(**results[-1]), file=sys.stderr)
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+    print(json.dumps({"formats": formats, "runs": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
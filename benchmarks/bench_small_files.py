@@ -0,0 +1,89 @@
+"""Files per second of the native engine on an image sequence, with and without the small-file path.
+
+Writes a synthetic frame sequence (frames split into clip folders), creates an ascmhl generation
+for it with the regular native engine and with the small-file path, and reports files/s and the
+number of output lines that would reach the GUI. The published figure is the 500k-frame default.
+
+    python benchmarks/bench_small_files.py [--frames 500000] [--frame-size 16384] [--clips 50] [--dir PATH] [--cold]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ascmhl_engine
+
+
+def make_sequence(root, frames, frame_size, clips):
+    per_clip = -(-frames // clips)
+    payload = os.urandom(frame_size)
+    for i in range(frames):
+        clip = os.path.join(root, f"A001C{i // per_clip:03d}")
+        if i % per_clip == 0:
+            os.makedirs(clip)
+        # Vary the first bytes so every frame hashes differently
+        with open(os.path.join(clip, f"A001C{i // per_clip:03d}.{i:07d}.dpx"), "wb") as file:
+            file.write(i.to_bytes(8, "little") + payload[8:])
+
+
+def drop_caches():
+    """Empty the Linux page cache so every frame is read from the disk (needs root)."""
+    os.sync()
+    try:
+        with open("/proc/sys/vm/drop_caches", "w") as file:
+            file.write("3\n")
+    except OSError as e:
+        raise SystemExit(f"--cold needs root on Linux: {str(e)}")
+
+
+def run(root, frames, small_files, hash_format, cold):
+    shutil.rmtree(os.path.join(root, "ascmhl"), ignore_errors=True)
+    if cold:
+        drop_caches()
+    lines = [0]
+
+    def output(line):
+        lines[0] += 1
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    returncode = ascmhl_engine.create_generation(root, [hash_format], output=output, small_files=small_files)
+    cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    if returncode != 0:
+        raise SystemExit(f"create_generation failed with exit code {returncode}")
+    return {
+        "path": "small-file" if small_files else "regular",
+        "files_per_s": round(frames / wall),
+        "wall_s": round(wall, 2),
+        "cpu_s": round(cpu, 2),
+        "lines": lines[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=500000)
+    parser.add_argument("--frame-size", type=int, default=16384)
+    parser.add_argument("--clips", type=int, default=50)
+    parser.add_argument("--hash-format", default="xxh64")
+    parser.add_argument("--dir", help="where to write the sequence (default: a temporary folder)")
+    parser.add_argument("--cold", action="store_true", help="drop the page cache before each run")
+    args = parser.parse_args()
+    root = tempfile.mkdtemp(prefix="bench-small-files-", dir=args.dir)
+    try:
+        started = time.perf_counter()
+        make_sequence(root, args.frames, args.frame_size, args.clips)
+        print(f"{args.frames} frames of {args.frame_size} bytes in {args.clips} clips, "
+              f"written in {time.perf_counter() - started:.1f}s")
+        for small_files in (False, True):
+            result = run(root, args.frames, small_files, args.hash_format, args.cold)
+            print("{path:10} files/s={files_per_s} wall={wall_s}s cpu={cpu_s}s output lines={lines}".format(**result))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
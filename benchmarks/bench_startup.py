@@ -0,0 +1,103 @@
+"""Startup cost of the GUI and of finding ascmhl, before and after the tool-discovery cache.
+
+'before' repeats what every launch and every 'Create MHL Generation' click used to do: run
+'ascmhl --version', import pkg_resources and ask PyPI for the latest release without a timeout.
+'after' is ascmhl_tools with an empty cache (first launch) and with a warm one. With PyQt5 installed
+the GUI is also started offscreen with --startup-report, cold and warm, for its time to interactive
+and the time until the ascmhl check has finished.
+
+    python benchmarks/bench_startup.py [--runs 5] [--no-gui]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def app_data_env(folder):
+    """Environment that points ascmhl_jobs.app_data_dir into folder on every platform."""
+    return dict(os.environ, XDG_DATA_HOME=folder, APPDATA=folder, HOME=folder, QT_QPA_PLATFORM="offscreen")
+
+
+def timed(function):
+    started = time.perf_counter()
+    function()
+    return (time.perf_counter() - started) * 1000
+
+
+def legacy_check():
+    subprocess.run(["ascmhl", "--version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True)
+    # The update check ran on every launch; pkg_resources alone scans every installed distribution
+    subprocess.run([sys.executable, "-c", "import pkg_resources, urllib.request, json\n"
+                    "try:\n json.load(urllib.request.urlopen('https://pypi.org/pypi/ascmhl/json'))\n"
+                    "except Exception:\n pass"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def cached_check(folder):
+    code = "import ascmhl_tools; ascmhl_tools.find_ascmhl(); ascmhl_tools.latest_version()"
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=app_data_env(folder), check=True)
+
+
+def gui_startup(folder):
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "ascmhl_gui.py"), "--startup-report"], cwd=ROOT,
+                            env=app_data_env(folder), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                            timeout=120)
+    for line in result.stdout.splitlines():
+        if line.startswith("{"):
+            return json.loads(line)["startup_ms"]
+    raise SystemExit(f"ascmhl_gui.py --startup-report printed no report (exit code {result.returncode})")
+
+
+def median_ms(samples):
+    return round(statistics.median(samples), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-gui", action="store_true", help="skip the offscreen GUI runs")
+    args = parser.parse_args()
+    if shutil.which("ascmhl") is None:
+        raise SystemExit("ascmhl is not on PATH")
+
+    report = {"runs": args.runs}
+    report["before_check_ms"] = median_ms([timed(legacy_check) for _ in range(args.runs)])
+    cold, warm = [], []
+    for _ in range(args.runs):
+        folder = tempfile.mkdtemp(prefix="ascmhl_startup_")
+        try:
+            cold.append(timed(lambda: cached_check(folder)))
+            warm.append(timed(lambda: cached_check(folder)))
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+    report["after_check_cold_ms"] = median_ms(cold)
+    report["after_check_warm_ms"] = median_ms(warm)
+
+    try:
+        import PyQt5  # noqa: F401
+    except ImportError:
+        args.no_gui = True
+    if not args.no_gui:
+        runs = {"cold": [], "warm": []}
+        for _ in range(args.runs):
+            folder = tempfile.mkdtemp(prefix="ascmhl_startup_")
+            try:
+                runs["cold"].append(gui_startup(folder))
+                runs["warm"].append(gui_startup(folder))
+            finally:
+                shutil.rmtree(folder, ignore_errors=True)
+        for cache, marks in runs.items():
+            report[f"gui_{cache}_ms"] = {name: median_ms([m[name] for m in marks]) for name in marks[0]}
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
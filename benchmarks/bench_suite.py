@@ -0,0 +1,341 @@
+"""End-to-end benchmark suite: synthetic media trees run through the GUI offscreen, results as JSON.
+
+Builds reproducible media trees of three shapes (the same seed gives the same bytes and mtimes;
+trees are kept in --dir and reused while their spec is unchanged):
+
+    huge_clips   a few very large camera clips
+    frames       a frame sequence of many small files (500k at --scale full)
+    deep         folders nested dozens of levels deep with a file on every level
+
+and runs every shape through ASCMHLGui with QT_QPA_PLATFORM=offscreen, as if 'Create MHL
+Generation' was clicked after the folder scan, with two engines:
+
+    native       the native engine on an EngineWorker, hashing the files for real
+    cli          the External CLI engine with benchmarks/fake_ascmhl.py as ascmhl, which prints
+                 the verbose output of a real run at --line-rate lines/s (0: as fast as it can)
+                 without hashing, to load the output, progress and log path on its own
+
+Each scenario runs in its own process with its own app data folder and records files/s, MB/s,
+the scan time, output lines, the UI event latency (how late a 10 ms heartbeat timer fires while
+the job runs: p50, p95, max) and the peak memory. The results go to --output (JSON) and are
+compared with --baseline: a metric worse than the baseline by more than --tolerance is a
+regression and the exit code is 1. --save-baseline stores the results as the new baseline; keep
+one baseline per machine and scale, the numbers depend on both.
+
+    python benchmarks/bench_suite.py [--scale quick|full] [--scenario native/frames ...] [--dir PATH]
+                                     [--output results.json] [--baseline benchmarks/baseline.json]
+                                     [--save-baseline] [--tolerance 0.15] [--line-rate 0] [--backend QThread]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import fake_ascmhl  # noqa: E402  (benchmarks/ is on sys.path when run as a script)
+
+SUITE_VERSION = 1
+SEED = 20240501
+MTIME = 1700000000  # every generated file gets this modification time
+BLOCK_SIZE = 8 * 1024 * 1024
+GiB, MiB, KiB = 1024 ** 3, 1024 ** 2, 1024
+SHAPES = {
+    "huge_clips": {
+        "quick": {"clips": 2, "clip_size": 256 * MiB},
+        "full": {"clips": 3, "clip_size": 4 * GiB},
+    },
+    "frames": {
+        "quick": {"frames": 20000, "frame_size": 4 * KiB, "per_clip": 1000},
+        "full": {"frames": 500000, "frame_size": 4 * KiB, "per_clip": 1000},
+    },
+    "deep": {
+        "quick": {"branches": 10, "depth": 32, "file_size": 64 * KiB},
+        "full": {"branches": 100, "depth": 64, "file_size": 256 * KiB},
+    },
+}
+ENGINES = {"native": "Native Parallel", "cli": "External CLI"}
+HEARTBEAT_MS = 10
+JOB_TIMEOUT = 6 * 3600  # seconds before a scenario is given up
+# Metrics compared with the baseline: True when higher is better, and the smallest difference that counts
+COMPARED_METRICS = {
+    "files_per_s": (True, 0),
+    "mb_per_s": (True, 0),
+    "ui_latency_p95_ms": (False, 5.0),
+    "peak_rss_mb": (False, 10.0),
+}
+
+
+# --- SYNTHETIC TREES ---
+def _write_file(path, size, payload, index):
+    """size bytes made of payload, every block stamped with index and its offset so no two blocks are equal."""
+    with open(path, "wb") as file:
+        offset = 0
+        while offset < size:
+            block = payload[:min(len(payload), size - offset)]
+            stamp = (index.to_bytes(8, "little") + offset.to_bytes(8, "little"))[:len(block)]
+            file.write(stamp + block[len(stamp):])
+            offset += len(block)
+    os.utime(path, (MTIME, MTIME))
+
+
+def build_tree(root, shape, spec):
+    payload = random.Random(SEED).randbytes(BLOCK_SIZE)
+    if shape == "huge_clips":
+        for i in range(spec["clips"]):
+            clip = os.path.join(root, "Clips", f"A001C{i + 1:03d}")
+            os.makedirs(clip)
+            _write_file(os.path.join(clip, f"A001C{i + 1:03d}.mxf"), spec["clip_size"], payload, i)
+    elif shape == "frames":
+        frame = payload[:spec["frame_size"]]
+        for i in range(spec["frames"]):
+            reel = f"A001C{i // spec['per_clip'] + 1:03d}"
+            folder = os.path.join(root, "Frames", reel)
+            if i % spec["per_clip"] == 0:
+                os.makedirs(folder)
+            _write_file(os.path.join(folder, f"{reel}.{i:07d}.dpx"), spec["frame_size"], frame, i)
+    elif shape == "deep":
+        index = 0
+        for branch in range(spec["branches"]):
+            folder = os.path.join(root, f"Project_{branch:03d}")
+            for level in range(spec["depth"]):
+                folder = os.path.join(folder, f"level_{level:02d}")
+                os.makedirs(folder)
+                _write_file(os.path.join(folder, f"render_{level:02d}.exr"), spec["file_size"], payload, index)
+                index += 1
+
+
+def ensure_tree(base, shape, scale):
+    """The folder of a shape at a scale, built unless an identical one is already there."""
+    spec = dict(SHAPES[shape][scale], shape=shape, seed=SEED, suite=SUITE_VERSION)
+    root = os.path.join(base, f"{shape}-{scale}")
+    marker = os.path.join(base, f"{shape}-{scale}.json")
+    try:
+        with open(marker, "r", encoding="utf-8") as file:
+            if json.load(file) == spec and os.path.isdir(root):
+                return root
+    except (OSError, ValueError):
+        pass
+    shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(root)
+    started = time.perf_counter()
+    print(f"🧱 Building {shape} ({scale})...", file=sys.stderr, flush=True)
+    build_tree(root, shape, spec)
+    with open(marker, "w", encoding="utf-8") as file:
+        json.dump(spec, file)
+    print(f"🧱 Built {shape} in {time.perf_counter() - started:.1f}s", file=sys.stderr, flush=True)
+    return root
+
+
+# --- ONE SCENARIO, IN A CHILD PROCESS ---
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_scenario(engine, folder, backend):
+    """Drive ASCMHLGui like a user: scan the folder, then run the job. Returns the metrics."""
+    from PyQt5.QtCore import QEventLoop, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    import ascmhl_gui
+    import ascmhl_telemetry
+    sys.excepthook = sys.__excepthook__  # a message box would wait forever offscreen
+    gui = ascmhl_gui.ASCMHLGui()
+    loop = QEventLoop()
+
+    def wait_for(condition, timeout):
+        deadline = time.perf_counter() + timeout
+        poll = QTimer()
+        poll.timeout.connect(lambda: loop.quit() if condition() or time.perf_counter() > deadline else None)
+        poll.start(5)
+        loop.exec_()
+        poll.stop()
+        if not condition():
+            raise SystemExit("timed out")
+
+    wait_for(gui.tool_check_done.is_set, 120)
+    gui.engine_combo.setCurrentText(ENGINES[engine])
+    gui.backend_combo.setCurrentText(backend)
+    gui.hash_combo.setCurrentText("xxh64")
+    scan_started = time.perf_counter()
+    gui.set_media_folder(folder)
+    wait_for(lambda: gui.folder_scan is not None and gui.folder_scan.root == folder, JOB_TIMEOUT)
+    scan_seconds = time.perf_counter() - scan_started
+    scan = gui.folder_scan
+
+    lateness = []
+    last = [time.perf_counter()]
+
+    def heartbeat():
+        now = time.perf_counter()
+        lateness.append(max(0.0, (now - last[0]) * 1000 - HEARTBEAT_MS))
+        last[0] = now
+
+    timer = QTimer()
+    timer.timeout.connect(heartbeat)
+    started = time.perf_counter()
+    gui.run_ascmhl()
+    timer.start(HEARTBEAT_MS)
+    last[0] = time.perf_counter()
+    worker = gui.worker_thread
+    wait_for(lambda: not worker.isRunning() and gui.run_btn.isEnabled(), JOB_TIMEOUT)
+    wall = time.perf_counter() - started
+    timer.stop()
+    app.processEvents()
+    record = ascmhl_telemetry.load_history(limit=1)
+    returncode = record[-1]["returncode"] if record else None
+    peak = ascmhl_telemetry.peak_rss_bytes()
+    gui.close()
+    return {
+        "returncode": returncode,
+        "files": scan.file_count,
+        "bytes": scan.total_bytes,
+        "scan_s": round(scan_seconds, 3),
+        "wall_s": round(wall, 3),
+        "files_per_s": round(scan.file_count / wall, 1) if wall else 0,
+        "mb_per_s": round(scan.total_bytes / wall / 1e6, 1) if wall else 0,
+        "output_lines": worker.tail.total_lines,
+        "skipped_log_lines": gui.log.skipped_lines,
+        "ui_latency_p50_ms": round(_percentile(lateness, 0.5), 2),
+        "ui_latency_p95_ms": round(_percentile(lateness, 0.95), 2),
+        "ui_latency_max_ms": round(max(lateness, default=0.0), 2),
+        "peak_rss_mb": round(peak / 1e6, 1) if peak is not None else None,
+    }
+
+
+def run_child(args):
+    result = run_scenario(args.child_engine, args.child_folder, args.backend)
+    print(json.dumps(result), flush=True)
+    return 0
+
+
+def spawn_scenario(engine, folder, args, work):
+    """Run one scenario in a fresh process with its own app data folder and the fake ascmhl first on PATH."""
+    home = tempfile.mkdtemp(prefix="home-", dir=work)
+    bin_dir = fake_ascmhl.install(os.path.join(work, "bin"))
+    env = dict(os.environ, HOME=home, XDG_DATA_HOME=home, APPDATA=home, QT_QPA_PLATFORM="offscreen",
+               PATH=bin_dir + os.pathsep + os.environ.get("PATH", ""),
+               FAKE_ASCMHL_RATE=str(args.line_rate))
+    env.pop("FAKE_ASCMHL_LINES", None)
+    # The update check answer is seeded so no run waits on PyPI
+    app_data = os.path.join(home, "Library", "Application Support") if sys.platform == "darwin" else home
+    app_data = os.path.join(app_data, "ASCMHLCreatorGUI")
+    os.makedirs(app_data)
+    with open(os.path.join(app_data, "tools.json"), "w", encoding="utf-8") as file:
+        json.dump({"pypi": {"version": fake_ascmhl.VERSION_TEXT.split()[2], "checked": time.time()}}, file)
+    shutil.rmtree(os.path.join(folder, "ascmhl"), ignore_errors=True)
+    command = [sys.executable, os.path.abspath(__file__), "--child-engine", engine, "--child-folder", folder,
+               "--backend", args.backend]
+    child = subprocess.run(command, cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True, timeout=JOB_TIMEOUT)
+    shutil.rmtree(os.path.join(folder, "ascmhl"), ignore_errors=True)
+    lines = [line for line in child.stdout.splitlines() if line.startswith("{")]
+    if child.returncode != 0 or not lines:
+        return {"error": f"exit code {child.returncode}"}
+    return json.loads(lines[-1])
+
+
+# --- BASELINE ---
+def compare(results, baseline, tolerance):
+    """Lines describing each compared metric, and whether any of them regressed."""
+    lines, regressed = [], False
+    for setting in ("suite", "scale", "line_rate", "backend"):
+        if baseline.get(setting) != results[setting]:
+            return [f"⚠️ Baseline has {setting} {baseline.get(setting)}, not {results[setting]}; not compared"], False
+    for name, metrics in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None or "error" in metrics or "error" in before:
+            continue
+        for metric, (higher_is_better, min_delta) in COMPARED_METRICS.items():
+            old, new = before.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            worse = (-change if higher_is_better else change) > tolerance and abs(new - old) > min_delta
+            regressed |= worse
+            lines.append(f"{'❌' if worse else '  '} {name:20} {metric:18} {old:>10} -> {new:>10} ({change:+.0%})")
+    return lines, regressed
+
+
+def machine_info():
+    return {"platform": platform.platform(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "python": platform.python_version()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=["quick", "full"], default="quick")
+    parser.add_argument("--scenario", action="append", metavar="ENGINE/SHAPE",
+                        help=f"run only these, e.g. native/frames (engines: {', '.join(ENGINES)}; "
+                             f"shapes: {', '.join(SHAPES)})")
+    parser.add_argument("--dir", help="where the trees are built and kept (default: a folder in the temp dir)")
+    parser.add_argument("--output", help="write the results here (default: stdout)")
+    parser.add_argument("--baseline", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before a regression (0.15 = 15%%)")
+    parser.add_argument("--line-rate", type=float, default=0, help="lines/s printed by the fake ascmhl, 0 for unpaced")
+    parser.add_argument("--backend", choices=["QThread", "QProcess"], default="QThread",
+                        help="output backend of the cli scenarios")
+    parser.add_argument("--child-engine", help=argparse.SUPPRESS)
+    parser.add_argument("--child-folder", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child_engine:
+        return run_child(args)
+
+    scenarios = args.scenario or [f"{engine}/{shape}" for shape in SHAPES for engine in ENGINES]
+    for scenario in scenarios:
+        engine, _, shape = scenario.partition("/")
+        if engine not in ENGINES or shape not in SHAPES:
+            parser.error(f"unknown scenario {scenario}")
+    base = args.dir or os.path.join(tempfile.gettempdir(), "ascmhl-bench-trees")
+    os.makedirs(base, exist_ok=True)
+    work = tempfile.mkdtemp(prefix="ascmhl-bench-")
+    results = {"suite": SUITE_VERSION, "scale": args.scale, "started": time.time(), "machine": machine_info(),
+               "line_rate": args.line_rate, "backend": args.backend, "scenarios": {}}
+    try:
+        for scenario in scenarios:
+            engine, _, shape = scenario.partition("/")
+            folder = ensure_tree(base, shape, args.scale)
+            print(f"▶️ {scenario}", file=sys.stderr, flush=True)
+            metrics = spawn_scenario(engine, folder, args, work)
+            results["scenarios"][scenario] = metrics
+            print(f"   {json.dumps(metrics)}", file=sys.stderr, flush=True)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    failed = [name for name, metrics in results["scenarios"].items()
+              if "error" in metrics or metrics.get("returncode") != 0]
+    for name in failed:
+        print(f"❌ {name} failed: {results['scenarios'][name]}", file=sys.stderr)
+    regressed = False
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            lines, regressed = compare(results, json.load(file), args.tolerance)
+        print(f"Compared with {args.baseline} (tolerance {args.tolerance:.0%}):", file=sys.stderr)
+        for line in lines:
+            print(line, file=sys.stderr)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+        print(f"Saved as the baseline: {args.baseline}", file=sys.stderr)
+    return 1 if failed or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Stand-in for the ascmhl executable in benchmarks: prints 'ascmhl create -v' output without hashing.
+
+    python benchmarks/fake_ascmhl.py --version
+    python benchmarks/fake_ascmhl.py create FOLDER [--hash_format xxh64 ...] -v
+
+Every file below FOLDER gets one "created original hash for" line per hash format, with a made-up
+digest, so the GUI's output path, progress tracking and telemetry see what a real run prints.
+Environment variables control the output:
+
+    FAKE_ASCMHL_RATE    lines per second, 0 (default) for as fast as possible
+    FAKE_ASCMHL_LINES   print this many lines for made-up paths instead of walking FOLDER
+    FAKE_ASCMHL_EXIT    exit code (default 0)
+
+install(folder) writes an 'ascmhl' launcher into folder, to be put first on PATH.
+"""
+import os
+import sys
+import time
+import zlib
+
+VERSION_TEXT = "ascmhl, version 1.2 (benchmark stand-in)"
+RATE_BATCH = 100  # lines written between pacing sleeps
+
+
+def install(folder):
+    """Write an ascmhl launcher for this script into folder. Returns folder."""
+    os.makedirs(folder, exist_ok=True)
+    script = os.path.abspath(__file__)
+    if sys.platform == "win32":
+        with open(os.path.join(folder, "ascmhl.cmd"), "w", encoding="utf-8") as file:
+            file.write(f'@"{sys.executable}" "{script}" %*\n')
+    else:
+        path = os.path.join(folder, "ascmhl")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+        os.chmod(path, 0o755)
+    return folder
+
+
+def _relative_paths(root):
+    stack = [(root, "")]
+    while stack:
+        folder, prefix = stack.pop()
+        try:
+            entries = sorted(os.scandir(folder), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name in (".DS_Store", "ascmhl"):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                stack.append((entry.path, prefix + entry.name + "/"))
+            else:
+                yield prefix + entry.name
+
+
+def _made_up_paths(count):
+    for i in range(count):
+        yield f"Clips/A001C{i // 1000:03d}/A001C{i // 1000:03d}.{i:07d}.dpx"
+
+
+def create(folder, hash_formats):
+    rate = float(os.environ.get("FAKE_ASCMHL_RATE") or 0)
+    lines = os.environ.get("FAKE_ASCMHL_LINES")
+    paths = _made_up_paths(int(lines)) if lines else _relative_paths(folder)
+    write = sys.stdout.write
+    write(f"Creating new generation for folder at path: {folder} ...\n")
+    started, written = time.perf_counter(), 0
+    for path in paths:
+        digest = f"{zlib.crc32(path.encode('utf-8', 'surrogateescape')):08x}" * 2
+        for hash_format in hash_formats:
+            write(f"  created original hash for     {path}  {hash_format}: {digest}\n")
+            written += 1
+            if rate and written % RATE_BATCH == 0:
+                ahead = written / rate - (time.perf_counter() - started)
+                if ahead > 0:
+                    sys.stdout.flush()
+                    time.sleep(ahead)
+    write("Created new generation ascmhl/0001_benchmark.mhl\n")
+    sys.stdout.flush()
+
+
+def main(argv):
+    if "--version" in argv:
+        print(VERSION_TEXT)
+        return 0
+    if not argv or argv[0] != "create":
+        print("fake ascmhl only supports --version and create", file=sys.stderr)
+        return 2
+    folder = next((a for a in argv[1:] if not a.startswith("-")), ".")
+    hash_formats = [argv[i + 1] for i, a in enumerate(argv[:-1]) if a == "--hash_format"] or ["xxh64"]
+    create(folder, hash_formats)
+    return int(os.environ.get("FAKE_ASCMHL_EXIT") or 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ascmhl_jobs  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def app_data(tmp_path, monkeypatch):
+    """Journals, caches and telemetry of the tests go to a temporary app data folder."""
+    path = tmp_path / "app_data"
+    path.mkdir()
+    monkeypatch.setattr(ascmhl_jobs, "app_data_dir", lambda: str(path))
+    return path
+
+
+def write_tree(root, files):
+    """Create files ({relative path: bytes}) below root; a path ending in "/" is an empty folder."""
+    for relative, content in files.items():
+        path = os.path.join(root, *relative.rstrip("/").split("/"))
+        if relative.endswith("/"):
+            os.makedirs(path, exist_ok=True)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(content)
+    return str(root)
@@ -0,0 +1,80 @@
+import pytest
+
+import ascmhl_compare
+import ascmhl_engine
+from conftest import write_tree
+
+SOURCE = {
+    "same.txt": b"same",
+    "changed.txt": b"one",
+    "gone.txt": b"gone",
+    "old/name.mov": b"renamed clip",
+    "resized.txt": b"short",
+}
+COPY = {
+    "same.txt": b"same",
+    "changed.txt": b"two",
+    "new/name.mov": b"renamed clip",
+    "resized.txt": b"longer",
+}
+
+
+@pytest.fixture(autouse=True)
+def spill_every_entry(monkeypatch):
+    """Runs of one entry, so every side is spilled to disk and merged back."""
+    monkeypatch.setattr(ascmhl_compare, "COMPARE_RUN_SIZE", 1)
+
+
+@pytest.fixture
+def trees(tmp_path):
+    return write_tree(tmp_path / "a", SOURCE), write_tree(tmp_path / "b", COPY)
+
+
+def compare(a, b, **options):
+    lines = []
+    returncode = ascmhl_compare.compare_trees(a, b, output=lines.append, **options)
+    return returncode, [line.strip() for line in lines]
+
+
+def test_renamed_missing_and_mismatched(trees):
+    returncode, lines = compare(*trees, detect_renaming=True)
+    assert returncode == 11
+    assert "renamed   old/name.mov -> new/name.mov" in lines
+    assert "missing   gone.txt" in lines
+    assert any(line.startswith("mismatch  changed.txt: xxh64 ") for line in lines)
+    assert "mismatch  resized.txt: 5 bytes in A, 6 bytes in B" in lines
+    assert not any(line.startswith("extra") for line in lines)
+    assert "1 identical, 2 mismatched, 1 missing, 0 extra, 1 renamed" in lines[-1]
+
+
+def test_renames_are_missing_and_extra_without_detection(trees):
+    returncode, lines = compare(*trees)
+    assert returncode == 11
+    assert "missing   old/name.mov" in lines
+    assert "extra     new/name.mov" in lines
+    assert not any(line.startswith("renamed") for line in lines)
+
+
+def test_missing_only(tmp_path):
+    a = write_tree(tmp_path / "a", {"x/1": b"1", "x/2": b"2", "x/3": b"3"})
+    b = write_tree(tmp_path / "b", {"x/1": b"1", "x/3": b"3"})
+    returncode, lines = compare(a, b, detect_renaming=True)
+    assert returncode == 10
+    assert "missing   x/2" in lines
+
+
+def test_history_against_folder(trees):
+    a, b = trees
+    assert ascmhl_engine.create_generation(a, ["xxh64"], output=lambda line: None) == 0
+    returncode, lines = compare(a, b, detect_renaming=True)
+    assert returncode == 11
+    assert any(line.startswith("⚖️ Comparing history A") for line in lines)
+    assert "renamed   old/name.mov -> new/name.mov" in lines
+    assert "missing   gone.txt" in lines
+    assert any(line.startswith("mismatch  changed.txt: xxh64 ") for line in lines)
+
+
+def test_identical(tmp_path):
+    a = write_tree(tmp_path / "a", SOURCE)
+    b = write_tree(tmp_path / "b", SOURCE)
+    assert compare(a, b, detect_renaming=True)[0] == 0
@@ -0,0 +1,75 @@
+import glob
+import os
+
+import ascmhl_engine
+import ascmhl_journal
+from conftest import write_tree
+
+# Not the xxh64 of any file below: a resumed job that writes it took it from the journal
+JOURNALED = "0123456789abcdef"
+
+
+def test_resume_loads_recorded_hashes(tmp_path):
+    root = write_tree(tmp_path / "media", {"a.mov": b"a", "b/c.mov": b"c"})
+    journal = ascmhl_journal.ProgressJournal(root, ["xxh64"])
+    for relative, digest in (("a.mov", "aa" * 8), ("b/c.mov", "cc" * 8)):
+        path = os.path.join(root, relative)
+        journal.record(path, os.stat(path), {"xxh64": digest})
+    journal.close()
+    assert ascmhl_journal.has_journal(root)
+
+    resumed = ascmhl_journal.ProgressJournal(root, ["xxh64"], resume=True)
+    try:
+        assert set(resumed.entries) == {"a.mov", "b/c.mov"}
+        path = os.path.join(root, "b", "c.mov")
+        assert resumed.known_hashes(path, os.stat(path), ["xxh64", "md5"]) == {"xxh64": "cc" * 8}
+    finally:
+        resumed.close()
+
+
+def test_changed_files_are_not_taken_from_the_journal(tmp_path):
+    root = write_tree(tmp_path / "media", {"a.mov": b"a"})
+    path = os.path.join(root, "a.mov")
+    journal = ascmhl_journal.ProgressJournal(root, ["xxh64"])
+    journal.record(path, os.stat(path), {"xxh64": JOURNALED})
+    journal.close()
+    write_tree(root, {"a.mov": b"changed"})
+
+    resumed = ascmhl_journal.ProgressJournal(root, ["xxh64"], resume=True)
+    try:
+        assert resumed.known_hashes(path, os.stat(path), ["xxh64"]) == {}
+    finally:
+        resumed.close()
+
+
+def test_a_line_cut_short_is_skipped(tmp_path):
+    root = write_tree(tmp_path / "media", {"a.mov": b"a", "b.mov": b"b"})
+    journal = ascmhl_journal.ProgressJournal(root, ["xxh64"])
+    path = os.path.join(root, "a.mov")
+    journal.record(path, os.stat(path), {"xxh64": JOURNALED})
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as file:
+        file.write('{"p": "b.mov", "s": 1, "m"')
+
+    resumed = ascmhl_journal.ProgressJournal(root, ["xxh64"], resume=True)
+    try:
+        assert set(resumed.entries) == {"a.mov"}
+    finally:
+        resumed.close()
+
+
+def test_resumed_generation_uses_the_journal(tmp_path):
+    root = write_tree(tmp_path / "media", {"a.mov": b"a", "b/c.mov": b"c"})
+    path = os.path.join(root, "a.mov")
+    journal = ascmhl_journal.ProgressJournal(root, ["xxh64"])
+    journal.record(path, os.stat(path), {"xxh64": JOURNALED})
+    journal.close()
+
+    lines = []
+    assert ascmhl_engine.create_generation(root, ["xxh64"], resume=True, output=lines.append) == 0
+    assert "⏯️ Took 1 file hashes from the journal" in lines
+    # The journal is deleted once the generation is written
+    assert not ascmhl_journal.has_journal(root)
+    generation, = glob.glob(os.path.join(root, "ascmhl", "*.mhl"))
+    with open(generation, encoding="utf-8") as file:
+        assert JOURNALED in file.read()
@@ -0,0 +1,51 @@
+import glob
+import os
+
+import ascmhl_compare
+import ascmhl_engine
+import ascmhl_offload
+from conftest import write_tree
+
+CARD = {
+    "top.txt": b"top",
+    "clips/a/f.mov": b"frame data" * 1000,
+    "clips/empty/": None,
+}
+
+
+def quiet(line):
+    pass
+
+
+def test_offload_with_an_empty_folder_and_a_history(tmp_path):
+    source = write_tree(tmp_path / "CARD_A", CARD)
+    assert ascmhl_engine.create_generation(source, ["xxh64"], output=quiet) == 0
+    destinations = [str(tmp_path / "raid"), str(tmp_path / "shuttle")]
+    for destination in destinations:
+        os.mkdir(destination)
+
+    lines = []
+    assert ascmhl_offload.offload(source, destinations, ["xxh64"], verify=True, output=lines.append) == 0
+    for destination in destinations:
+        target = os.path.join(destination, "CARD_A")
+        assert os.path.isdir(os.path.join(target, "clips", "empty"))
+        with open(os.path.join(target, "clips", "a", "f.mov"), "rb") as file:
+            assert file.read() == CARD["clips/a/f.mov"]
+        # The card's generation came along and the copy has one of its own
+        assert len(glob.glob(os.path.join(target, "ascmhl", "*.mhl"))) == 2
+        assert ascmhl_compare.compare_trees(source, target, rehash=True, output=quiet) == 0
+
+
+def test_offload_to_a_missing_destination(tmp_path):
+    source = write_tree(tmp_path / "CARD_A", CARD)
+    lines = []
+    assert ascmhl_offload.offload(source, [str(tmp_path / "missing")], ["xxh64"], output=lines.append) == 2
+    assert lines == [f"❌ Destination is not a folder: {tmp_path / 'missing'}"]
+
+
+def test_offload_into_an_existing_copy(tmp_path):
+    source = write_tree(tmp_path / "CARD_A", CARD)
+    destination = write_tree(tmp_path / "raid", {"CARD_A/top.txt": b"older"})
+    assert ascmhl_offload.offload(source, [destination], ["xxh64"], output=quiet) == 2
+    with open(os.path.join(destination, "CARD_A", "top.txt"), "rb") as file:
+        assert file.read() == b"older"
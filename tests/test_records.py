@@ -0,0 +1,84 @@
+import pytest
+
+import ascmhl_records
+from ascmhl_records import FileRecords
+
+XXH64 = "0123456789abcdef"
+MD5 = "00112233445566778899aabbccddeeff"
+
+
+def test_columns_round_trip():
+    records = FileRecords()
+    first = records.add("Clips/A001/clip.mov", 1234, mtime_ns=5, status=ascmhl_records.DONE)
+    second = records.add("top.txt", None)
+    third = records.add("Clips/A001/ünïcödé.wav", 0)
+    assert (first, second, third) == (0, 1, 2)
+    assert len(records) == 3 and list(records) == [0, 1, 2]
+    assert [records.path(i) for i in records] == ["Clips/A001/clip.mov", "top.txt", "Clips/A001/ünïcödé.wav"]
+    assert [records.size(i) for i in records] == [1234, None, 0]
+    assert records.mtime_ns(first) == 5
+    assert records.status(first) == ascmhl_records.DONE and records.status(second) == ascmhl_records.PENDING
+
+
+def test_statuses():
+    records = FileRecords()
+    for n in range(5):
+        records.add(f"f{n}", n)
+    records.set_status(1, ascmhl_records.FAILED)
+    records.set_status(3, ascmhl_records.FAILED)
+    records.set_status(4, ascmhl_records.MISSING)
+    assert records.count(ascmhl_records.FAILED) == 2
+    assert list(records.with_status(ascmhl_records.FAILED)) == [1, 3]
+    assert list(records.with_status(ascmhl_records.PENDING)) == [0, 2]
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_find(indexed):
+    records = FileRecords(indexed=indexed)
+    paths = [f"Clips/{n // 100:03d}/frame_{n:06d}.dpx" for n in range(3000)]
+    for path in paths:
+        records.add(path, 1)
+    # Past the first table of 16 slots, so the index has grown several times
+    assert all(records.find(path) == n for n, path in enumerate(paths))
+    assert records.find("Clips/000/frame_999999.dpx") is None
+    assert records.find("frame_000001.dpx") is None
+
+
+def test_find_after_adding():
+    records = FileRecords()
+    records.add("a", 1)
+    assert records.find("a") == 0
+    for n in range(100):
+        records.add(f"b/{n}", 1)
+    assert records.find("b/99") == 100 and records.find("a") == 0
+
+
+def test_hashes():
+    records = FileRecords(["xxh64"])
+    first = records.add("a", 1, hashes={"xxh64": XXH64})
+    second = records.add("b", 1)
+    assert records.digest(first, "xxh64") == XXH64
+    assert records.digest(second, "xxh64") is None
+    assert records.digest(first, "md5") is None
+    # A new format widens every record that was already added
+    records.set_hashes(second, {"md5": MD5})
+    assert records.hash_formats == ["xxh64", "md5"]
+    assert records.hashes(first) == {"xxh64": XXH64}
+    assert records.hashes(second) == {"md5": MD5}
+    c4 = "c4" + "1" * 88
+    records.set_hashes(first, {"c4": c4})
+    assert records.hashes(first) == {"xxh64": XXH64, "c4": c4}
+
+
+def test_digest_of_the_wrong_length():
+    records = FileRecords()
+    index = records.add("a", 1)
+    with pytest.raises(ValueError):
+        records.set_hashes(index, {"xxh64": "abcd"})
+
+
+def test_record_bytes_target():
+    records = FileRecords(["xxh64"], indexed=True)
+    for n in range(10000):
+        records.add(f"Clips/clip_{n}.mov", n, hashes={"xxh64": XXH64})
+    assert records.record_bytes() <= ascmhl_records.RECORD_BYTES_TARGET